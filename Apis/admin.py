@@ -0,0 +1,47 @@
+"""
+API de administración - Diagnóstico del servicio
+"""
+
+from typing import List
+
+from auth.deps import get_current_user
+from database.config import estadisticas_pool
+from fastapi import APIRouter, Depends, HTTPException, status
+from models import RespuestaAPI, UsuarioResponse
+from monitoreo import consultas_lentas, limpiar_consultas_lentas
+
+router = APIRouter(prefix="/admin", tags=["Administración"])
+
+
+def requerir_admin(usuario: UsuarioResponse = Depends(get_current_user)):
+    """Permitir solo usuarios con rol admin"""
+    if getattr(usuario.rol, "value", usuario.rol) != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Se requiere rol de administrador",
+        )
+    return usuario
+
+
+@router.get("/consultas-lentas", response_model=List[dict])
+async def obtener_consultas_lentas(
+    limit: int = 50, usuario: UsuarioResponse = Depends(requerir_admin)
+):
+    """
+    Operaciones lentas recientes de este worker con su sentencia, parámetros y
+    plan de ejecución (plan es null mientras se captura)
+    """
+    return consultas_lentas()[:limit]
+
+
+@router.delete("/consultas-lentas", response_model=RespuestaAPI)
+async def vaciar_consultas_lentas(usuario: UsuarioResponse = Depends(requerir_admin)):
+    """Vaciar el registro de operaciones lentas de este worker"""
+    limpiar_consultas_lentas()
+    return RespuestaAPI(mensaje="Registro de consultas lentas vaciado")
+
+
+@router.get("/pool", response_model=dict)
+async def obtener_estadisticas_pool(usuario: UsuarioResponse = Depends(requerir_admin)):
+    """Conexiones en uso, libres y de desborde del pool de cada motor"""
+    return estadisticas_pool()
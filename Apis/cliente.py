@@ -2,27 +2,44 @@
 API de Categorías - Endpoints para gestión de categorías
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from crud.clienteCRUD import ClienteCRUD
-from database.config import get_db
-from fastapi import APIRouter, Depends, HTTPException, status
+from Apis.utils import respuesta_condicional, respuesta_rapida, selector_campos
+from crud.asyncCRUD import ClienteCRUDAsync
+from crud.paginacion import cursor_siguiente
+from database.config import get_async_db, get_read_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from models import ClienteCreate, ClienteResponse, ClienteUpdate, RespuestaAPI
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/Clientes", tags=["Clientes"])
 
 
 @router.get("/", response_model=List[ClienteResponse])
 async def obtener_clientes(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    campos: Optional[List[str]] = Depends(selector_campos(ClienteResponse)),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Obtener todos los clientes"""
+    """Obtener todos los clientes (paginación por skip o por cursor after)"""
     try:
-        Cliente_CRUD = ClienteCRUD(db)
-        clientes = Cliente_CRUD.obtener_clientes(skip=skip, limit=limit)
-        return clientes
+        Cliente_CRUD = ClienteCRUDAsync(db)
+        clientes = await Cliente_CRUD.obtener_clientes(
+            skip=skip, limit=limit, after=after, campos=campos
+        )
+        cursor = cursor_siguiente(clientes, limit)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if no_modificado := respuesta_condicional(request, response, clientes):
+            return no_modificado
+        return respuesta_rapida(clientes, ClienteResponse, response, campos)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -31,16 +48,24 @@ async def obtener_clientes(
 
 
 @router.get("/{clientes_id}", response_model=ClienteResponse)
-async def obtener_cliente(clientes_id: UUID, db: Session = Depends(get_db)):
+async def obtener_cliente(
+    request: Request,
+    response: Response,
+    clientes_id: UUID,
+    campos: Optional[List[str]] = Depends(selector_campos(ClienteResponse)),
+    db: AsyncSession = Depends(get_read_db),
+):
     """Obtener un cliente por ID."""
     try:
-        Cliente_CRUD = ClienteCRUD(db)
-        cliente = Cliente_CRUD.obtener_cliente(clientes_id)
+        Cliente_CRUD = ClienteCRUDAsync(db)
+        cliente = await Cliente_CRUD.obtener_cliente(clientes_id, campos=campos)
         if not cliente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Cliente no encontrado"
             )
-        return cliente
+        if no_modificado := respuesta_condicional(request, response, cliente):
+            return no_modificado
+        return respuesta_rapida(cliente, ClienteResponse, response, campos)
     except HTTPException:
         raise
     except Exception as e:
@@ -51,15 +76,22 @@ async def obtener_cliente(clientes_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.get("/email/{email}", response_model=ClienteResponse)
-async def obtener_cliente_por_email(email: str, db: Session = Depends(get_db)):
+async def obtener_cliente_por_email(
+    request: Request,
+    response: Response,
+    email: str,
+    db: AsyncSession = Depends(get_read_db),
+):
     """Obtener un cliente por email."""
     try:
-        Cliente_CRUD = ClienteCRUD(db)
-        cliente = Cliente_CRUD.obtener_cliente_por_email(email)
+        Cliente_CRUD = ClienteCRUDAsync(db)
+        cliente = await Cliente_CRUD.obtener_cliente_por_email(email)
         if not cliente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Cliente no encontrado"
             )
+        if no_modificado := respuesta_condicional(request, response, cliente):
+            return no_modificado
         return cliente
     except HTTPException:
         raise
@@ -71,11 +103,13 @@ async def obtener_cliente_por_email(email: str, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=ClienteResponse, status_code=status.HTTP_201_CREATED)
-async def crear_cliente(cliente_data: ClienteCreate, db: Session = Depends(get_db)):
+async def crear_cliente(
+    cliente_data: ClienteCreate, db: AsyncSession = Depends(get_async_db)
+):
     """Crear un nuevo cliente."""
     try:
-        Cliente_CRUD = ClienteCRUD(db)
-        cliente = Cliente_CRUD.crear_cliente(
+        Cliente_CRUD = ClienteCRUDAsync(db)
+        cliente = await Cliente_CRUD.crear_cliente(
             nombre=cliente_data.nombre,
             email=cliente_data.email,
             telefono=cliente_data.telefono,
@@ -93,13 +127,15 @@ async def crear_cliente(cliente_data: ClienteCreate, db: Session = Depends(get_d
 
 @router.put("/{cliente_id}", response_model=ClienteResponse)
 async def actualizar_cliente(
-    cliente_id: UUID, cliente_data: ClienteUpdate, db: Session = Depends(get_db)
+    cliente_id: UUID,
+    cliente_data: ClienteUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Actualizar un cliente existente."""
     try:
-        Cliente_CRUD = ClienteCRUD(db)
+        Cliente_CRUD = ClienteCRUDAsync(db)
 
-        cliente_existente = Cliente_CRUD.obtener_cliente(cliente_id)
+        cliente_existente = await Cliente_CRUD.obtener_cliente(cliente_id)
         if not cliente_existente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Cliente no encontrado"
@@ -112,7 +148,7 @@ async def actualizar_cliente(
         if not campos_actualizacion:
             return cliente_existente
 
-        cliente_actualizado = Cliente_CRUD.actualizar_cliente(
+        cliente_actualizado = await Cliente_CRUD.actualizar_cliente(
             cliente_id, **campos_actualizacion
         )
         return cliente_actualizado
@@ -128,18 +164,18 @@ async def actualizar_cliente(
 
 
 @router.delete("/{cliente_id}", response_model=RespuestaAPI)
-async def eliminar_cliente(cliente_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_cliente(cliente_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Eliminar un cliente."""
     try:
-        Cliente_CRUD = ClienteCRUD(db)
+        Cliente_CRUD = ClienteCRUDAsync(db)
 
-        cliente_existente = Cliente_CRUD.obtener_cliente(cliente_id)
+        cliente_existente = await Cliente_CRUD.obtener_cliente(cliente_id)
         if not cliente_existente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Cliente no encontrado"
             )
 
-        eliminado = Cliente_CRUD.eliminar_cliente(cliente_id)
+        eliminado = await Cliente_CRUD.eliminar_cliente(cliente_id)
         if eliminado:
             return RespuestaAPI(mensaje="Cliente eliminado exitosamente", exito=True)
         else:
@@ -2,38 +2,143 @@
 API de Contratos - Endpoints para gestión de contratos
 """
 
-from typing import List
+from typing import List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 
-from crud.contratoCRUD import ContratoCRUD
-from database.config import get_db
-from fastapi import APIRouter, Depends, HTTPException, status
+from Apis.utils import (
+    respuesta_condicional,
+    respuesta_exportacion,
+    respuesta_rapida,
+    selector_campos,
+    selector_expansion,
+)
+from crud.asyncCRUD import ContratoCRUDAsync
+from crud.contratoCRUD import RELACIONES_EXPANDIBLES, ContratoCRUD
+from crud.paginacion import cursor_siguiente
+from database.config import get_async_db, get_read_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from models import (
+    ClienteResponse,
     ContratoCreate,
+    ContratoExpandido,
     ContratoResponse,
     ContratoUpdate,
+    EmpleadoResponse,
+    PagoResponse,
     RespuestaAPI,
+    VehiculoResponse,
 )
-from sqlalchemy.orm import Session
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/Contratos", tags=["Contratos"])
 
+# Modelo de respuesta de cada relación expandible (ver models.ContratoExpandido,
+# el esquema documentado de los GET con expand)
+MODELOS_RELACION = {
+    "cliente": ClienteResponse,
+    "vehiculo": VehiculoResponse,
+    "empleado": EmpleadoResponse,
+    "pagos": PagoResponse,
+}
+
+
+def _contrato_expandido(contrato, expandir: List[str], campos: Optional[List[str]]):
+    """
+    Contrato con la forma de ContratoExpandido
+
+    Las columnas del contrato se leen tal cual (limitadas a campos si se
+    indican) y cada relación pedida se valida con su propio modelo de
+    respuesta. Con pagos se añade total_pagado.
+    """
+    datos = {
+        nombre: getattr(contrato, nombre, None)
+        for nombre in campos or ContratoResponse.model_fields
+    }
+    for relacion in expandir:
+        relacionado = getattr(contrato, relacion)
+        modelo = MODELOS_RELACION[relacion]
+        if isinstance(relacionado, list):
+            datos[relacion] = [
+                modelo.model_validate(r).model_dump(mode="json") for r in relacionado
+            ]
+        elif relacionado is not None:
+            datos[relacion] = modelo.model_validate(relacionado).model_dump(mode="json")
+        else:
+            datos[relacion] = None
+    if "pagos" in expandir:
+        datos["total_pagado"] = round(sum(pago.monto for pago in contrato.pagos), 2)
+    return datos
+
+
+def _entidades_expandidas(contratos: List, expandir: List[str]) -> List:
+    """Contratos y entidades relacionadas, para que el ETag cambie con ellas"""
+    entidades = []
+    for contrato in contratos:
+        entidades.append(contrato)
+        for relacion in expandir:
+            relacionado = getattr(contrato, relacion)
+            if isinstance(relacionado, list):
+                entidades.extend(relacionado)
+            elif relacionado is not None:
+                entidades.append(relacionado)
+    return entidades
 
-@router.get("/", response_model=List[ContratoResponse])
+
+@router.get(
+    "/",
+    response_model=List[ContratoResponse],
+    responses={200: {"model": List[ContratoExpandido]}},
+)
 async def obtener_contratos(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     solo_activos: bool = False,
-    db: Session = Depends(get_db),
+    after: Optional[str] = None,
+    campos: Optional[List[str]] = Depends(selector_campos(ContratoResponse)),
+    expandir: Optional[List[str]] = Depends(selector_expansion(RELACIONES_EXPANDIBLES)),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Obtener todos los contratos"""
+    """
+    Obtener todos los contratos (paginación por skip o por cursor after)
+
+    Con expand=cliente,vehiculo,empleado,pagos cada contrato incluye esas
+    relaciones anidadas (y total_pagado con pagos) en un número fijo de
+    consultas.
+    """
     try:
-        contrato_crud = ContratoCRUD(db)
-        contratos = contrato_crud.obtener_contratos(
-            skip=skip, limit=limit, solo_activos=solo_activos
+        contrato_crud = ContratoCRUDAsync(db)
+        contratos = await contrato_crud.obtener_contratos(
+            skip=skip,
+            limit=limit,
+            solo_activos=solo_activos,
+            after=after,
+            campos=campos,
+            expandir=expandir,
         )
-        return contratos
+        cursor = cursor_siguiente(contratos, limit)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if not expandir:
+            if no_modificado := respuesta_condicional(request, response, contratos):
+                return no_modificado
+            return respuesta_rapida(contratos, ContratoResponse, response, campos)
+
+        entidades = _entidades_expandidas(contratos, expandir)
+        if no_modificado := respuesta_condicional(request, response, entidades):
+            return no_modificado
+        return Response(
+            content=to_json(
+                [_contrato_expandido(c, expandir, campos) for c in contratos]
+            ),
+            media_type="application/json",
+            headers=dict(response.headers),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -41,18 +146,64 @@ async def obtener_contratos(
         )
 
 
-@router.get("/{contrato_id}", response_model=ContratoResponse)
-async def obtener_contrato(contrato_id: UUID, db: Session = Depends(get_db)):
-    """Obtener un contrato por ID."""
+@router.get("/export")
+async def exportar_contratos(
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    activo: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Exportar contratos en streaming (NDJSON o CSV) por fecha de inicio y estado."""
+    consulta = ContratoCRUD.consulta_exportacion(
+        desde=desde, hasta=hasta, activo=activo
+    )
+    return respuesta_exportacion(db, consulta, formato, "contratos")
+
+
+@router.get(
+    "/{contrato_id}",
+    response_model=ContratoResponse,
+    responses={200: {"model": ContratoExpandido}},
+)
+async def obtener_contrato(
+    request: Request,
+    response: Response,
+    contrato_id: UUID,
+    campos: Optional[List[str]] = Depends(selector_campos(ContratoResponse)),
+    expandir: Optional[List[str]] = Depends(selector_expansion(RELACIONES_EXPANDIBLES)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Obtener un contrato por ID.
+
+    Con expand=cliente,vehiculo,empleado,pagos la respuesta sigue el modelo
+    ContratoExpandido: las relaciones pedidas anidadas y, si se piden pagos,
+    total_pagado. Se resuelve en dos consultas como máximo.
+    """
     try:
-        contrato_crud = ContratoCRUD(db)
-        contrato = contrato_crud.obtener_contrato(contrato_id)
+        contrato_crud = ContratoCRUDAsync(db)
+        contrato = await contrato_crud.obtener_contrato(
+            contrato_id, campos=campos, expandir=expandir
+        )
         if not contrato:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Contrato no encontrado",
             )
-        return contrato
+        if not expandir:
+            if no_modificado := respuesta_condicional(request, response, contrato):
+                return no_modificado
+            return respuesta_rapida(contrato, ContratoResponse, response, campos)
+
+        entidades = _entidades_expandidas([contrato], expandir)
+        if no_modificado := respuesta_condicional(request, response, entidades):
+            return no_modificado
+        return Response(
+            content=to_json(_contrato_expandido(contrato, expandir, campos)),
+            media_type="application/json",
+            headers=dict(response.headers),
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -63,11 +214,13 @@ async def obtener_contrato(contrato_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=ContratoResponse, status_code=status.HTTP_201_CREATED)
-async def crear_contrato(contrato_data: ContratoCreate, db: Session = Depends(get_db)):
+async def crear_contrato(
+    contrato_data: ContratoCreate, db: AsyncSession = Depends(get_async_db)
+):
     """Crear un nuevo contrato."""
     try:
-        contrato_crud = ContratoCRUD(db)
-        contrato = contrato_crud.crear_contrato(
+        contrato_crud = ContratoCRUDAsync(db)
+        contrato = await contrato_crud.crear_contrato(
             cliente_id=contrato_data.cliente_id,
             vehiculo_id=contrato_data.vehiculo_id,
             empleado_id=contrato_data.empleado_id,
@@ -87,13 +240,15 @@ async def crear_contrato(contrato_data: ContratoCreate, db: Session = Depends(ge
 
 @router.put("/{contrato_id}", response_model=ContratoResponse)
 async def actualizar_contrato(
-    contrato_id: UUID, contrato_data: ContratoUpdate, db: Session = Depends(get_db)
+    contrato_id: UUID,
+    contrato_data: ContratoUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Actualizar un contrato existente."""
     try:
-        contrato_crud = ContratoCRUD(db)
+        contrato_crud = ContratoCRUDAsync(db)
 
-        contrato_existente = contrato_crud.obtener_contrato(contrato_id)
+        contrato_existente = await contrato_crud.obtener_contrato(contrato_id)
         if not contrato_existente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -107,7 +262,7 @@ async def actualizar_contrato(
         if not campos_actualizacion:
             return contrato_existente
 
-        contrato_actualizado = contrato_crud.actualizar_contrato(
+        contrato_actualizado = await contrato_crud.actualizar_contrato(
             contrato_id,
             **campos_actualizacion,
         )
@@ -124,19 +279,21 @@ async def actualizar_contrato(
 
 
 @router.delete("/{contrato_id}", response_model=RespuestaAPI)
-async def eliminar_contrato(contrato_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_contrato(
+    contrato_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """Eliminar un contrato y marcar el vehículo como disponible."""
     try:
-        contrato_crud = ContratoCRUD(db)
+        contrato_crud = ContratoCRUDAsync(db)
 
-        contrato_existente = contrato_crud.obtener_contrato(contrato_id)
+        contrato_existente = await contrato_crud.obtener_contrato(contrato_id)
         if not contrato_existente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Contrato no encontrado",
             )
 
-        eliminado = contrato_crud.eliminar_contrato(contrato_id)
+        eliminado = await contrato_crud.eliminar_contrato(contrato_id)
         if eliminado:
             return RespuestaAPI(mensaje="Contrato eliminado exitosamente", exito=True)
         else:
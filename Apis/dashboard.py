@@ -1,18 +1,22 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from database.config import get_db
-from entities import Cliente, Vehiculo, Contrato
+from sqlalchemy.ext.asyncio import AsyncSession
+from crud.asyncCRUD import ContadorCRUDAsync
+from database.config import get_read_db
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 
 @router.get("/counts")
-def get_counts(db: Session = Depends(get_db)):
-    total_clientes = db.query(Cliente).count()
-    total_vehiculos = db.query(Vehiculo).count()
-    total_contratos = db.query(Contrato).count()
+async def get_counts(db: AsyncSession = Depends(get_read_db)):
+    """
+    Totales del dashboard leídos de la tabla de contadores precalculados
+    """
+    contadores = await ContadorCRUDAsync(db).obtener_contadores()
     return {
-        "clientes": total_clientes,
-        "vehiculos": total_vehiculos,
-        "contratos": total_contratos,
+        "clientes": int(contadores.get("clientes", 0)),
+        "vehiculos": int(contadores.get("vehiculos", 0)),
+        "contratos": int(contadores.get("contratos", 0)),
+        "contratos_activos": int(contadores.get("contratos_activos", 0)),
+        "vehiculos_disponibles": int(contadores.get("vehiculos_disponibles", 0)),
+        "ingresos": round(contadores.get("ingresos", 0), 2),
     }
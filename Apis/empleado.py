@@ -2,13 +2,15 @@
 API de Empleados - Endpoints para gestión de empleados
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from crud.empleadoCRUD import EmpleadoCRUD
-from database.config import get_db
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from Apis.utils import respuesta_condicional, respuesta_rapida, selector_campos
+from crud.asyncCRUD import EmpleadoCRUDAsync
+from crud.paginacion import cursor_siguiente
+from database.config import get_async_db, get_read_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import (
     EmpleadoCreate,
     EmpleadoUpdate,
@@ -21,18 +23,33 @@ router = APIRouter(prefix="/Empleados", tags=["Empleados"])
 
 @router.get("/", response_model=List[EmpleadoResponse])
 async def obtener_empleados(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     solo_activos: bool = False,
-    db: Session = Depends(get_db),
+    after: Optional[str] = None,
+    campos: Optional[List[str]] = Depends(selector_campos(EmpleadoResponse)),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Obtener todos los empleados"""
+    """Obtener todos los empleados (paginación por skip o por cursor after)"""
     try:
-        empleado_crud = EmpleadoCRUD(db)
-        empleados = empleado_crud.obtener_empleados(
-            skip=skip, limit=limit, solo_activos=solo_activos
+        empleado_crud = EmpleadoCRUDAsync(db)
+        empleados = await empleado_crud.obtener_empleados(
+            skip=skip,
+            limit=limit,
+            solo_activos=solo_activos,
+            after=after,
+            campos=campos,
         )
-        return empleados
+        cursor = cursor_siguiente(empleados, limit)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if no_modificado := respuesta_condicional(request, response, empleados):
+            return no_modificado
+        return respuesta_rapida(empleados, EmpleadoResponse, response, campos)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -41,17 +58,25 @@ async def obtener_empleados(
 
 
 @router.get("/{empleado_id}", response_model=EmpleadoResponse)
-async def obtener_empleado(empleado_id: UUID, db: Session = Depends(get_db)):
+async def obtener_empleado(
+    request: Request,
+    response: Response,
+    empleado_id: UUID,
+    campos: Optional[List[str]] = Depends(selector_campos(EmpleadoResponse)),
+    db: AsyncSession = Depends(get_read_db),
+):
     """Obtener un empleado por su ID."""
     try:
-        empleado_crud = EmpleadoCRUD(db)
-        empleado = empleado_crud.obtener_empleado(empleado_id)
+        empleado_crud = EmpleadoCRUDAsync(db)
+        empleado = await empleado_crud.obtener_empleado(empleado_id, campos=campos)
         if not empleado:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Empleado no encontrado",
             )
-        return empleado
+        if no_modificado := respuesta_condicional(request, response, empleado):
+            return no_modificado
+        return respuesta_rapida(empleado, EmpleadoResponse, response, campos)
     except HTTPException:
         raise
     except Exception as e:
@@ -62,11 +87,13 @@ async def obtener_empleado(empleado_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=EmpleadoResponse, status_code=status.HTTP_201_CREATED)
-async def crear_empleado(empleado_data: EmpleadoCreate, db: Session = Depends(get_db)):
+async def crear_empleado(
+    empleado_data: EmpleadoCreate, db: AsyncSession = Depends(get_async_db)
+):
     """Crear un nuevo empleado."""
     try:
-        empleado_crud = EmpleadoCRUD(db)
-        empleado = empleado_crud.crear_empleado(
+        empleado_crud = EmpleadoCRUDAsync(db)
+        empleado = await empleado_crud.crear_empleado(
             nombre=empleado_data.nombre,
             email=empleado_data.email,
             rol=empleado_data.rol,
@@ -85,12 +112,14 @@ async def crear_empleado(empleado_data: EmpleadoCreate, db: Session = Depends(ge
 
 @router.put("/{empleado_id}", response_model=EmpleadoResponse)
 async def actualizar_empleado(
-    empleado_id: UUID, empleado_data: EmpleadoUpdate, db: Session = Depends(get_db)
+    empleado_id: UUID,
+    empleado_data: EmpleadoUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Actualizar un empleado existente."""
     try:
-        empleado_crud = EmpleadoCRUD(db)
-        empleado_existente = empleado_crud.obtener_empleado(empleado_id)
+        empleado_crud = EmpleadoCRUDAsync(db)
+        empleado_existente = await empleado_crud.obtener_empleado(empleado_id)
 
         if not empleado_existente:
             raise HTTPException(
@@ -105,7 +134,7 @@ async def actualizar_empleado(
         if not campos_actualizacion:
             return empleado_existente
 
-        empleado_actualizado = empleado_crud.actualizar_empleado(
+        empleado_actualizado = await empleado_crud.actualizar_empleado(
             empleado_id,
             **campos_actualizacion,
         )
@@ -122,11 +151,13 @@ async def actualizar_empleado(
 
 
 @router.delete("/{empleado_id}", response_model=RespuestaAPI)
-async def eliminar_empleado(empleado_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_empleado(
+    empleado_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """Eliminar un empleado por ID."""
     try:
-        empleado_crud = EmpleadoCRUD(db)
-        empleado_existente = empleado_crud.obtener_empleado(empleado_id)
+        empleado_crud = EmpleadoCRUDAsync(db)
+        empleado_existente = await empleado_crud.obtener_empleado(empleado_id)
 
         if not empleado_existente:
             raise HTTPException(
@@ -134,7 +165,7 @@ async def eliminar_empleado(empleado_id: UUID, db: Session = Depends(get_db)):
                 detail="Empleado no encontrado",
             )
 
-        eliminado = empleado_crud.eliminar_empleado(empleado_id)
+        eliminado = await empleado_crud.eliminar_empleado(empleado_id)
         if eliminado:
             return RespuestaAPI(mensaje="Empleado eliminado exitosamente", exito=True)
         else:
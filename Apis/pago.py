@@ -2,30 +2,60 @@
 API de Pagos - Endpoints para gestión de pagos
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Literal, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Apis.utils import (
+    CUERPO_CARGA_MASIVA,
+    leer_filas,
+    respuesta_condicional,
+    respuesta_exportacion,
+    respuesta_rapida,
+    selector_campos,
+)
+from crud.asyncCRUD import PagoCRUDAsync
 from crud.pagoCRUD import PagoCRUD
-from database.config import get_db
-from models import PagoCreate, PagoUpdate, PagoResponse, RespuestaAPI
+from crud.paginacion import cursor_siguiente
+from database.config import get_async_db, get_read_db
+from models import (
+    PagoCreate,
+    PagoUpdate,
+    PagoResponse,
+    RespuestaAPI,
+    ResultadoCargaMasiva,
+)
 
 router = APIRouter(prefix="/Pagos", tags=["Pagos"])
 
 
 @router.get("/", response_model=List[PagoResponse])
 async def obtener_pagos(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     contrato_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
+    after: Optional[str] = None,
+    campos: Optional[List[str]] = Depends(selector_campos(PagoResponse)),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Obtener todos los pagos y filtro por contrato."""
+    """Obtener todos los pagos y filtro por contrato (paginación por skip o cursor)."""
     try:
-        pago_crud = PagoCRUD(db)
-        pagos = pago_crud.obtener_pagos(skip=skip, limit=limit, contrato_id=contrato_id)
-        return pagos
+        pago_crud = PagoCRUDAsync(db)
+        pagos = await pago_crud.obtener_pagos(
+            skip=skip, limit=limit, contrato_id=contrato_id, after=after, campos=campos
+        )
+        cursor = cursor_siguiente(pagos, limit)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if no_modificado := respuesta_condicional(request, response, pagos):
+            return no_modificado
+        return respuesta_rapida(pagos, PagoResponse, response, campos)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -33,18 +63,39 @@ async def obtener_pagos(
         )
 
 
+@router.get("/export")
+async def exportar_pagos(
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    activo: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Exportar pagos en streaming (NDJSON o CSV) por fecha de pago y estado."""
+    consulta = PagoCRUD.consulta_exportacion(desde=desde, hasta=hasta, activo=activo)
+    return respuesta_exportacion(db, consulta, formato, "pagos")
+
+
 @router.get("/{pago_id}", response_model=PagoResponse)
-async def obtener_pago(pago_id: UUID, db: Session = Depends(get_db)):
+async def obtener_pago(
+    request: Request,
+    response: Response,
+    pago_id: UUID,
+    campos: Optional[List[str]] = Depends(selector_campos(PagoResponse)),
+    db: AsyncSession = Depends(get_read_db),
+):
     """Obtener un pago por su ID."""
     try:
-        pago_crud = PagoCRUD(db)
-        pago = pago_crud.obtener_pago(pago_id)
+        pago_crud = PagoCRUDAsync(db)
+        pago = await pago_crud.obtener_pago(pago_id, campos=campos)
         if not pago:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Pago no encontrado",
             )
-        return pago
+        if no_modificado := respuesta_condicional(request, response, pago):
+            return no_modificado
+        return respuesta_rapida(pago, PagoResponse, response, campos)
     except HTTPException:
         raise
     except Exception as e:
@@ -55,11 +106,11 @@ async def obtener_pago(pago_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=PagoResponse, status_code=status.HTTP_201_CREATED)
-async def crear_pago(pago_data: PagoCreate, db: Session = Depends(get_db)):
+async def crear_pago(pago_data: PagoCreate, db: AsyncSession = Depends(get_async_db)):
     """Crear un nuevo pago."""
     try:
-        pago_crud = PagoCRUD(db)
-        pago = pago_crud.crear_pago(
+        pago_crud = PagoCRUDAsync(db)
+        pago = await pago_crud.crear_pago(
             contrato_id=pago_data.contrato_id,
             monto=pago_data.monto,
             id_usuario_creacion=pago_data.id_usuario_creacion,
@@ -75,14 +126,43 @@ async def crear_pago(pago_data: PagoCreate, db: Session = Depends(get_db)):
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=ResultadoCargaMasiva,
+    openapi_extra=CUERPO_CARGA_MASIVA,
+)
+async def crear_pagos_masivo(
+    request: Request,
+    id_usuario_creacion: UUID,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Registrar pagos en bloque desde un arreglo JSON o un CSV
+
+    Pensado para archivos de liquidación de la pasarela de pagos: las filas
+    válidas se insertan en una sola transacción y las inválidas se devuelven
+    con su número de fila y el motivo.
+    """
+    try:
+        filas = await leer_filas(request)
+        pago_crud = PagoCRUDAsync(db)
+        return await pago_crud.crear_pagos_masivo(filas, id_usuario_creacion)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error en la carga masiva de pagos: {str(e)}"
+        )
+
+
 @router.put("/{pago_id}", response_model=PagoResponse)
 async def actualizar_pago(
-    pago_id: UUID, pago_data: PagoUpdate, db: Session = Depends(get_db)
+    pago_id: UUID, pago_data: PagoUpdate, db: AsyncSession = Depends(get_async_db)
 ):
     """Actualizar un pago existente."""
     try:
-        pago_crud = PagoCRUD(db)
-        pago_existente = pago_crud.obtener_pago(pago_id)
+        pago_crud = PagoCRUDAsync(db)
+        pago_existente = await pago_crud.obtener_pago(pago_id)
 
         if not pago_existente:
             raise HTTPException(
@@ -97,7 +177,7 @@ async def actualizar_pago(
         if not campos_actualizacion:
             return pago_existente
 
-        pago_actualizado = pago_crud.actualizar_pago(
+        pago_actualizado = await pago_crud.actualizar_pago(
             pago_id,
             **campos_actualizacion,
         )
@@ -114,11 +194,11 @@ async def actualizar_pago(
 
 
 @router.delete("/{pago_id}", response_model=RespuestaAPI)
-async def eliminar_pago(pago_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_pago(pago_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Eliminar un pago por ID."""
     try:
-        pago_crud = PagoCRUD(db)
-        pago_existente = pago_crud.obtener_pago(pago_id)
+        pago_crud = PagoCRUDAsync(db)
+        pago_existente = await pago_crud.obtener_pago(pago_id)
 
         if not pago_existente:
             raise HTTPException(
@@ -126,7 +206,7 @@ async def eliminar_pago(pago_id: UUID, db: Session = Depends(get_db)):
                 detail="Pago no encontrado",
             )
 
-        eliminado = pago_crud.eliminar_pago(pago_id)
+        eliminado = await pago_crud.eliminar_pago(pago_id)
         if eliminado:
             return RespuestaAPI(mensaje="Pago eliminado exitosamente", exito=True)
         else:
@@ -2,13 +2,15 @@
 API - Gestión de Tipos de Vehículo
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from uuid import UUID
 
-from database.config import get_db
-from crud.tipoVehiculoCRUD import TipoVehiculoCRUD
+from database.config import get_async_db, get_read_db
+from Apis.utils import respuesta_condicional, respuesta_rapida, selector_campos
+from crud.asyncCRUD import TipoVehiculoCRUDAsync
+from crud.paginacion import cursor_siguiente
 from models import (
     TipoVehiculoCreate,
     TipoVehiculoUpdate,
@@ -22,13 +24,15 @@ router = APIRouter(prefix="/Tipos-de-Vehiculos", tags=["Tipos de Vehiculos"])
 @router.post(
     "/", response_model=TipoVehiculoResponse, status_code=status.HTTP_201_CREATED
 )
-def crear_tipo_vehiculo(tipo_data: TipoVehiculoCreate, db: Session = Depends(get_db)):
+async def crear_tipo_vehiculo(
+    tipo_data: TipoVehiculoCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Crear un nuevo tipo de vehículo
     """
-    crud = TipoVehiculoCRUD(db)
+    crud = TipoVehiculoCRUDAsync(db)
     try:
-        nuevo_tipo = crud.crear_tipo_vehiculo(
+        nuevo_tipo = await crud.crear_tipo_vehiculo(
             nombre=tipo_data.nombre,
             id_usuario_creacion=tipo_data.id_usuario_creacion,
             descripcion=tipo_data.descripcion,
@@ -44,15 +48,29 @@ def crear_tipo_vehiculo(tipo_data: TipoVehiculoCreate, db: Session = Depends(get
 
 
 @router.get("/", response_model=List[TipoVehiculoResponse])
-def listar_tipos_vehiculo(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+async def listar_tipos_vehiculo(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    campos: Optional[List[str]] = Depends(selector_campos(TipoVehiculoResponse)),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    Obtener lista de tipos de vehículo con paginación
+    Obtener lista de tipos de vehículo con paginación por skip o por cursor
     """
-    crud = TipoVehiculoCRUD(db)
+    crud = TipoVehiculoCRUDAsync(db)
     try:
-        return crud.obtener_tipos_vehiculo(skip=skip, limit=limit)
+        tipos = await crud.obtener_tipos_vehiculo(skip=skip, limit=limit, after=after)
+        cursor = cursor_siguiente(tipos, limit)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if no_modificado := respuesta_condicional(request, response, tipos):
+            return no_modificado
+        return respuesta_rapida(tipos, TipoVehiculoResponse, response, campos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error al listar tipos de vehículo: {str(e)}"
@@ -60,18 +78,26 @@ def listar_tipos_vehiculo(
 
 
 @router.get("/{tipo_id}", response_model=TipoVehiculoResponse)
-def obtener_tipo_vehiculo(tipo_id: UUID, db: Session = Depends(get_db)):
+async def obtener_tipo_vehiculo(
+    request: Request,
+    response: Response,
+    tipo_id: UUID,
+    campos: Optional[List[str]] = Depends(selector_campos(TipoVehiculoResponse)),
+    db: AsyncSession = Depends(get_read_db),
+):
     """
     Obtener un tipo de vehículo por su ID
     """
-    crud = TipoVehiculoCRUD(db)
+    crud = TipoVehiculoCRUDAsync(db)
     try:
-        tipo = crud.obtener_tipo_vehiculo(tipo_id)
+        tipo = await crud.obtener_tipo_vehiculo(tipo_id)
         if not tipo:
             raise HTTPException(
                 status_code=404, detail="Tipo de vehículo no encontrado"
             )
-        return tipo
+        if no_modificado := respuesta_condicional(request, response, tipo):
+            return no_modificado
+        return respuesta_rapida(tipo, TipoVehiculoResponse, response, campos)
     except HTTPException:
         raise
     except Exception as e:
@@ -81,16 +107,18 @@ def obtener_tipo_vehiculo(tipo_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.put("/{tipo_id}", response_model=TipoVehiculoResponse)
-def actualizar_tipo_vehiculo(
-    tipo_id: UUID, tipo_data: TipoVehiculoUpdate, db: Session = Depends(get_db)
+async def actualizar_tipo_vehiculo(
+    tipo_id: UUID,
+    tipo_data: TipoVehiculoUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualizar un tipo de vehículo existente
     """
-    crud = TipoVehiculoCRUD(db)
+    crud = TipoVehiculoCRUDAsync(db)
     try:
 
-        tipo_existente = crud.obtener_tipo_vehiculo(tipo_id)
+        tipo_existente = await crud.obtener_tipo_vehiculo(tipo_id)
         if not tipo_existente:
             raise HTTPException(
                 status_code=404, detail="Tipo de vehículo no encontrado"
@@ -100,7 +128,7 @@ def actualizar_tipo_vehiculo(
             k: v for k, v in tipo_data.model_dump().items() if v is not None
         }
 
-        tipo_actualizado = crud.actualizar_tipo_vehiculo(
+        tipo_actualizado = await crud.actualizar_tipo_vehiculo(
             tipo_id,
             **campos_actualizados,
         )
@@ -117,13 +145,15 @@ def actualizar_tipo_vehiculo(
 
 
 @router.delete("/{tipo_id}", response_model=RespuestaAPI)
-def eliminar_tipo_vehiculo(tipo_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_tipo_vehiculo(
+    tipo_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Eliminar un tipo de vehículo
     """
-    crud = TipoVehiculoCRUD(db)
+    crud = TipoVehiculoCRUDAsync(db)
     try:
-        eliminado = crud.eliminar_tipo_vehiculo(tipo_id)
+        eliminado = await crud.eliminar_tipo_vehiculo(tipo_id)
         if not eliminado:
             raise HTTPException(
                 status_code=404, detail="Tipo de vehículo no encontrado"
@@ -2,12 +2,20 @@
 API de Usuarios - Endpoints para gestión de usuarios (usa modelos Pydantic)
 """
 
-from typing import List
+from typing import List, Literal, Optional
 from uuid import UUID
 
+from Apis.utils import (
+    respuesta_condicional,
+    respuesta_exportacion,
+    respuesta_rapida,
+    selector_campos,
+)
+from crud.asyncCRUD import UsuarioCRUDAsync
+from crud.paginacion import cursor_siguiente
 from crud.usuarioCRUD import UsuarioCRUD
-from database.config import get_db
-from fastapi import APIRouter, Depends, HTTPException, status
+from database.config import get_async_db, get_read_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from models import (
     UsuarioCreate,
     UsuarioResponse,
@@ -15,20 +23,36 @@ from models import (
     UsuarioLogin,
     RespuestaAPI,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/Usuarios", tags=["Usuarios"])
 
 
 @router.get("/", response_model=List[UsuarioResponse])
 async def obtener_usuarios(
-    db: Session = Depends(get_db), skip: int = 0, limit: int = 100
+    request: Request,
+    response: Response,
+    campos: Optional[List[str]] = Depends(selector_campos(UsuarioResponse)),
+    db: AsyncSession = Depends(get_read_db),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = None,
+    prefijo: Optional[str] = None,
 ):
-    """Obtener todos los usuarios (sin paginar por ahora, pero con skip/limit)."""
+    """Obtener usuarios paginados (skip o cursor after) y filtro por prefijo."""
     try:
-        crud = UsuarioCRUD(db)
-        usuarios = crud.obtener_usuarios()
-        return usuarios
+        crud = UsuarioCRUDAsync(db)
+        usuarios = await crud.obtener_usuarios(
+            skip=skip, limit=limit, after=after, prefijo=prefijo, campos=campos
+        )
+        cursor = cursor_siguiente(usuarios, limit)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if no_modificado := respuesta_condicional(request, response, usuarios):
+            return no_modificado
+        return respuesta_rapida(usuarios, UsuarioResponse, response, campos)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -36,17 +60,36 @@ async def obtener_usuarios(
         )
 
 
+@router.get("/export")
+async def exportar_usuarios(
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    prefijo: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Exportar todos los usuarios en streaming (NDJSON o CSV)."""
+    consulta = UsuarioCRUD.consulta_exportacion(prefijo=prefijo)
+    return respuesta_exportacion(db, consulta, formato, "usuarios")
+
+
 @router.get("/{usuario_id}", response_model=UsuarioResponse)
-async def obtener_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
+async def obtener_usuario(
+    request: Request,
+    response: Response,
+    usuario_id: UUID,
+    campos: Optional[List[str]] = Depends(selector_campos(UsuarioResponse)),
+    db: AsyncSession = Depends(get_read_db),
+):
     """Obtener un usuario por su ID."""
     try:
-        crud = UsuarioCRUD(db)
-        usuario = crud.obtener_usuario_por_id(str(usuario_id))
+        crud = UsuarioCRUDAsync(db)
+        usuario = await crud.obtener_usuario_por_id(str(usuario_id), campos=campos)
         if not usuario:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado"
             )
-        return usuario
+        if no_modificado := respuesta_condicional(request, response, usuario):
+            return no_modificado
+        return respuesta_rapida(usuario, UsuarioResponse, response, campos)
     except HTTPException:
         raise
     except Exception as e:
@@ -57,17 +100,19 @@ async def obtener_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
-async def crear_usuario(usuario_data: UsuarioCreate, db: Session = Depends(get_db)):
+async def crear_usuario(
+    usuario_data: UsuarioCreate, db: AsyncSession = Depends(get_async_db)
+):
     """Crear un nuevo usuario (la contraseña se encripta en el CRUD)."""
     try:
-        crud = UsuarioCRUD(db)
-        if crud.obtener_usuario_por_username(usuario_data.username):
+        crud = UsuarioCRUDAsync(db)
+        if await crud.obtener_usuario_por_username(usuario_data.username):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El nombre de usuario ya existe",
             )
 
-        usuario = crud.crear_usuario(
+        usuario = await crud.crear_usuario(
             username=usuario_data.username,
             password=usuario_data.password,
             id_usuario_creacion=usuario_data.id_usuario_creacion,
@@ -86,12 +131,14 @@ async def crear_usuario(usuario_data: UsuarioCreate, db: Session = Depends(get_d
 
 @router.put("/{usuario_id}", response_model=UsuarioResponse)
 async def actualizar_usuario(
-    usuario_id: UUID, usuario_data: UsuarioUpdate, db: Session = Depends(get_db)
+    usuario_id: UUID,
+    usuario_data: UsuarioUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Actualizar un usuario existente."""
     try:
-        crud = UsuarioCRUD(db)
-        usuario_existente = crud.obtener_usuario_por_id(str(usuario_id))
+        crud = UsuarioCRUDAsync(db)
+        usuario_existente = await crud.obtener_usuario_por_id(str(usuario_id))
         if not usuario_existente:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado"
@@ -102,7 +149,7 @@ async def actualizar_usuario(
         if not campos:
             return usuario_existente
 
-        usuario_actualizado = crud.actualizar_usuario(
+        usuario_actualizado = await crud.actualizar_usuario(
             str(usuario_id),
             **campos,
         )
@@ -119,11 +166,11 @@ async def actualizar_usuario(
 
 
 @router.delete("/{usuario_id}", response_model=RespuestaAPI)
-async def eliminar_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_usuario(usuario_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Eliminar un usuario por su ID."""
     try:
-        crud = UsuarioCRUD(db)
-        eliminado = crud.eliminar_usuario(str(usuario_id))
+        crud = UsuarioCRUDAsync(db)
+        eliminado = await crud.eliminar_usuario(str(usuario_id))
         if eliminado:
             return RespuestaAPI(mensaje="Usuario eliminado exitosamente", exito=True)
         else:
@@ -140,13 +187,17 @@ async def eliminar_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=UsuarioResponse)
-async def autenticar_usuario(login_data: UsuarioLogin, db: Session = Depends(get_db)):
+async def autenticar_usuario(
+    login_data: UsuarioLogin, db: AsyncSession = Depends(get_async_db)
+):
     """
     Autenticar usuario.
     """
     try:
-        crud = UsuarioCRUD(db)
-        usuario = crud.autenticar_usuario(login_data.username, login_data.password)
+        crud = UsuarioCRUDAsync(db)
+        usuario = await crud.autenticar_usuario(
+            login_data.username, login_data.password
+        )
         if not usuario:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -171,12 +222,12 @@ async def cambiar_contrasena(
     usuario_id: UUID,
     current_password: str,
     new_password: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Cambiar contraseña de un usuario."""
     try:
-        crud = UsuarioCRUD(db)
-        cambiado = crud.cambiar_contrasena(
+        crud = UsuarioCRUDAsync(db)
+        cambiado = await crud.cambiar_contrasena(
             str(usuario_id), current_password, new_password
         )
         if not cambiado:
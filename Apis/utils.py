@@ -0,0 +1,340 @@
+"""
+Utilidades compartidas por los routers de la API
+"""
+
+import csv
+import enum
+import hashlib
+import io
+import json
+import os
+from datetime import date, datetime
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined, to_json
+from sqlalchemy import inspect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TIPOS_EXPORTACION = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Serializar los listados sin revalidar cada fila con Pydantic (opcional)
+SERIALIZACION_RAPIDA = os.getenv("SERIALIZACION_RAPIDA", "false").lower() in (
+    "1",
+    "true",
+    "si",
+)
+
+# Documentación OpenAPI del cuerpo de las cargas masivas (JSON o CSV)
+CUERPO_CARGA_MASIVA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": {"type": "object"}}
+            },
+            "text/csv": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+def _valor_csv(valor) -> str:
+    """Convertir un valor de columna a texto para CSV"""
+    if valor is None:
+        return ""
+    if isinstance(valor, enum.Enum):
+        return str(valor.value)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, UUID):
+        return str(valor)
+    return valor
+
+
+async def transmitir_filas(
+    db: AsyncSession, consulta, formato: str = "ndjson", lote: int = 1000
+) -> AsyncIterator[bytes]:
+    """
+    Transmitir el resultado de una consulta como NDJSON o CSV
+
+    Usa un cursor del lado del servidor (yield_per) y serializa cada lote de
+    tuplas directamente, sin crear objetos ORM ni modelos Pydantic, por lo que
+    la memoria no depende del número de filas.
+
+    Como AsyncCRUD, si la conexión prestada por el pool estaba caída (el pool
+    no hace pre-ping) se reintenta una vez con otra; todavía no se envió
+    ninguna fila, así que la respuesta no queda a medias.
+
+    Args:
+        db: Sesión asíncrona
+        consulta: Select de columnas a exportar
+        formato: "ndjson" o "csv"
+        lote: Filas por lote leídas del cursor
+    """
+    consulta = consulta.execution_options(yield_per=lote)
+    try:
+        resultado = await db.stream(consulta)
+    except DBAPIError as e:
+        if not e.connection_invalidated:
+            raise
+        await db.rollback()
+        resultado = await db.stream(consulta)
+    columnas = list(resultado.keys())
+
+    if formato == "csv":
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        escritor.writerow(columnas)
+        async for filas in resultado.partitions():
+            escritor.writerows([[_valor_csv(v) for v in fila] for fila in filas])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    else:
+        async for filas in resultado.partitions():
+            yield b"".join(to_json(dict(zip(columnas, fila))) + b"\n" for fila in filas)
+
+
+def respuesta_exportacion(
+    db: AsyncSession, consulta, formato: str, nombre: str
+) -> StreamingResponse:
+    """Respuesta HTTP en streaming para una exportación"""
+    return StreamingResponse(
+        transmitir_filas(db, consulta, formato),
+        media_type=TIPOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}.{formato}"'},
+    )
+
+
+async def leer_filas(request: Request) -> List[Dict]:
+    """
+    Leer el cuerpo de una carga masiva como lista de diccionarios
+
+    Acepta un arreglo JSON de objetos o un CSV con cabecera (Content-Type
+    text/csv).
+
+    Raises:
+        ValueError: Si el cuerpo no tiene un formato válido
+    """
+    cuerpo = await request.body()
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        try:
+            texto = cuerpo.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise ValueError("El CSV debe estar codificado en UTF-8")
+        return [
+            {k: (v if v != "" else None) for k, v in fila.items()}
+            for fila in csv.DictReader(io.StringIO(texto))
+        ]
+
+    try:
+        filas = json.loads(cuerpo)
+    except ValueError:
+        raise ValueError("El cuerpo debe ser un arreglo JSON o un CSV")
+    if not isinstance(filas, list) or not all(isinstance(f, dict) for f in filas):
+        raise ValueError("El cuerpo debe ser un arreglo JSON de objetos")
+    return filas
+
+
+def calcular_etag(datos) -> str:
+    """
+    ETag fuerte de una entidad o de una lista de entidades
+
+    Se deriva de (id, fecha_actualizacion) de cada fila, que cambia en toda
+    escritura, así que no hace falta serializar el cuerpo para calcularlo.
+    """
+    es_lista = isinstance(datos, list)
+    entidades = datos if es_lista else [datos]
+    resumen = hashlib.blake2b(b"lista" if es_lista else b"", digest_size=16)
+    for entidad in entidades:
+        fecha = getattr(entidad, "fecha_actualizacion", None)
+        resumen.update(f"{entidad.id}|{fecha.isoformat() if fecha else ''};".encode())
+    return f'"{resumen.hexdigest()}"'
+
+
+def respuesta_condicional(
+    request: Request, response: Response, datos
+) -> Optional[Response]:
+    """
+    Resolver un GET condicional (If-None-Match)
+
+    Añade la cabecera ETag a la respuesta y, si el cliente ya tiene esa
+    versión, devuelve un 304 sin cuerpo para que el endpoint no serialice.
+
+    Returns:
+        Respuesta 304 o None si hay que devolver el cuerpo
+    """
+    etag = calcular_etag(datos)
+    response.headers["ETag"] = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etiquetas = {e.strip().removeprefix("W/") for e in if_none_match.split(",")}
+        if etag in etiquetas or "*" in etiquetas:
+            return Response(status_code=304, headers=dict(response.headers))
+    return None
+
+
+@lru_cache(maxsize=None)
+def _campos_respuesta(modelo: Type[BaseModel]) -> Tuple[Tuple[str, object], ...]:
+    """Campos del modelo de respuesta con su valor por defecto (una vez por modelo)"""
+    return tuple(
+        (nombre, None if campo.default is PydanticUndefined else campo.default)
+        for nombre, campo in modelo.model_fields.items()
+    )
+
+
+def selector_campos(modelo: Type[BaseModel]):
+    """
+    Dependencia que lee ?fields= y valida los nombres contra el modelo
+
+    Devuelve la lista de campos pedidos (sin repetir) o None si no se pidió
+    ninguna selección. Un nombre desconocido responde 400.
+    """
+
+    def campos_solicitados(
+        fields: Optional[str] = Query(
+            None,
+            description="Campos a devolver separados por comas (ej. id,placa,marca)",
+        )
+    ) -> Optional[List[str]]:
+        if fields is None:
+            return None
+        campos = list(dict.fromkeys(c.strip() for c in fields.split(",") if c.strip()))
+        desconocidos = [c for c in campos if c not in modelo.model_fields]
+        if not campos or desconocidos:
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Campos desconocidos en fields: {', '.join(desconocidos)}"
+                    if desconocidos
+                    else "El parámetro fields no puede estar vacío"
+                ),
+            )
+        return campos
+
+    return campos_solicitados
+
+
+def selector_expansion(relaciones: Tuple[str, ...]):
+    """
+    Dependencia que lee ?expand= y valida las relaciones pedidas
+
+    Devuelve la lista de relaciones (sin repetir) o None. Una relación
+    desconocida responde 400.
+    """
+
+    def relaciones_solicitadas(
+        expand: Optional[str] = Query(
+            None,
+            description=f"Relaciones a incluir separadas por comas: {','.join(relaciones)}",
+        )
+    ) -> Optional[List[str]]:
+        if expand is None:
+            return None
+        pedidas = list(dict.fromkeys(r.strip() for r in expand.split(",") if r.strip()))
+        desconocidas = [r for r in pedidas if r not in relaciones]
+        if desconocidas:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Relaciones desconocidas en expand: {', '.join(desconocidas)}",
+            )
+        return pedidas or None
+
+    return relaciones_solicitadas
+
+
+@lru_cache(maxsize=None)
+def _atributos_mapeados(clase: type) -> frozenset:
+    """Atributos instrumentados por el ORM (vacío si la clase no es una entidad)"""
+    mapper = inspect(clase, raiseerr=False)
+    return frozenset(mapper.attrs.keys()) if mapper is not None else frozenset()
+
+
+class _AtributoSinCargar(Exception):
+    """Un atributo pedido está expirado o diferido en la entidad"""
+
+
+def serializar_rapido(
+    datos, modelo: Type[BaseModel], campos: Optional[List[str]] = None
+) -> Optional[bytes]:
+    """
+    Codificar entidades como JSON con la forma de un modelo de respuesta
+
+    Lee directamente los atributos que declara el modelo y los codifica con
+    pydantic_core.to_json, sin crear ni validar una instancia por fila. Las
+    entidades salen de la base ya validadas, así que el resultado coincide con
+    el de response_model (tests/test_serializacion.py lo compara byte a byte
+    para cada modelo). Con campos se limita la salida a esos nombres.
+
+    Solo lee atributos ya cargados: si alguno de los pedidos está expirado o
+    diferido, leerlo haría una carga perezosa fuera del greenlet de la sesión
+    asíncrona, así que devuelve None para que se use el camino normal.
+    """
+    campos = [
+        (nombre, defecto)
+        for nombre, defecto in _campos_respuesta(modelo)
+        if not campos or nombre in campos
+    ]
+
+    def fila(entidad) -> dict:
+        # Los atributos cargados se leen del __dict__ sin pasar por el
+        # descriptor instrumentado del ORM; los que la entidad no mapea toman
+        # el valor por defecto del modelo
+        valores = entidad.__dict__
+        mapeados = _atributos_mapeados(type(entidad))
+        resultado = {}
+        for nombre, defecto in campos:
+            if nombre in valores:
+                resultado[nombre] = valores[nombre]
+            elif nombre in mapeados:
+                raise _AtributoSinCargar(nombre)
+            else:
+                resultado[nombre] = getattr(entidad, nombre, defecto)
+        return resultado
+
+    try:
+        if isinstance(datos, list):
+            return to_json([fila(entidad) for entidad in datos])
+        return to_json(fila(datos))
+    except _AtributoSinCargar:
+        return None
+
+
+def respuesta_rapida(
+    datos,
+    modelo: Type[BaseModel],
+    response: Response,
+    campos: Optional[List[str]] = None,
+):
+    """
+    Respuesta JSON ya codificada si SERIALIZACION_RAPIDA está activo
+
+    El endpoint conserva su response_model, así que el esquema OpenAPI no
+    cambia; solo se omite la revalidación por fila. Si la opción está
+    desactivada se devuelven los datos tal cual para el camino normal, salvo
+    que se haya pedido una selección de campos (?fields=), que response_model
+    no puede representar. También se usa el camino normal si alguna entidad
+    tiene atributos sin cargar.
+
+    Raises:
+        RuntimeError: Si se pidió una selección de campos y alguno no está
+            cargado (solo_campos los carga todos, así que no debería ocurrir)
+    """
+    if not SERIALIZACION_RAPIDA and not campos:
+        return datos
+    contenido = serializar_rapido(datos, modelo, campos)
+    if contenido is None:
+        if campos:
+            raise RuntimeError("Campos pedidos sin cargar en la entidad")
+        return datos
+    return Response(
+        content=contenido,
+        media_type="application/json",
+        headers={k: v for k, v in response.headers.items() if k != "content-length"},
+    )
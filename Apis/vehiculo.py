@@ -2,29 +2,59 @@
 API de Vehículos - Endpoints para la gestión de vehículos
 """
 
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from crud.vehiculoCRUD import VehiculoCRUD
-from database.config import get_db
-from models import VehiculoCreate, VehiculoUpdate, VehiculoResponse, RespuestaAPI
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud.asyncCRUD import VehiculoCRUDAsync
+from crud.paginacion import cursor_siguiente
+from database.config import get_async_db, get_read_db
+from models import (
+    VehiculoCreate,
+    VehiculoUpdate,
+    VehiculoResponse,
+    RespuestaAPI,
+    ResultadoCargaMasiva,
+)
+from Apis.utils import (
+    CUERPO_CARGA_MASIVA,
+    leer_filas,
+    respuesta_condicional,
+    respuesta_rapida,
+    selector_campos,
+)
 
 router = APIRouter(prefix="/Vehiculos", tags=["Vehiculos"])
 
 
 @router.get("/", response_model=List[VehiculoResponse])
 async def obtener_vehiculos(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    campos: Optional[List[str]] = Depends(selector_campos(VehiculoResponse)),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    Obtener todos los vehículos
+    Obtener todos los vehículos (paginación por skip o por cursor after)
     """
     try:
-        vehiculo_crud = VehiculoCRUD(db)
-        vehiculos = vehiculo_crud.obtener_vehiculos(skip=skip, limit=limit)
-        return vehiculos
+        vehiculo_crud = VehiculoCRUDAsync(db)
+        vehiculos = await vehiculo_crud.obtener_vehiculos(
+            skip=skip, limit=limit, after=after, campos=campos
+        )
+        cursor = cursor_siguiente(vehiculos, limit)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if no_modificado := respuesta_condicional(request, response, vehiculos):
+            return no_modificado
+        return respuesta_rapida(vehiculos, VehiculoResponse, response, campos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -32,17 +62,67 @@ async def obtener_vehiculos(
         )
 
 
+@router.get("/disponibles", response_model=List[VehiculoResponse])
+async def obtener_vehiculos_disponibles(
+    request: Request,
+    response: Response,
+    desde: datetime,
+    hasta: datetime,
+    tipo_id: Optional[UUID] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    campos: Optional[List[str]] = Depends(selector_campos(VehiculoResponse)),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Obtener los vehículos libres entre dos fechas, opcionalmente por tipo
+    """
+    try:
+        vehiculo_crud = VehiculoCRUDAsync(db)
+        vehiculos = await vehiculo_crud.obtener_vehiculos_disponibles(
+            desde=desde,
+            hasta=hasta,
+            tipo_id=tipo_id,
+            skip=skip,
+            limit=limit,
+            after=after,
+            campos=campos,
+        )
+        cursor = cursor_siguiente(vehiculos, limit)
+        if cursor:
+            response.headers["X-Next-Cursor"] = cursor
+        if no_modificado := respuesta_condicional(request, response, vehiculos):
+            return no_modificado
+        return respuesta_rapida(vehiculos, VehiculoResponse, response, campos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error al obtener los vehículos disponibles: {str(e)}",
+        )
+
+
 @router.get("/{vehiculo_id}", response_model=VehiculoResponse)
-async def obtener_vehiculo(vehiculo_id: UUID, db: Session = Depends(get_db)):
+async def obtener_vehiculo(
+    request: Request,
+    response: Response,
+    vehiculo_id: UUID,
+    campos: Optional[List[str]] = Depends(selector_campos(VehiculoResponse)),
+    db: AsyncSession = Depends(get_read_db),
+):
     """
     Obtener un vehículo por su ID
     """
     try:
-        vehiculo_crud = VehiculoCRUD(db)
-        vehiculo = vehiculo_crud.obtener_vehiculo(vehiculo_id)
+        vehiculo_crud = VehiculoCRUDAsync(db)
+        vehiculo = await vehiculo_crud.obtener_vehiculo(vehiculo_id, campos=campos)
         if not vehiculo:
             raise HTTPException(status_code=404, detail="Vehículo no encontrado")
-        return vehiculo
+        if no_modificado := respuesta_condicional(request, response, vehiculo):
+            return no_modificado
+        return respuesta_rapida(vehiculo, VehiculoResponse, response, campos)
     except HTTPException:
         raise
     except Exception as e:
@@ -52,13 +132,15 @@ async def obtener_vehiculo(vehiculo_id: UUID, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=VehiculoResponse, status_code=status.HTTP_201_CREATED)
-async def crear_vehiculo(vehiculo_data: VehiculoCreate, db: Session = Depends(get_db)):
+async def crear_vehiculo(
+    vehiculo_data: VehiculoCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Crear un nuevo vehículo con validaciones
     """
     try:
-        vehiculo_crud = VehiculoCRUD(db)
-        vehiculo = vehiculo_crud.crear_vehiculo(
+        vehiculo_crud = VehiculoCRUDAsync(db)
+        vehiculo = await vehiculo_crud.crear_vehiculo(
             marca=vehiculo_data.marca,
             modelo=vehiculo_data.modelo,
             tipo_id=vehiculo_data.tipo_id,
@@ -75,16 +157,46 @@ async def crear_vehiculo(vehiculo_data: VehiculoCreate, db: Session = Depends(ge
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=ResultadoCargaMasiva,
+    openapi_extra=CUERPO_CARGA_MASIVA,
+)
+async def crear_vehiculos_masivo(
+    request: Request,
+    id_usuario_creacion: UUID,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Crear vehículos en bloque desde un arreglo JSON o un CSV
+
+    Las filas válidas se insertan en una sola transacción; las inválidas se
+    devuelven con su número de fila y el motivo.
+    """
+    try:
+        filas = await leer_filas(request)
+        vehiculo_crud = VehiculoCRUDAsync(db)
+        return await vehiculo_crud.crear_vehiculos_masivo(filas, id_usuario_creacion)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error en la carga masiva de vehículos: {str(e)}"
+        )
+
+
 @router.put("/{vehiculo_id}", response_model=VehiculoResponse)
 async def actualizar_vehiculo(
-    vehiculo_id: UUID, vehiculo_data: VehiculoUpdate, db: Session = Depends(get_db)
+    vehiculo_id: UUID,
+    vehiculo_data: VehiculoUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Actualizar los datos de un vehículo existente
     """
     try:
-        vehiculo_crud = VehiculoCRUD(db)
-        vehiculo_existente = vehiculo_crud.obtener_vehiculo(vehiculo_id)
+        vehiculo_crud = VehiculoCRUDAsync(db)
+        vehiculo_existente = await vehiculo_crud.obtener_vehiculo(vehiculo_id)
 
         if not vehiculo_existente:
             raise HTTPException(status_code=404, detail="Vehículo no encontrado")
@@ -96,7 +208,7 @@ async def actualizar_vehiculo(
         if not campos_actualizacion:
             return vehiculo_existente
 
-        vehiculo_actualizado = vehiculo_crud.actualizar_vehiculo(
+        vehiculo_actualizado = await vehiculo_crud.actualizar_vehiculo(
             vehiculo_id,
             **campos_actualizacion,
         )
@@ -112,17 +224,19 @@ async def actualizar_vehiculo(
 
 
 @router.delete("/{vehiculo_id}", response_model=RespuestaAPI)
-async def eliminar_vehiculo(vehiculo_id: UUID, db: Session = Depends(get_db)):
+async def eliminar_vehiculo(
+    vehiculo_id: UUID, db: AsyncSession = Depends(get_async_db)
+):
     """
     Eliminar un vehículo por su ID
     """
     try:
-        vehiculo_crud = VehiculoCRUD(db)
-        vehiculo = vehiculo_crud.obtener_vehiculo(vehiculo_id)
+        vehiculo_crud = VehiculoCRUDAsync(db)
+        vehiculo = await vehiculo_crud.obtener_vehiculo(vehiculo_id)
         if not vehiculo:
             raise HTTPException(status_code=404, detail="Vehículo no encontrado")
 
-        eliminado = vehiculo_crud.eliminar_vehiculo(vehiculo_id)
+        eliminado = await vehiculo_crud.eliminar_vehiculo(vehiculo_id)
         if eliminado:
             return RespuestaAPI(mensaje="Vehículo eliminado exitosamente", exito=True)
         else:
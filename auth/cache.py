@@ -0,0 +1,125 @@
+"""
+Caché en memoria de usuarios autenticados
+
+Cada worker guarda su propia copia. Las escrituras de usuarios (cambio de
+estado o de rol, borrado, contraseña) incrementan el contador
+VERSION_USUARIOS en su misma transacción e invalidan la entrada del worker
+que las atiende. Los demás workers comparan su versión con la de la base como
+mucho una vez por intervalo de verificación y, si cambió, vacían la copia:
+un usuario desactivado se rechaza en todos los workers en a lo sumo
+USUARIOS_CACHE_VERIFICACION segundos (1 por defecto), no al vencer el TTL.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from models import UsuarioResponse
+from monitoreo.metricas import registrar_cache
+
+
+class CacheUsuarios:
+    """
+    Caché LRU con expiración (TTL) indexada por id de usuario
+
+    Guarda una copia de solo lectura del usuario (UsuarioResponse), nunca la
+    instancia ORM, para que pueda compartirse entre peticiones y sesiones.
+    """
+
+    def __init__(
+        self,
+        max_entradas: int = 1024,
+        ttl: float = 60.0,
+        intervalo_verificacion: float = 1.0,
+    ):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.intervalo_verificacion = intervalo_verificacion
+        self.hits = 0
+        self.misses = 0
+        self._entradas: "OrderedDict[str, tuple]" = OrderedDict()
+        self._version: Optional[float] = None
+        self._verificado = 0.0
+        self._lock = threading.Lock()
+
+    def verificacion_pendiente(self) -> bool:
+        """
+        Indica si toca comparar la versión con la base
+
+        Reserva la verificación: las peticiones concurrentes del mismo
+        intervalo reciben False y usan la copia actual.
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            if (
+                self._version is not None
+                and ahora - self._verificado < self.intervalo_verificacion
+            ):
+                return False
+            self._verificado = ahora
+            return True
+
+    def actualizar_version(self, version: float) -> None:
+        """Vacía la caché si otro worker modificó usuarios desde la última vez"""
+        with self._lock:
+            if self._version != version:
+                self._entradas.clear()
+                self._version = version
+
+    def obtener(self, usuario_id) -> Optional[UsuarioResponse]:
+        """Devuelve el usuario en caché o None si no existe o expiró"""
+        clave = str(UUID(str(usuario_id)))
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    del self._entradas[clave]
+                self.misses += 1
+                registrar_cache("usuarios", False)
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            registrar_cache("usuarios", True)
+            return entrada[1]
+
+    def guardar(self, usuario_id, usuario: UsuarioResponse) -> None:
+        """Guarda el usuario descartando el menos usado si se llena"""
+        clave = str(UUID(str(usuario_id)))
+        with self._lock:
+            self._entradas[clave] = (time.monotonic() + self.ttl, usuario)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, usuario_id) -> None:
+        """Elimina un usuario de la caché"""
+        clave = str(UUID(str(usuario_id)))
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def limpiar(self) -> None:
+        """Vacía la caché"""
+        with self._lock:
+            self._entradas.clear()
+
+    def estadisticas(self) -> dict:
+        """Contadores de aciertos y fallos de la caché"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entradas": len(self._entradas),
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "tasa_aciertos": self.hits / total if total else 0.0,
+            }
+
+
+usuarios_cache = CacheUsuarios(
+    max_entradas=int(os.getenv("USUARIOS_CACHE_MAX", "1024")),
+    ttl=float(os.getenv("USUARIOS_CACHE_TTL", "60")),
+    intervalo_verificacion=float(os.getenv("USUARIOS_CACHE_VERIFICACION", "1")),
+)
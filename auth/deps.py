@@ -1,18 +1,21 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from .utils import decode_token
-from ..database import get_db
-from ..crud.usuarioCRUD import UsuarioCRUD
+from auth.cache import usuarios_cache
+from auth.utils import decode_token
+from database.config import get_async_db
+from crud.asyncCRUD import ContadorCRUDAsync, UsuarioCRUDAsync
+from crud.contadorCRUD import VERSION_USUARIOS
+from models import UsuarioResponse
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> UsuarioResponse:
     try:
         payload = decode_token(token)
         sub = payload.get("sub")
@@ -25,7 +28,6 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido"
         )
 
-    crud = UsuarioCRUD(db)
     try:
         user_id = UUID(sub)
     except Exception:
@@ -33,9 +35,23 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido"
         )
 
-    usuario = crud.obtener_usuario_por_id(user_id)
-    if not usuario:
+    if usuarios_cache.verificacion_pendiente():
+        usuarios_cache.actualizar_version(
+            await ContadorCRUDAsync(db).obtener_valor(VERSION_USUARIOS)
+        )
+    usuario = usuarios_cache.obtener(user_id)
+    if usuario is None:
+        crud = UsuarioCRUDAsync(db)
+        encontrado = await crud.obtener_usuario_por_id(user_id)
+        if not encontrado:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no existe"
+            )
+        usuario = UsuarioResponse.model_validate(encontrado)
+        usuarios_cache.guardar(user_id, usuario)
+
+    if not usuario.estado:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no existe"
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario inactivo"
         )
     return usuario
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from models import Token, LoginRequest
+from auth.cache import usuarios_cache
+from auth.deps import get_current_user
 from auth.utils import create_access_token, decode_token
-from database.config import get_db
-from crud.usuarioCRUD import UsuarioCRUD 
+from database.config import get_async_db
+from crud.asyncCRUD import UsuarioCRUDAsync
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,9 +14,9 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/login", response_model=Token)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    crud = UsuarioCRUD(db)
-    usuario = crud.autenticar_usuario(login_data.username, login_data.password)
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    crud = UsuarioCRUDAsync(db)
+    usuario = await crud.autenticar_usuario(login_data.username, login_data.password)
     if not usuario:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -29,3 +31,9 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
         "token_type": "bearer",
         "user_id": str(usuario.id), 
     }
+
+
+@router.get("/cache")
+async def estadisticas_cache(usuario=Depends(get_current_user)):
+    """Aciertos y fallos de la caché de usuarios autenticados"""
+    return usuarios_cache.estadisticas()
@@ -1,8 +1,19 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 from passlib.context import CryptContext
 
+from monitoreo.metricas import HASH_PASSWORD
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Número de procesos dedicados a bcrypt (por defecto uno por núcleo)
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(os.cpu_count() or 1)))
+
+_pool_hash: Optional[ProcessPoolExecutor] = None
+
 
 def hash_password(password: str) -> str:
     """Genera el hash seguro de la contraseña"""
@@ -12,3 +23,35 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, hashed: str) -> bool:
     """Verifica si una contraseña coincide con su hash"""
     return pwd_context.verify(password, hashed)
+
+
+def iniciar_pool_hash() -> ProcessPoolExecutor:
+    """Crea el pool de procesos para bcrypt si aún no existe"""
+    global _pool_hash
+    if _pool_hash is None:
+        _pool_hash = ProcessPoolExecutor(max_workers=HASH_POOL_SIZE)
+    return _pool_hash
+
+
+def cerrar_pool_hash() -> None:
+    """Detiene el pool de procesos para bcrypt"""
+    global _pool_hash
+    if _pool_hash is not None:
+        _pool_hash.shutdown(wait=False, cancel_futures=True)
+        _pool_hash = None
+
+
+async def hash_password_async(password: str) -> str:
+    """Genera el hash en el pool de procesos sin bloquear el event loop"""
+    loop = asyncio.get_running_loop()
+    with HASH_PASSWORD.labels("generar").time():
+        return await loop.run_in_executor(iniciar_pool_hash(), hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Verifica la contraseña en el pool de procesos sin bloquear el event loop"""
+    loop = asyncio.get_running_loop()
+    with HASH_PASSWORD.labels("verificar").time():
+        return await loop.run_in_executor(
+            iniciar_pool_hash(), verify_password, password, hashed
+        )
@@ -0,0 +1,563 @@
+"""
+Driver de carga asíncrono contra la API
+
+Lanza N clientes concurrentes que repiten una mezcla de operaciones parecida
+a la de producción durante un tiempo fijo y reporta throughput y latencias
+por ruta. Por defecto ejecuta ``main:app`` en el mismo proceso (con su
+startup/shutdown); con --url ataca un servidor ya levantado. Necesita datos
+sembrados con ``python -m benchmarks.datos`` o, en proceso, con --sembrar.
+
+Para una línea base hermética sin PostgreSQL se usa SQLite embebido en
+memoria, sembrado en el mismo proceso:
+    DB_BACKEND=sqlite python -m benchmarks.carga --sembrar 1
+
+Escenarios:
+    mezcla       login, listado de vehículos, alta de contrato, alta de pago
+                 y dashboard, con los pesos de MEZCLA
+    login        solo POST /auth/login; informa logins/s (bcrypt)
+    importacion  POST /Pagos/bulk con lotes de --filas pagos; informa filas/s
+    importacion_vehiculos
+                 un solo POST /Vehiculos/bulk en CSV con --filas vehículos de
+                 placa nueva; informa filas/s (ignora --duracion)
+    contencion   ráfagas de --clientes POST /Contratos/ sobre un mismo vehículo;
+                 falla si no hay exactamente un 201 por ráfaga
+    paginacion   la misma página de /Contratos/ por skip y por cursor a
+                 profundidades crecientes
+    disponibilidad
+                 GET /Vehiculos/disponibles con rangos de una semana al azar,
+                 sin filtro y por tipo
+    exportacion  GET /Pagos/export completo en NDJSON y CSV; informa filas/s y
+                 el pico de memoria del servidor (ignora --duracion)
+
+Uso:
+    python -m benchmarks.carga --clientes 50 --duracion 30
+    python -m benchmarks.carga --url http://localhost:8000 --json actual.json
+    python -m benchmarks.carga --comparar base.json --tolerancia 0.2
+
+En benchmarks/resultados/ hay resúmenes de referencia (escala 1, un worker
+de uvicorn y el driver en la misma máquina de una CPU) que sirven como base
+para --comparar. Los de la mezcla y la contención son sobre PostgreSQL 16
+local:
+    mezcla_200_sincrono.json   escenario mezcla, 200 clientes, 30 s, con los
+                               routers síncronos anteriores a AsyncCRUD
+    mezcla_200_asincrono.json  lo mismo con los routers sobre AsyncCRUD
+    contencion_50_antes.json   escenario contencion, 50 clientes, 20 s, antes
+                               de la reserva con UPDATE condicional
+    contencion_50_update.json  lo mismo con UPDATE ... WHERE disponible
+    disponibilidad_1M_contratos.json
+                               escenario disponibilidad, 1 cliente, 30 s,
+                               1M contratos y 50k vehículos (ver datos.py)
+    importacion_vehiculos_100k.json
+                               escenario importacion_vehiculos, 100k filas
+                               en un solo CSV sobre la base de escala 1
+El resto son sobre SQLite en archivo:
+    login_50_hilos.json        escenario login, 50 clientes, 20 s, con bcrypt
+                               en el pool de hilos
+    login_50_procesos.json     lo mismo con bcrypt en el pool de procesos
+    paginacion_escala15.json   escenario paginacion, 60 s, escala 15
+                               (300k contratos)
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import httpx
+
+from benchmarks.datos import CONTRASENA_BENCHMARK, PREFIJO_USUARIO, VOLUMENES, sembrar
+from benchmarks.reporte import Muestra, comparar, guardar, imprimir, resumir
+
+# Peso relativo de cada operación en el escenario mezcla
+MEZCLA = {
+    "login": 5,
+    "listar_vehiculos": 40,
+    "crear_contrato": 10,
+    "crear_pago": 20,
+    "dashboard": 25,
+}
+
+# Identificadores que se leen de la API antes de empezar
+MAXIMO_IDS = 5000
+
+
+class Estado:
+    """Datos compartidos por los clientes virtuales"""
+
+    def __init__(self):
+        self.usuario_id: str = ""
+        self.clientes: List[str] = []
+        self.empleados: List[str] = []
+        self.vehiculos_libres: List[str] = []
+        self.contratos: List[str] = []
+        self.muestras: List[Muestra] = []
+
+
+async def medir(estado: Estado, ruta: str, peticion) -> httpx.Response:
+    """Ejecutar la petición y anotar su latencia (estado 0 si falla la conexión)"""
+    inicio = time.perf_counter()
+    try:
+        respuesta = await peticion
+        codigo = respuesta.status_code
+    except httpx.HTTPError:
+        respuesta, codigo = None, 0
+    estado.muestras.append(Muestra(ruta, codigo, (time.perf_counter() - inicio) * 1000))
+    return respuesta
+
+
+async def _leer_ids(cliente: httpx.AsyncClient, url: str, **params) -> List[dict]:
+    """Recorrer un listado por cursor hasta MAXIMO_IDS filas"""
+    filas, after = [], None
+    while len(filas) < MAXIMO_IDS:
+        consulta = dict(params, limit=1000)
+        if after:
+            consulta["after"] = after
+        respuesta = await cliente.get(url, params=consulta)
+        respuesta.raise_for_status()
+        filas.extend(respuesta.json())
+        after = respuesta.headers.get("X-Next-Cursor")
+        if not after:
+            break
+    return filas
+
+
+async def preparar(cliente: httpx.AsyncClient) -> Estado:
+    """Iniciar sesión y cargar los ids sembrados que usan las operaciones"""
+    estado = Estado()
+    respuesta = await cliente.post(
+        "/auth/login",
+        json={"username": f"{PREFIJO_USUARIO}0", "password": CONTRASENA_BENCHMARK},
+    )
+    if respuesta.status_code != 200:
+        sys.exit("No se pudo iniciar sesión: ¿se ejecutó python -m benchmarks.datos?")
+    estado.usuario_id = respuesta.json()["user_id"]
+    estado.clientes = [
+        f["id"] for f in await _leer_ids(cliente, "/Clientes/", fields="id")
+    ]
+    estado.empleados = [
+        f["id"] for f in await _leer_ids(cliente, "/Empleados/", fields="id")
+    ]
+    estado.vehiculos_libres = [
+        f["id"]
+        for f in await _leer_ids(cliente, "/Vehiculos/", fields="id,disponible")
+        if f["disponible"]
+    ]
+    estado.contratos = [
+        f["id"]
+        for f in await _leer_ids(
+            cliente, "/Contratos/", fields="id", solo_activos="true"
+        )
+    ]
+    random.shuffle(estado.vehiculos_libres)
+    return estado
+
+
+async def operacion(cliente: httpx.AsyncClient, estado: Estado, nombre: str) -> None:
+    if nombre == "login":
+        usuario = random.randrange(VOLUMENES["usuarios"])
+        await medir(
+            estado,
+            "POST /auth/login",
+            cliente.post(
+                "/auth/login",
+                json={
+                    "username": f"{PREFIJO_USUARIO}{usuario}",
+                    "password": CONTRASENA_BENCHMARK,
+                },
+            ),
+        )
+    elif nombre == "listar_vehiculos":
+        await medir(
+            estado,
+            "GET /Vehiculos/",
+            cliente.get("/Vehiculos/", params={"limit": 50}),
+        )
+    elif nombre == "crear_contrato":
+        if not estado.vehiculos_libres:
+            return
+        respuesta = await medir(
+            estado,
+            "POST /Contratos/",
+            cliente.post(
+                "/Contratos/",
+                json={
+                    "cliente_id": random.choice(estado.clientes),
+                    "vehiculo_id": estado.vehiculos_libres.pop(),
+                    "empleado_id": random.choice(estado.empleados),
+                    "fecha_inicio": datetime.now().isoformat(),
+                    "id_usuario_creacion": estado.usuario_id,
+                },
+            ),
+        )
+        if respuesta is not None and respuesta.status_code == 201:
+            estado.contratos.append(respuesta.json()["id"])
+    elif nombre == "crear_pago":
+        await medir(
+            estado,
+            "POST /Pagos/",
+            cliente.post(
+                "/Pagos/",
+                json={
+                    "contrato_id": random.choice(estado.contratos),
+                    "monto": round(random.uniform(50, 900), 2),
+                    "id_usuario_creacion": estado.usuario_id,
+                },
+            ),
+        )
+    elif nombre == "dashboard":
+        await medir(estado, "GET /dashboard/counts", cliente.get("/dashboard/counts"))
+
+
+async def cliente_virtual(
+    cliente: httpx.AsyncClient, estado: Estado, fin: float, mezcla: dict = MEZCLA
+) -> None:
+    nombres, pesos = list(mezcla), list(mezcla.values())
+    while time.perf_counter() < fin:
+        await operacion(cliente, estado, random.choices(nombres, pesos)[0])
+
+
+async def escenario_mezcla(cliente, estado: Estado, args) -> None:
+    fin = time.perf_counter() + args.duracion
+    await asyncio.gather(
+        *(cliente_virtual(cliente, estado, fin) for _ in range(args.clientes))
+    )
+
+
+async def escenario_login(cliente, estado: Estado, args) -> None:
+    """Solo inicios de sesión: throughput de la verificación bcrypt"""
+    inicio = time.perf_counter()
+    fin = inicio + args.duracion
+    await asyncio.gather(
+        *(
+            cliente_virtual(cliente, estado, fin, {"login": 1})
+            for _ in range(args.clientes)
+        )
+    )
+    duracion = time.perf_counter() - inicio
+    sesiones = sum(1 for m in estado.muestras if m.estado == 200)
+    print(
+        f"login: {sesiones} sesiones en {duracion:.1f} s ({sesiones / duracion:,.1f} logins/s)"
+    )
+
+
+async def escenario_importacion(cliente, estado: Estado, args) -> None:
+    """Lotes secuenciales de pagos por el endpoint masivo"""
+    fin = time.perf_counter() + args.duracion
+    filas = 0
+    inicio = time.perf_counter()
+    while time.perf_counter() < fin:
+        lote = [
+            {
+                "contrato_id": random.choice(estado.contratos),
+                "monto": round(random.uniform(50, 900), 2),
+            }
+            for _ in range(args.filas)
+        ]
+        respuesta = await medir(
+            estado,
+            "POST /Pagos/bulk",
+            cliente.post(
+                "/Pagos/bulk",
+                params={"id_usuario_creacion": estado.usuario_id},
+                json=lote,
+            ),
+        )
+        if respuesta is not None and respuesta.status_code == 200:
+            filas += respuesta.json()["insertados"]
+    duracion = time.perf_counter() - inicio
+    print(
+        f"importación: {filas} filas en {duracion:.1f} s ({filas / duracion:,.0f} filas/s)"
+    )
+
+
+async def escenario_importacion_vehiculos(cliente, estado: Estado, args) -> List[str]:
+    """Una carga CSV de --filas vehículos con placas que no existen"""
+    tipos = [t["id"] for t in (await cliente.get("/Tipos-de-Vehiculos/")).json()]
+    prefijo = f"I{random.getrandbits(24):06X}"
+    csv = "marca,modelo,placa,tipo_id,disponible\n" + "".join(
+        f"Kia,Rio,{prefijo}{i:07d},{random.choice(tipos)},true\n"
+        for i in range(args.filas)
+    )
+    inicio = time.perf_counter()
+    respuesta = await medir(
+        estado,
+        "POST /Vehiculos/bulk (CSV)",
+        cliente.post(
+            "/Vehiculos/bulk",
+            params={"id_usuario_creacion": estado.usuario_id},
+            content=csv,
+            headers={"Content-Type": "text/csv"},
+            timeout=None,
+        ),
+    )
+    duracion = time.perf_counter() - inicio
+    if respuesta is None or respuesta.status_code != 200:
+        return [f"carga de vehículos: {respuesta.status_code if respuesta else 0}"]
+    resultado = respuesta.json()
+    print(
+        f"importación de vehículos: {resultado['insertados']} filas en"
+        f" {duracion:.1f} s ({resultado['insertados'] / duracion:,.0f} filas/s)"
+    )
+    return [f"fila {e['fila']}: {e['error']}" for e in resultado["errores"][:10]]
+
+
+async def escenario_contencion(cliente, estado: Estado, args) -> List[str]:
+    """
+    Ráfagas de --clientes altas de contrato simultáneas sobre un mismo vehículo
+
+    Cada ráfaga usa un vehículo libre distinto y se repite hasta agotar la
+    duración. En cada una debe haber exactamente un 201, el resto 4xx, y el
+    vehículo debe quedar no disponible.
+
+    Returns:
+        Una descripción por ráfaga que no cumplió lo anterior
+    """
+    fallos = []
+    rafagas = 0
+    fin = time.perf_counter() + args.duracion
+    while time.perf_counter() < fin and estado.vehiculos_libres:
+        vehiculo_id = estado.vehiculos_libres.pop()
+        inicio = len(estado.muestras)
+        await asyncio.gather(
+            *(
+                medir(
+                    estado,
+                    "POST /Contratos/ (mismo vehículo)",
+                    cliente.post(
+                        "/Contratos/",
+                        json={
+                            "cliente_id": random.choice(estado.clientes),
+                            "vehiculo_id": vehiculo_id,
+                            "empleado_id": random.choice(estado.empleados),
+                            "fecha_inicio": datetime.now().isoformat(),
+                            "id_usuario_creacion": estado.usuario_id,
+                        },
+                    ),
+                )
+                for _ in range(args.clientes)
+            )
+        )
+        codigos = [m.estado for m in estado.muestras[inicio:]]
+        creados = codigos.count(201)
+        rechazados = sum(1 for codigo in codigos if 400 <= codigo < 500)
+        vehiculo = (await cliente.get(f"/Vehiculos/{vehiculo_id}")).json()
+        if creados != 1 or rechazados != len(codigos) - 1 or vehiculo["disponible"]:
+            fallos.append(
+                f"vehículo {vehiculo_id}: {creados} creados, {rechazados} rechazados"
+                f" de {len(codigos)}, disponible={vehiculo['disponible']}"
+            )
+        rafagas += 1
+    print(f"contención: {rafagas} ráfagas de {args.clientes}, {len(fallos)} fallidas")
+    return fallos
+
+
+async def escenario_paginacion(cliente, estado: Estado, args) -> None:
+    """
+    Misma página de /Contratos/ pedida por offset (skip) y por cursor (after)
+
+    Recorre profundidades crecientes repartiendo la duración entre ellas y
+    alternando ambos modos, de a una petición por vez, para comparar la
+    latencia sin contención.
+    """
+    total = int((await cliente.get("/dashboard/counts")).json()["contratos"])
+    profundidades = sorted({0, total // 10, total // 2, max(total - 100, 0)})
+    por_profundidad = args.duracion / len(profundidades)
+    for profundidad in profundidades:
+        after = None
+        if profundidad:
+            previa = await cliente.get(
+                "/Contratos/",
+                params={"skip": profundidad - 1, "limit": 1, "fields": "id"},
+            )
+            after = previa.headers.get("X-Next-Cursor")
+        fin = time.perf_counter() + por_profundidad
+        while time.perf_counter() < fin:
+            await medir(
+                estado,
+                f"GET /Contratos/ offset {profundidad:>7}",
+                cliente.get("/Contratos/", params={"skip": profundidad, "limit": 50}),
+            )
+            params = {"limit": 50, "after": after} if after else {"limit": 50}
+            await medir(
+                estado,
+                f"GET /Contratos/ cursor {profundidad:>7}",
+                cliente.get("/Contratos/", params=params),
+            )
+
+
+async def escenario_disponibilidad(cliente, estado: Estado, args) -> None:
+    """
+    GET /Vehiculos/disponibles con rangos de una semana al azar
+
+    De a una petición por vez, alternando la búsqueda sin filtro y por tipo,
+    para medir la latencia de la consulta de solapamiento sin contención.
+    """
+    tipos = [t["id"] for t in (await cliente.get("/Tipos-de-Vehiculos/")).json()]
+    fin = time.perf_counter() + args.duracion
+    while time.perf_counter() < fin:
+        desde = datetime.now() + timedelta(days=random.randint(-30, 30))
+        params = {
+            "desde": desde.isoformat(),
+            "hasta": (desde + timedelta(days=7)).isoformat(),
+        }
+        await medir(
+            estado,
+            "GET /Vehiculos/disponibles",
+            cliente.get("/Vehiculos/disponibles", params=params),
+        )
+        await medir(
+            estado,
+            "GET /Vehiculos/disponibles tipo",
+            cliente.get(
+                "/Vehiculos/disponibles",
+                params=dict(params, tipo_id=random.choice(tipos)),
+            ),
+        )
+
+
+async def _memoria_servidor(cliente: httpx.AsyncClient) -> Optional[float]:
+    """RSS del servidor en MB según /metrics (None si no lo publica)"""
+    respuesta = await cliente.get("/metrics")
+    for linea in respuesta.text.splitlines():
+        if linea.startswith("process_resident_memory_bytes "):
+            return float(linea.split()[1]) / 2**20
+    return None
+
+
+async def escenario_exportacion(cliente, estado: Estado, args) -> None:
+    """
+    Exportación completa de pagos en cada formato; informa filas/s y memoria
+
+    Mientras dura la descarga se muestrea el RSS del servidor cada 200 ms a
+    través de /metrics (no disponible en modo multiproceso).
+    """
+    for formato in ("ndjson", "csv"):
+        muestras_rss = []
+        descargando = True
+
+        async def muestrear():
+            while descargando:
+                rss = await _memoria_servidor(cliente)
+                if rss is not None:
+                    muestras_rss.append(rss)
+                await asyncio.sleep(0.2)
+
+        rss_inicial = await _memoria_servidor(cliente)
+        tarea = asyncio.create_task(muestrear())
+        filas = octetos = 0
+        inicio = time.perf_counter()
+        async with cliente.stream(
+            "GET", "/Pagos/export", params={"formato": formato}
+        ) as respuesta:
+            async for bloque in respuesta.aiter_bytes():
+                filas += bloque.count(b"\n")
+                octetos += len(bloque)
+            codigo = respuesta.status_code
+        duracion = time.perf_counter() - inicio
+        descargando = False
+        await tarea
+        estado.muestras.append(
+            Muestra(f"GET /Pagos/export {formato}", codigo, duracion * 1000)
+        )
+        if formato == "csv":
+            filas -= 1  # cabecera
+        memoria = (
+            f"RSS {rss_inicial:.0f} MB -> pico {max(muestras_rss):.0f} MB"
+            if rss_inicial is not None and muestras_rss
+            else "RSS no disponible"
+        )
+        print(
+            f"exportación {formato}: {filas} filas, {octetos / 2**20:.1f} MB en"
+            f" {duracion:.1f} s ({filas / duracion:,.0f} filas/s), {memoria}"
+        )
+
+
+ESCENARIOS = {
+    "mezcla": escenario_mezcla,
+    "login": escenario_login,
+    "importacion": escenario_importacion,
+    "importacion_vehiculos": escenario_importacion_vehiculos,
+    "contencion": escenario_contencion,
+    "paginacion": escenario_paginacion,
+    "disponibilidad": escenario_disponibilidad,
+    "exportacion": escenario_exportacion,
+}
+
+
+@asynccontextmanager
+async def abrir_cliente(url: str, clientes: int):
+    """Cliente HTTP contra un servidor o contra main:app en el proceso"""
+    # Conexiones ociosas descartadas antes del keep-alive de uvicorn (5 s): si
+    # el servidor cierra una que el cliente reutiliza, la petición falla con
+    # ReadError y se contaría como error del servidor
+    limites = httpx.Limits(
+        max_connections=clientes, max_keepalive_connections=clientes, keepalive_expiry=2
+    )
+    if url:
+        async with httpx.AsyncClient(
+            base_url=url, limits=limites, timeout=60
+        ) as cliente:
+            yield cliente
+        return
+
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://benchmark",
+            timeout=60,
+        ) as cliente:
+            yield cliente
+
+
+async def ejecutar(args) -> int:
+    if args.sembrar:
+        sembrar(args.sembrar, args.semilla)
+    async with abrir_cliente(args.url, args.clientes) as cliente:
+        estado = await preparar(cliente)
+        inicio = time.perf_counter()
+        fallos = await ESCENARIOS[args.escenario](cliente, estado, args) or []
+        duracion = time.perf_counter() - inicio
+
+    resumen = resumir(estado.muestras, duracion)
+    imprimir(resumen)
+    if args.json:
+        guardar(resumen, args.json)
+    for fallo in fallos:
+        print(f"FALLO {fallo}")
+    if fallos:
+        return 1
+    if args.comparar:
+        regresiones = comparar(resumen, args.comparar, args.tolerancia)
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}")
+        return 1 if regresiones else 0
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="", help="Servidor (por defecto, en proceso)")
+    parser.add_argument("--escenario", choices=ESCENARIOS, default="mezcla")
+    parser.add_argument("--clientes", type=int, default=50)
+    parser.add_argument("--duracion", type=float, default=30, help="Segundos")
+    parser.add_argument("--filas", type=int, default=1000, help="Filas por lote")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument(
+        "--sembrar", type=int, default=0, help="Sembrar antes con esta escala"
+    )
+    parser.add_argument("--json", help="Guardar el resumen en este archivo")
+    parser.add_argument("--comparar", help="Resumen base para detectar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    random.seed(args.semilla)
+    return asyncio.run(ejecutar(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Generador de datos para los benchmarks
+
+Siembra volúmenes realistas en la base configurada (DATABASE_URL) con INSERT
+masivos por lotes, sin pasar por la API. Los volúmenes se multiplican por la
+escala: con escala 1 son unos 60k registros, con escala 20 más de un millón.
+Al terminar reconcilia los contadores del dashboard.
+
+Todos los usuarios sembrados comparten la contraseña CONTRASENA_BENCHMARK
+(el hash se calcula una sola vez).
+
+Los volúmenes de cada tabla se pueden fijar a mano (clave=valor, en filas,
+sin escalar), por ejemplo el dataset de disponibilidad de 1M contratos y 50k
+vehículos sin pagos:
+    python -m benchmarks.datos 1 42 contratos=1000000 vehiculos=50000 \
+        pagos_por_contrato=0
+
+Uso:
+    python -m benchmarks.datos [escala] [semilla] [clave=valor ...]
+    DB_BACKEND=sqlite DATABASE_URL=sqlite:///bench.db python -m benchmarks.datos
+"""
+
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+
+from auth.security import hash_password
+from crud.contadorCRUD import ContadorCRUD
+from database.config import SessionLocal, create_tables
+from entities.cliente import Cliente
+from entities.contrato import Contrato
+from entities.empleado import Empleado
+from entities.pago import Pago
+from entities.tipoVehiculo import TipoVehiculo
+from entities.usuario import RolEnum, Usuario
+from entities.vehiculo import Vehiculo
+
+CONTRASENA_BENCHMARK = "benchmark123"
+PREFIJO_USUARIO = "bench_"
+TAMANO_LOTE = 5000
+
+# Registros por unidad de escala
+VOLUMENES = {
+    "usuarios": 20,
+    "clientes": 5000,
+    "empleados": 100,
+    "vehiculos": 2000,
+    "contratos": 20000,
+    "pagos_por_contrato": 2,
+}
+
+# Fracción de vehículos con un contrato activo (no disponibles)
+FRACCION_ALQUILADOS = 0.4
+
+TIPOS = ["Sedán", "Hatchback", "SUV", "Pickup", "Van", "Deportivo", "Eléctrico"]
+MARCAS = {
+    "Toyota": ["Corolla", "Yaris", "Hilux", "Rav4"],
+    "Chevrolet": ["Onix", "Spark", "Tracker", "Colorado"],
+    "Renault": ["Logan", "Sandero", "Duster", "Kwid"],
+    "Mazda": ["2", "3", "CX-30", "CX-5"],
+    "Kia": ["Picanto", "Rio", "Sportage", "Niro"],
+}
+NOMBRES = ["Ana", "Luis", "Carla", "Jorge", "Marta", "Pedro", "Lucía", "Diego"]
+APELLIDOS = ["Gómez", "Rodríguez", "López", "Martínez", "García", "Pérez", "Díaz"]
+
+
+def _insertar(db, modelo, filas: List[Dict]) -> None:
+    """INSERT por lotes de TAMANO_LOTE filas (executemany)"""
+    for inicio in range(0, len(filas), TAMANO_LOTE):
+        db.execute(insert(modelo), filas[inicio : inicio + TAMANO_LOTE])
+
+
+def _nombre(azar: random.Random) -> str:
+    return f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)}"
+
+
+def volumenes_efectivos(
+    escala: int = 1, volumenes: Optional[Dict[str, int]] = None
+) -> Dict[str, int]:
+    """
+    VOLUMENES multiplicados por la escala, con los valores fijados a mano
+
+    pagos_por_contrato es un promedio y no se escala.
+    """
+    efectivos = {
+        clave: valor if clave == "pagos_por_contrato" else valor * escala
+        for clave, valor in VOLUMENES.items()
+    }
+    for clave, valor in (volumenes or {}).items():
+        if clave not in VOLUMENES:
+            raise ValueError(f"Volumen desconocido: {clave}")
+        efectivos[clave] = valor
+    return efectivos
+
+
+def generar(
+    escala: int = 1, semilla: int = 42, volumenes: Optional[Dict[str, int]] = None
+) -> Dict[str, List[Dict]]:
+    """
+    Generar las filas de todas las tablas en memoria
+
+    Args:
+        escala: Multiplicador de VOLUMENES
+        semilla: Semilla del generador (misma semilla, mismos datos)
+        volumenes: Filas fijas por tabla que reemplazan a las escaladas
+
+    Returns:
+        Filas por tabla, en orden de inserción
+    """
+    volumen = volumenes_efectivos(escala, volumenes)
+    azar = random.Random(semilla)
+    ahora = datetime.now()
+    password_hash = hash_password(CONTRASENA_BENCHMARK)
+
+    usuarios = [
+        {
+            "id": uuid.uuid4(),
+            "username": f"{PREFIJO_USUARIO}{i}",
+            "password_hash": password_hash,
+            "rol": RolEnum.admin,
+            "estado": True,
+        }
+        for i in range(volumen["usuarios"])
+    ]
+    creador = usuarios[0]["id"]
+
+    tipos = [
+        {"id": uuid.uuid4(), "nombre": nombre, "id_usuario_creacion": creador}
+        for nombre in TIPOS
+    ]
+    clientes = [
+        {
+            "id": uuid.uuid4(),
+            "nombre": _nombre(azar),
+            "email": f"cliente{i}@benchmark.example.com",
+            "telefono": f"3{azar.randint(100000000, 199999999)}",
+            "id_usuario_creacion": creador,
+        }
+        for i in range(volumen["clientes"])
+    ]
+    empleados = [
+        {
+            "id": uuid.uuid4(),
+            "nombre": _nombre(azar),
+            "email": f"empleado{i}@benchmark.example.com",
+            "id_usuario_creacion": creador,
+        }
+        for i in range(volumen["empleados"])
+    ]
+
+    total_vehiculos = volumen["vehiculos"]
+    alquilados = int(total_vehiculos * FRACCION_ALQUILADOS)
+    vehiculos = []
+    for i in range(total_vehiculos):
+        marca = azar.choice(list(MARCAS))
+        vehiculos.append(
+            {
+                "id": uuid.uuid4(),
+                "marca": marca.upper(),
+                "modelo": azar.choice(MARCAS[marca]).upper(),
+                "placa": f"BEN{i:06d}",
+                "tipo_id": azar.choice(tipos)["id"],
+                "disponible": i >= alquilados,
+                "id_usuario_creacion": creador,
+            }
+        )
+
+    # Historial de contratos cerrados y un contrato activo por vehículo alquilado
+    contratos = []
+    for i in range(volumen["contratos"]):
+        activo = i < alquilados
+        vehiculo = vehiculos[i] if activo else azar.choice(vehiculos)
+        inicio = ahora - timedelta(days=azar.randint(1, 3 * 365))
+        contratos.append(
+            {
+                "id": uuid.uuid4(),
+                "cliente_id": azar.choice(clientes)["id"],
+                "vehiculo_id": vehiculo["id"],
+                "empleado_id": azar.choice(empleados)["id"],
+                "fecha_inicio": inicio,
+                "fecha_fin": (
+                    None if activo else inicio + timedelta(days=azar.randint(1, 30))
+                ),
+                "activo": activo,
+                "id_usuario_creacion": creador,
+                "fecha_creacion": inicio,
+            }
+        )
+
+    pagos = [
+        {
+            "id": uuid.uuid4(),
+            "contrato_id": contrato["id"],
+            "monto": round(azar.uniform(50, 900), 2),
+            "fecha_pago": contrato["fecha_inicio"] + timedelta(days=n),
+            "id_usuario_creacion": creador,
+        }
+        for contrato in contratos
+        for n in range(
+            azar.randint(1, 2 * volumen["pagos_por_contrato"] - 1)
+            if volumen["pagos_por_contrato"]
+            else 0
+        )
+    ]
+
+    return {
+        "usuarios": usuarios,
+        "tipos_vehiculo": tipos,
+        "clientes": clientes,
+        "empleados": empleados,
+        "vehiculos": vehiculos,
+        "contratos": contratos,
+        "pagos": pagos,
+    }
+
+
+MODELOS = {
+    "usuarios": Usuario,
+    "tipos_vehiculo": TipoVehiculo,
+    "clientes": Cliente,
+    "empleados": Empleado,
+    "vehiculos": Vehiculo,
+    "contratos": Contrato,
+    "pagos": Pago,
+}
+
+
+def sembrar(
+    escala: int = 1, semilla: int = 42, volumenes: Optional[Dict[str, int]] = None
+) -> Dict[str, int]:
+    """
+    Crear las tablas si faltan e insertar los datos generados
+
+    Returns:
+        Filas insertadas por tabla
+    """
+    create_tables()
+    filas = generar(escala, semilla, volumenes)
+    db = SessionLocal()
+    try:
+        for tabla, modelo in MODELOS.items():
+            _insertar(db, modelo, filas[tabla])
+        db.commit()
+        ContadorCRUD(db).reconciliar()
+    finally:
+        db.close()
+    return {tabla: len(registros) for tabla, registros in filas.items()}
+
+
+def main(
+    escala: int = 1, semilla: int = 42, volumenes: Optional[Dict[str, int]] = None
+) -> None:
+    inicio = time.perf_counter()
+    insertadas = sembrar(escala, semilla, volumenes)
+    duracion = time.perf_counter() - inicio
+    for tabla, cantidad in insertadas.items():
+        print(f"  {tabla:<16}{cantidad:>10}")
+    total = sum(insertadas.values())
+    print(f"{total} filas en {duracion:.1f} s ({total / duracion:,.0f} filas/s)")
+
+
+if __name__ == "__main__":
+    posicionales = [int(arg) for arg in sys.argv[1:] if "=" not in arg]
+    fijados = dict(arg.split("=", 1) for arg in sys.argv[1:] if "=" in arg)
+    main(*posicionales[:2], volumenes={k: int(v) for k, v in fijados.items()})
@@ -0,0 +1,264 @@
+"""
+Benchmark de los índices de claves foráneas y filtros
+
+Ejecuta las consultas de la API que filtran por claves foráneas o por estado
+(a través de las clases CRUD reales) en dos fases: sin los índices de la
+migración e6a1d4c8b253 y con ellos. En cada fase muestra el plan de la
+sentencia principal (EXPLAIN) y las latencias p50/p95/p99. Al terminar los
+índices quedan creados.
+
+Los índices se eliminan y se crean sin CONCURRENTLY: usar solo sobre una base
+de benchmark. Para el dataset de referencia (escala 15: 300k contratos, 600k
+pagos y 30k vehículos, ~1M filas sumando todas las tablas):
+    python -m benchmarks.datos 15
+    python -m benchmarks.indices --repeticiones 500 --json indices.json
+
+benchmarks/resultados/indices_1M_contratos.json es una corrida sobre
+PostgreSQL con el dataset de disponibilidad (1M contratos, 50k vehículos, sin
+pagos; ver benchmarks.datos): la búsqueda de disponibilidad pasa de ~10 s a
+~42 ms de p50 con el índice parcial.
+
+Con SQLite embebido en memoria, sembrado en el mismo proceso:
+    DB_BACKEND=sqlite python -m benchmarks.indices --sembrar 1
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from benchmarks.datos import sembrar
+from benchmarks.reporte import Muestra, guardar, imprimir, resumir
+from crud.contratoCRUD import ContratoCRUD
+from crud.pagoCRUD import PagoCRUD
+from crud.vehiculoCRUD import VehiculoCRUD
+from database.config import Base, SessionLocal, engine
+from entities.cliente import Cliente
+from entities.contrato import Contrato
+from entities.tipoVehiculo import TipoVehiculo
+from monitoreo.consultas import contar_consultas
+
+# Índices que agrega la migración e6a1d4c8b253 (definidos en las entidades)
+INDICES = [
+    "ix_contratos_vehiculo_id",
+    "ix_contratos_cliente_id",
+    "ix_contratos_empleado_id",
+    "ix_contratos_activos_fecha_creacion_id",
+    "ix_contratos_activos_vehiculo_periodo",
+    "ix_pagos_contrato_fecha_creacion_id",
+    "ix_pagos_fecha_pago",
+    "ix_vehiculos_tipo_id",
+]
+
+# Índice completo de disponibilidad que la migración reemplaza; se elimina en
+# las dos fases para que no enmascare al parcial
+REEMPLAZADO = "ix_contratos_vehiculo_periodo"
+
+# Identificadores de muestra que se leen antes de medir
+MAXIMO_IDS = 1000
+
+
+def _indices() -> list:
+    """Objetos Index de las entidades que corresponden a INDICES"""
+    por_nombre = {
+        indice.name: indice
+        for tabla in Base.metadata.sorted_tables
+        for indice in tabla.indexes
+    }
+    return [por_nombre[nombre] for nombre in INDICES]
+
+
+def _cambiar_indices(crear: bool) -> None:
+    """Crear o eliminar los índices y actualizar las estadísticas del planificador"""
+    with engine.begin() as conexion:
+        for indice in _indices():
+            if crear:
+                indice.create(conexion, checkfirst=True)
+            else:
+                indice.drop(conexion, checkfirst=True)
+        conexion.exec_driver_sql(f"DROP INDEX IF EXISTS {REEMPLAZADO}")
+        for tabla in ("contratos", "pagos", "vehiculos"):
+            conexion.exec_driver_sql(f"ANALYZE {tabla}")
+
+
+def _ids(db: Session, columna) -> list:
+    return list(db.scalars(select(columna).limit(MAXIMO_IDS)))
+
+
+class Muestreo:
+    """Valores de filtro tomados de los datos sembrados"""
+
+    def __init__(self, db: Session, semilla: int):
+        self.azar = random.Random(semilla)
+        self.contratos = _ids(db, Contrato.id)
+        self.clientes = _ids(db, Cliente.id)
+        self.tipos = _ids(db, TipoVehiculo.id)
+        if not (self.contratos and self.clientes and self.tipos):
+            sys.exit("Sin datos: ¿se ejecutó python -m benchmarks.datos?")
+        self.fechas = _ids(db, Contrato.fecha_inicio)
+
+
+def _pagos_por_contrato(db: Session, m: Muestreo) -> None:
+    PagoCRUD(db).obtener_pagos(contrato_id=m.azar.choice(m.contratos))
+
+
+def _contratos_activos(db: Session, m: Muestreo) -> None:
+    ContratoCRUD(db).obtener_contratos(solo_activos=True)
+
+
+def _vehiculos_disponibles(db: Session, m: Muestreo) -> None:
+    desde = datetime.now() + timedelta(days=m.azar.randint(0, 30))
+    VehiculoCRUD(db).obtener_vehiculos_disponibles(desde, desde + timedelta(days=7))
+
+
+def _vehiculos_disponibles_tipo(db: Session, m: Muestreo) -> None:
+    desde = datetime.now() + timedelta(days=m.azar.randint(0, 30))
+    VehiculoCRUD(db).obtener_vehiculos_disponibles(
+        desde, desde + timedelta(days=7), tipo_id=m.azar.choice(m.tipos)
+    )
+
+
+def _exportar_pagos_dia(db: Session, m: Muestreo) -> None:
+    desde = m.azar.choice(m.fechas)
+    db.execute(PagoCRUD.consulta_exportacion(desde, desde + timedelta(days=1))).all()
+
+
+def _contratos_de_cliente(db: Session, m: Muestreo) -> None:
+    # La misma búsqueda que hace la base al verificar la FK al borrar un cliente
+    db.execute(
+        select(Contrato.id)
+        .where(Contrato.cliente_id == m.azar.choice(m.clientes))
+        .limit(1)
+    ).all()
+
+
+CONSULTAS: Dict[str, Callable[[Session, Muestreo], None]] = {
+    "obtener_pagos(contrato_id)": _pagos_por_contrato,
+    "obtener_contratos(solo_activos)": _contratos_activos,
+    "vehiculos_disponibles": _vehiculos_disponibles,
+    "vehiculos_disponibles(tipo_id)": _vehiculos_disponibles_tipo,
+    "exportacion pagos (1 día)": _exportar_pagos_dia,
+    "FK contratos.cliente_id": _contratos_de_cliente,
+}
+
+
+def _resumir_plan(dialecto: str, filas: list) -> str:
+    """Plan en una línea: nodos e índices usados"""
+    if dialecto == "sqlite":
+        return " > ".join(fila[-1] for fila in filas)
+
+    plan = filas[0][0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    nodos = []
+
+    def recorrer(nodo: dict) -> None:
+        descripcion = nodo["Node Type"]
+        if "Index Name" in nodo:
+            descripcion += f" ({nodo['Index Name']})"
+        elif "Relation Name" in nodo:
+            descripcion += f" ({nodo['Relation Name']})"
+        nodos.append(descripcion)
+        for hijo in nodo.get("Plans", []):
+            recorrer(hijo)
+
+    recorrer(plan[0]["Plan"])
+    return " > ".join(nodos)
+
+
+def explicar(db: Session, consulta: Callable, m: Muestreo) -> str:
+    """Plan de la sentencia más lenta que ejecuta la consulta"""
+    with contar_consultas() as estadisticas:
+        consulta(db, m)
+    _, sentencia, parametros, _ = estadisticas.mas_lenta
+    dialecto = engine.dialect.name
+    prefijo = (
+        "EXPLAIN (FORMAT JSON) " if dialecto == "postgresql" else "EXPLAIN QUERY PLAN "
+    )
+    filas = (
+        db.connection()
+        .exec_driver_sql(prefijo + sentencia, parametros if parametros else ())
+        .all()
+    )
+    return _resumir_plan(dialecto, filas)
+
+
+def medir_fase(repeticiones: int, semilla: int) -> Dict[str, dict]:
+    """
+    Planes y latencias de todas las consultas con los índices actuales
+
+    Returns:
+        Por consulta: el plan y el resumen de latencias (ver reporte.resumir)
+    """
+    db = SessionLocal()
+    try:
+        m = Muestreo(db, semilla)
+        resultado = {}
+        for nombre, consulta in CONSULTAS.items():
+            plan = explicar(db, consulta, m)
+            # Calentamiento de caché antes de medir
+            for _ in range(min(10, repeticiones)):
+                consulta(db, m)
+            muestras: List[Muestra] = []
+            inicio_fase = time.perf_counter()
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                consulta(db, m)
+                muestras.append(
+                    Muestra(nombre, 200, (time.perf_counter() - inicio) * 1000)
+                )
+            db.rollback()
+            resumen = resumir(muestras, time.perf_counter() - inicio_fase)[nombre]
+            resultado[nombre] = dict(resumen, plan=plan)
+        return resultado
+    finally:
+        db.close()
+
+
+def imprimir_comparacion(sin: Dict[str, dict], con: Dict[str, dict]) -> None:
+    print(f"\n{'consulta':<34}{'p50 sin':>10}{'p50 con':>10}{'mejora':>9}")
+    for nombre in CONSULTAS:
+        antes, despues = sin[nombre]["p50"], con[nombre]["p50"]
+        mejora = f"{antes / despues:.1f}x" if despues else "-"
+        print(f"{nombre:<34}{antes:>10}{despues:>10}{mejora:>9}")
+
+
+def ejecutar(args) -> int:
+    if args.sembrar:
+        sembrar(args.sembrar, args.semilla)
+
+    fases = {}
+    for fase, crear in (("sin_indices", False), ("con_indices", True)):
+        _cambiar_indices(crear)
+        fases[fase] = medir_fase(args.repeticiones, args.semilla)
+        print(f"\n== {fase} ==")
+        for nombre, r in fases[fase].items():
+            print(f"{nombre}: {r['plan']}")
+        imprimir(fases[fase])
+
+    imprimir_comparacion(fases["sin_indices"], fases["con_indices"])
+    if args.json:
+        guardar(fases, args.json)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument(
+        "--sembrar", type=int, default=0, help="Sembrar antes con esta escala"
+    )
+    parser.add_argument("--json", help="Guardar planes y latencias en este archivo")
+    args = parser.parse_args(argv)
+    return ejecutar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
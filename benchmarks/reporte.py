@@ -0,0 +1,104 @@
+"""
+Reporte de throughput y latencias por ruta
+
+Resume las muestras del driver de carga (p50/p95/p99 por ruta), las guarda
+como JSON y las compara con una ejecución base para detectar regresiones.
+"""
+
+import json
+import math
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+
+class Muestra(NamedTuple):
+    ruta: str
+    estado: int
+    latencia_ms: float
+
+
+def percentil(ordenados: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not ordenados:
+        return 0.0
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def resumir(muestras: List[Muestra], duracion_s: float) -> Dict[str, dict]:
+    """
+    Agrupar las muestras por ruta
+
+    Returns:
+        Por ruta: peticiones, errores (5xx y fallos de conexión), rechazos
+        (4xx), peticiones por segundo y latencias en ms. La clave "total"
+        agrega todas las rutas.
+    """
+    por_ruta = defaultdict(list)
+    for muestra in muestras:
+        por_ruta[muestra.ruta].append(muestra)
+        por_ruta["total"].append(muestra)
+
+    resumen = {}
+    for ruta, grupo in sorted(por_ruta.items()):
+        latencias = sorted(m.latencia_ms for m in grupo)
+        resumen[ruta] = {
+            "peticiones": len(grupo),
+            "errores": sum(1 for m in grupo if m.estado == 0 or m.estado >= 500),
+            "rechazos": sum(1 for m in grupo if 400 <= m.estado < 500),
+            "rps": round(len(grupo) / duracion_s, 1) if duracion_s else 0.0,
+            "p50": round(percentil(latencias, 50), 2),
+            "p95": round(percentil(latencias, 95), 2),
+            "p99": round(percentil(latencias, 99), 2),
+            "max": round(latencias[-1], 2),
+        }
+    return resumen
+
+
+def imprimir(resumen: Dict[str, dict]) -> None:
+    """Tabla de texto con una fila por ruta"""
+    print(
+        f"{'ruta':<32}{'peticiones':>11}{'err':>6}{'4xx':>6}{'rps':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    )
+    for ruta, r in resumen.items():
+        print(
+            f"{ruta:<32}{r['peticiones']:>11}{r['errores']:>6}{r['rechazos']:>6}"
+            f"{r['rps']:>9}{r['p50']:>9}{r['p95']:>9}{r['p99']:>9}{r['max']:>9}"
+        )
+
+
+def guardar(resumen: Dict[str, dict], archivo: str) -> None:
+    with open(archivo, "w", encoding="utf-8") as f:
+        json.dump(resumen, f, indent=2, ensure_ascii=False)
+
+
+def comparar(
+    resumen: Dict[str, dict], archivo_base: str, tolerancia: float = 0.2
+) -> List[str]:
+    """
+    Rutas cuyo p95 o p99 empeoró más que la tolerancia frente a la base
+
+    Args:
+        resumen: Resultado actual
+        archivo_base: JSON guardado de una ejecución anterior
+        tolerancia: Aumento relativo admitido (0.2 = 20 %)
+
+    Returns:
+        Una descripción por regresión encontrada
+    """
+    with open(archivo_base, encoding="utf-8") as f:
+        base = json.load(f)
+
+    regresiones = []
+    for ruta, actual in resumen.items():
+        anterior = base.get(ruta)
+        if not anterior:
+            continue
+        for metrica in ("p95", "p99"):
+            if anterior[metrica] and actual[metrica] > anterior[metrica] * (
+                1 + tolerancia
+            ):
+                regresiones.append(
+                    f"{ruta} {metrica}: {anterior[metrica]} ms -> {actual[metrica]} ms"
+                )
+    return regresiones
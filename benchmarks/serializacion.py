@@ -0,0 +1,94 @@
+"""
+Microbenchmark de serialización de listados
+
+Compara el camino estándar de FastAPI (validar cada fila con response_model
+from_attributes, volcarla a tipos JSON y codificar con json.dumps) con el
+serializador rápido de Apis.utils, sobre N contratos en memoria.
+
+Uso:
+    python -m benchmarks.serializacion [filas] [repeticiones]
+"""
+
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from Apis.utils import serializar_rapido
+from entities.contrato import Contrato
+from models import ContratoResponse
+
+
+def generar_contratos(cantidad: int) -> List[Contrato]:
+    """Contratos transitorios con todas las columnas cargadas"""
+    ahora = datetime.now()
+    return [
+        Contrato(
+            id=uuid.uuid4(),
+            cliente_id=uuid.uuid4(),
+            vehiculo_id=uuid.uuid4(),
+            empleado_id=uuid.uuid4(),
+            fecha_inicio=ahora - timedelta(days=i),
+            fecha_fin=ahora + timedelta(days=i) if i % 2 else None,
+            activo=bool(i % 2),
+            id_usuario_creacion=uuid.uuid4(),
+            id_usuario_edicion=None,
+            fecha_creacion=ahora,
+            fecha_actualizacion=ahora,
+        )
+        for i in range(cantidad)
+    ]
+
+
+async def serializar_estandar(campo, contratos) -> bytes:
+    """Lo que hace FastAPI con response_model=List[ContratoResponse]"""
+    contenido = await serialize_response(field=campo, response_content=contratos)
+    return JSONResponse(contenido).body
+
+
+async def medir(funcion, repeticiones: int) -> float:
+    """Mejor tiempo en milisegundos de varias repeticiones"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        if asyncio.iscoroutine(resultado):
+            await resultado
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tiempos)
+
+
+async def comparar(filas: int, repeticiones: int):
+    contratos = generar_contratos(filas)
+    campo = create_response_field(name="respuesta", type_=List[ContratoResponse])
+
+    estandar = await serializar_estandar(campo, contratos)
+    rapido = serializar_rapido(contratos, ContratoResponse)
+    assert json.loads(estandar) == json.loads(rapido), "Las salidas deben coincidir"
+
+    t_estandar = await medir(
+        lambda: serializar_estandar(campo, contratos), repeticiones
+    )
+    t_rapido = await medir(
+        lambda: serializar_rapido(contratos, ContratoResponse), repeticiones
+    )
+    return t_estandar, t_rapido
+
+
+def main(filas: int = 1000, repeticiones: int = 20) -> None:
+    t_estandar, t_rapido = asyncio.run(comparar(filas, repeticiones))
+    print(f"{filas} ContratoResponse, mejor de {repeticiones}:")
+    print(f"  response_model (antes): {t_estandar:8.2f} ms")
+    print(f"  serializar_rapido:      {t_rapido:8.2f} ms")
+    print(f"  aceleración:            {t_estandar / t_rapido:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -5,3 +5,14 @@ from .contratoCRUD import ContratoCRUD
 from .pagoCRUD import PagoCRUD
 from .usuarioCRUD import UsuarioCRUD
 from .tipoVehiculoCRUD import TipoVehiculoCRUD
+from .contadorCRUD import ContadorCRUD
+from .asyncCRUD import (
+    ClienteCRUDAsync,
+    EmpleadoCRUDAsync,
+    VehiculoCRUDAsync,
+    ContratoCRUDAsync,
+    PagoCRUDAsync,
+    UsuarioCRUDAsync,
+    TipoVehiculoCRUDAsync,
+    ContadorCRUDAsync,
+)
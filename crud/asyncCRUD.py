@@ -0,0 +1,151 @@
+"""
+Operaciones CRUD asíncronas
+"""
+
+import time
+from typing import Optional
+
+from auth.security import hash_password_async, verify_password_async
+from entities.usuario import Usuario
+from monitoreo import contar_consultas, registrar_si_lenta
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .clienteCRUD import ClienteCRUD
+from .contadorCRUD import ContadorCRUD
+from .contratoCRUD import ContratoCRUD
+from .empleadoCRUD import EmpleadoCRUD
+from .pagoCRUD import PagoCRUD
+from .tipoVehiculoCRUD import TipoVehiculoCRUD
+from .usuarioCRUD import UsuarioCRUD
+from .vehiculoCRUD import VehiculoCRUD
+
+
+class AsyncCRUD:
+    """
+    Adaptador asíncrono sobre una clase CRUD síncrona
+
+    Cada método de la clase CRUD se ejecuta con AsyncSession.run_sync, así las
+    validaciones se comparten con la versión síncrona y la E/S con la base de
+    datos pasa por el driver asíncrono sin bloquear el event loop.
+    """
+
+    crud_class = None
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _ejecutar(self, nombre_metodo: str, /, *args, **kwargs):
+        """
+        Ejecutar un método de la clase CRUD síncrona sobre la sesión asíncrona
+
+        Si la llamada supera el umbral de operación lenta se registra su
+        sentencia más lenta y se captura el plan (ver monitoreo.lentas).
+
+        El pool no verifica las conexiones al prestarlas (sin pre-ping). Si la
+        conexión estaba caída la primera sentencia falla sin haberse ejecutado
+        nada; en ese caso se descarta la transacción y se reintenta una vez
+        con otra conexión.
+        """
+        metodo = getattr(self.crud_class, nombre_metodo)
+
+        def ejecutar(session):
+            return metodo(self.crud_class(session), *args, **kwargs)
+
+        inicio = time.perf_counter()
+        try:
+            with contar_consultas() as estadisticas:
+                resultado = await self.db.run_sync(ejecutar)
+        except DBAPIError as e:
+            if not e.connection_invalidated or estadisticas.consultas:
+                raise
+            await self.db.rollback()
+            with contar_consultas() as estadisticas:
+                resultado = await self.db.run_sync(ejecutar)
+        registrar_si_lenta(
+            f"{self.crud_class.__name__}.{nombre_metodo}",
+            (time.perf_counter() - inicio) * 1000,
+            estadisticas,
+            self.db.bind,
+        )
+        return resultado
+
+    def __getattr__(self, nombre: str):
+        getattr(self.crud_class, nombre)
+
+        async def ejecutar(*args, **kwargs):
+            return await self._ejecutar(nombre, *args, **kwargs)
+
+        ejecutar.__name__ = nombre
+        return ejecutar
+
+
+class ClienteCRUDAsync(AsyncCRUD):
+    crud_class = ClienteCRUD
+
+
+class ContadorCRUDAsync(AsyncCRUD):
+    crud_class = ContadorCRUD
+
+
+class ContratoCRUDAsync(AsyncCRUD):
+    crud_class = ContratoCRUD
+
+
+class EmpleadoCRUDAsync(AsyncCRUD):
+    crud_class = EmpleadoCRUD
+
+
+class PagoCRUDAsync(AsyncCRUD):
+    crud_class = PagoCRUD
+
+
+class TipoVehiculoCRUDAsync(AsyncCRUD):
+    crud_class = TipoVehiculoCRUD
+
+
+class UsuarioCRUDAsync(AsyncCRUD):
+    """
+    bcrypt se ejecuta en el pool de procesos de auth.security, nunca en el
+    event loop, para que un pico de logins no congele el resto de endpoints.
+    """
+
+    crud_class = UsuarioCRUD
+
+    async def crear_usuario(self, username: str, password: str, *args, **kwargs):
+        kwargs["password_hash"] = await hash_password_async(password)
+        return await self._ejecutar(
+            "crear_usuario", username, password, *args, **kwargs
+        )
+
+    async def actualizar_usuario(self, usuario_id: str, *args, **kwargs):
+        if "password" in kwargs and kwargs["password"]:
+            kwargs["password_hash"] = await hash_password_async(kwargs.pop("password"))
+        return await self._ejecutar("actualizar_usuario", usuario_id, *args, **kwargs)
+
+    async def autenticar_usuario(
+        self, username: str, password: str
+    ) -> Optional[Usuario]:
+        usuario = await self._ejecutar("obtener_usuario_por_username", username)
+        if not usuario or not usuario.estado:
+            return None
+        if not await verify_password_async(password, usuario.password_hash):
+            return None
+        return usuario
+
+    async def cambiar_contrasena(
+        self, usuario_id: str, password_actual: str, password_nueva: str
+    ) -> bool:
+        usuario = await self._ejecutar("obtener_usuario_por_id", usuario_id)
+        if not usuario:
+            return False
+
+        if not await verify_password_async(password_actual, usuario.password_hash):
+            return False
+
+        password_hash = await hash_password_async(password_nueva)
+        return await self._ejecutar("guardar_password_hash", usuario_id, password_hash)
+
+
+class VehiculoCRUDAsync(AsyncCRUD):
+    crud_class = VehiculoCRUD
@@ -0,0 +1,134 @@
+"""
+Caché en memoria del catálogo de tipos de vehículo
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from entities.contador import Contador
+from entities.tipoVehiculo import TipoVehiculo
+from models import TipoVehiculoResponse
+from monitoreo.metricas import registrar_cache
+from .contadorCRUD import VERSION_TIPOS_VEHICULO
+
+
+class TipoVehiculoEnCache(TipoVehiculoResponse):
+    """Copia de un tipo que conserva fecha_actualizacion para el ETag"""
+
+    fecha_actualizacion: Optional[datetime] = None
+
+
+class CacheTiposVehiculo:
+    """
+    Copia completa y versionada de la tabla tipos_vehiculo
+
+    Cada escritura del catálogo incrementa el contador VERSION_TIPOS_VEHICULO
+    en su misma transacción. Cada worker compara su versión con la de la base
+    como mucho una vez por intervalo de verificación; entre verificaciones las
+    lecturas no consultan la base. En el propio worker las escrituras invalidan
+    la copia de inmediato, y en los demás se detectan en la siguiente
+    verificación.
+    """
+
+    def __init__(self, intervalo_verificacion: float = 5.0):
+        self.intervalo_verificacion = intervalo_verificacion
+        self.hits = 0
+        self.misses = 0
+        self._version: Optional[float] = None
+        self._verificado = 0.0
+        self._tipos: List[TipoVehiculoEnCache] = []
+        self._por_id: Dict[UUID, TipoVehiculoEnCache] = {}
+        self._por_nombre: Dict[str, TipoVehiculoEnCache] = {}
+        self._lock = threading.Lock()
+
+    def _cargar(self, db: Session, forzar: bool = False) -> None:
+        """Verificar la versión en la base y recargar la copia si cambió"""
+        with self._lock:
+            if (
+                not forzar
+                and self._version is not None
+                and time.monotonic() - self._verificado < self.intervalo_verificacion
+            ):
+                self.hits += 1
+                registrar_cache("tipos_vehiculo", True)
+                return
+            self.misses += 1
+        registrar_cache("tipos_vehiculo", False)
+
+        version = (
+            db.scalar(
+                select(func.sum(Contador.valor)).where(
+                    Contador.clave == VERSION_TIPOS_VEHICULO
+                )
+            )
+            or 0
+        )
+        with self._lock:
+            vigente = self._version == version
+        if not vigente:
+            tipos = [
+                TipoVehiculoEnCache.model_validate(tipo)
+                for tipo in db.scalars(
+                    select(TipoVehiculo).order_by(
+                        TipoVehiculo.fecha_creacion, TipoVehiculo.id
+                    )
+                )
+            ]
+        with self._lock:
+            if not vigente:
+                self._tipos = tipos
+                self._por_id = {tipo.id: tipo for tipo in tipos}
+                self._por_nombre = {tipo.nombre: tipo for tipo in tipos}
+                self._version = version
+            self._verificado = time.monotonic()
+
+    def listar(self, db: Session) -> List[TipoVehiculoEnCache]:
+        """Todos los tipos ordenados por (fecha_creacion, id)"""
+        self._cargar(db)
+        return self._tipos
+
+    def por_id(self, db: Session, tipo_id) -> Optional[TipoVehiculoEnCache]:
+        """Tipo por id; ante un fallo se verifica la versión antes de responder"""
+        tipo_id = UUID(str(tipo_id))
+        self._cargar(db)
+        tipo = self._por_id.get(tipo_id)
+        if tipo is None:
+            self._cargar(db, forzar=True)
+            tipo = self._por_id.get(tipo_id)
+        return tipo
+
+    def por_nombre(
+        self, db: Session, nombre: str, forzar: bool = False
+    ) -> Optional[TipoVehiculoEnCache]:
+        """Tipo por nombre normalizado"""
+        self._cargar(db, forzar=forzar)
+        return self._por_nombre.get(nombre)
+
+    def invalidar(self) -> None:
+        """Descartar la copia local (la siguiente lectura recarga)"""
+        with self._lock:
+            self._version = None
+
+    def estadisticas(self) -> dict:
+        """Lecturas servidas sin consultar la base frente a verificaciones"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entradas": len(self._tipos),
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "tasa_aciertos": self.hits / total if total else 0.0,
+            }
+
+
+tipos_vehiculo_cache = CacheTiposVehiculo(
+    intervalo_verificacion=float(os.getenv("TIPOS_VEHICULO_CACHE_VERIFICACION", "5"))
+)
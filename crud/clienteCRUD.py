@@ -7,6 +7,7 @@ from uuid import UUID
 
 from entities.cliente import Cliente
 from sqlalchemy.orm import Session
+from .paginacion import paginar, solo_campos
 from sqlalchemy.exc import IntegrityError
 
 
@@ -52,18 +53,22 @@ class ClienteCRUD:
         try:
             self.db.add(cliente)
             self.db.commit()
-            self.db.refresh(cliente)
         except IntegrityError:
             self.db.rollback()
             raise ValueError("Error al crear cliente: email ya registrado")
 
         return cliente
 
-    def obtener_cliente(self, cliente_id: UUID) -> Optional[Cliente]:
+    def obtener_cliente(
+        self, cliente_id: UUID, campos: Optional[List[str]] = None
+    ) -> Optional[Cliente]:
         """
         Obtener un cliente por ID
+
+        Args:
+            campos: Cargar solo estas columnas (None para todas)
         """
-        return self.db.query(Cliente).filter(Cliente.id == cliente_id).first()
+        return self.db.get(Cliente, cliente_id, options=solo_campos(Cliente, campos))
 
     def obtener_cliente_por_email(self, email: str) -> Optional[Cliente]:
         """
@@ -75,11 +80,23 @@ class ClienteCRUD:
             .first()
         )
 
-    def obtener_clientes(self, skip: int = 0, limit: int = 100) -> List[Cliente]:
+    def obtener_clientes(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Cliente]:
         """
         Obtener lista de clientes con paginación
+
+        Args:
+            skip: Número de registros a omitir
+            limit: Límite de registros a retornar
+            after: Cursor de la página anterior (reemplaza a skip)
+            campos: Cargar solo estas columnas (None para todas)
         """
-        return self.db.query(Cliente).offset(skip).limit(limit).all()
+        return paginar(self.db.query(Cliente), Cliente, skip, limit, after, campos)
 
     def actualizar_cliente(
         self, cliente_id: UUID, id_usuario_edicion: UUID, **kwargs
@@ -114,7 +131,6 @@ class ClienteCRUD:
 
         cliente.id_usuario_edicion = id_usuario_edicion
         self.db.commit()
-        self.db.refresh(cliente)
         return cliente
 
     def eliminar_cliente(self, cliente_id: UUID) -> bool:
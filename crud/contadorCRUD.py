@@ -0,0 +1,278 @@
+"""
+Contadores precalculados del dashboard
+
+Los totales se guardan en la tabla clave-valor ``contadores``, repartidos en
+FRAGMENTOS filas por clave cuyo valor es la suma. Cada sesión acumula en
+``session.info`` las variaciones que producen sus escrituras (altas, bajas y
+cambios de estado detectados en el flush, más los ajustes explícitos de las
+sentencias masivas) y las aplica justo antes del commit, en la misma
+transacción, con un único UPDATE sobre un fragmento elegido al azar. Así dos
+escrituras concurrentes solo esperan una por otra si caen en el mismo
+fragmento, y dentro del UPDATE las filas se bloquean en orden de clave para no
+provocar interbloqueos. Una reconciliación periódica corrige cualquier
+desviación contra las tablas reales.
+"""
+
+import random
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Tuple
+
+from sqlalchemy import case, event, func, insert, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+from entities.cliente import Cliente
+from entities.contador import Contador
+from entities.contrato import Contrato
+from entities.pago import Pago
+from entities.vehiculo import Vehiculo
+
+CLAVE_PENDIENTES = "contadores_pendientes"
+
+# Versiones de los datos cacheados en memoria por cada worker (no se
+# reconcilian, solo se incrementan)
+VERSION_TIPOS_VEHICULO = "version_tipos_vehiculo"
+VERSION_USUARIOS = "version_usuarios"
+VERSIONES = (VERSION_TIPOS_VEHICULO, VERSION_USUARIOS)
+
+# Filas por contador: cada transacción incrementa una al azar
+FRAGMENTOS = 16
+
+# Clave del bloqueo consultivo de PostgreSQL que serializa la reconciliación
+BLOQUEO_RECONCILIACION = 0x636F6E74
+
+# Contador por fila y contadores por atributo de cada entidad
+CONTADORES_POR_ENTIDAD = {
+    Cliente: ("clientes", {}),
+    Vehiculo: ("vehiculos", {"disponible": "vehiculos_disponibles"}),
+    Contrato: ("contratos", {"activo": "contratos_activos"}),
+    Pago: (None, {"monto": "ingresos"}),
+}
+
+
+def registrar_ajuste(session: Session, **deltas: float) -> None:
+    """
+    Acumular variaciones de contadores para aplicarlas en el commit
+
+    Necesario para las sentencias que no pasan por el flush del ORM
+    (INSERT masivos, UPDATE condicionales).
+    """
+    pendientes = session.info.setdefault(CLAVE_PENDIENTES, defaultdict(float))
+    for clave, delta in deltas.items():
+        pendientes[clave] += delta
+
+
+def _valor_previo(objeto, atributo: str) -> float:
+    """Valor del atributo antes de los cambios pendientes del flush"""
+    historial = inspect(objeto).attrs[atributo].history
+    valor = historial.deleted[0] if historial.deleted else getattr(objeto, atributo)
+    return float(valor or 0)
+
+
+@event.listens_for(Session, "after_flush")
+def _acumular_cambios(session: Session, flush_context) -> None:
+    """Traducir las altas, bajas y modificaciones del flush a variaciones"""
+    deltas = defaultdict(float)
+    for signo, objetos in ((1, session.new), (-1, session.deleted)):
+        for objeto in objetos:
+            config = CONTADORES_POR_ENTIDAD.get(type(objeto))
+            if not config:
+                continue
+            clave_filas, atributos = config
+            if clave_filas:
+                deltas[clave_filas] += signo
+            for atributo, clave in atributos.items():
+                valor = (
+                    getattr(objeto, atributo)
+                    if signo > 0
+                    else _valor_previo(objeto, atributo)
+                )
+                deltas[clave] += signo * float(valor or 0)
+
+    for objeto in session.dirty:
+        config = CONTADORES_POR_ENTIDAD.get(type(objeto))
+        if not config:
+            continue
+        for atributo, clave in config[1].items():
+            deltas[clave] += float(getattr(objeto, atributo) or 0) - _valor_previo(
+                objeto, atributo
+            )
+
+    registrar_ajuste(session, **{k: v for k, v in deltas.items() if v})
+
+
+@event.listens_for(Session, "before_commit")
+def _aplicar_pendientes(session: Session) -> None:
+    """Escribir las variaciones acumuladas dentro de la transacción actual"""
+    session.flush()
+    pendientes = session.info.pop(CLAVE_PENDIENTES, None)
+    deltas = {clave: delta for clave, delta in (pendientes or {}).items() if delta}
+    if not deltas:
+        return
+    tabla = Contador.__table__
+    fragmento = random.randrange(FRAGMENTOS)
+    # El SELECT ... ORDER BY ... FOR UPDATE toma los bloqueos en orden de
+    # clave antes de actualizar (SQLite omite el FOR UPDATE)
+    bloqueadas = (
+        select(tabla.c.clave)
+        .where(tabla.c.fragmento == fragmento, tabla.c.clave.in_(deltas))
+        .order_by(tabla.c.clave)
+        .with_for_update()
+        .cte("bloqueadas")
+    )
+    session.connection().execute(
+        update(tabla)
+        .where(tabla.c.fragmento == fragmento, tabla.c.clave == bloqueadas.c.clave)
+        .values(valor=tabla.c.valor + case(deltas, value=tabla.c.clave))
+    )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_pendientes(session: Session, previous_transaction) -> None:
+    """Las variaciones de una transacción revertida no se aplican"""
+    session.info.pop(CLAVE_PENDIENTES, None)
+
+
+class ContadorCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def obtener_contadores(self) -> Dict[str, float]:
+        """
+        Obtener todos los contadores (una lectura de unas pocas filas)
+        """
+        return dict(
+            self.db.execute(
+                select(Contador.clave, func.sum(Contador.valor)).group_by(
+                    Contador.clave
+                )
+            ).all()
+        )
+
+    def obtener_valor(self, clave: str) -> float:
+        """
+        Obtener un contador (0 si todavía no existe)
+        """
+        return (
+            self.db.scalar(
+                select(func.sum(Contador.valor)).where(Contador.clave == clave)
+            )
+            or 0
+        )
+
+    def reconciliar(self) -> Dict[str, float]:
+        """
+        Recalcular los contadores a partir de las tablas reales
+
+        Los conteos y los valores actuales se leen sin bloqueos en una misma
+        instantánea (REPEATABLE READ en PostgreSQL), así que las escrituras
+        siguen mientras duran los recorridos. Después, en una transacción
+        corta, el fragmento 0 de cada contador se corrige con
+        ``valor + (real - observado)``, donde observado es la suma de los
+        fragmentos: las variaciones confirmadas entre la lectura y la
+        corrección se conservan. Los fragmentos que falten se crean.
+        En PostgreSQL un bloqueo consultivo garantiza que solo un worker
+        reconcilia a la vez; los demás omiten la pasada.
+
+        Returns:
+            Valores reconciliados (vacío si otro worker ya estaba reconciliando)
+        """
+        with self.db.get_bind().connect() as conexion:
+            postgresql = conexion.dialect.name == "postgresql"
+            if postgresql:
+                if not conexion.scalar(
+                    text("SELECT pg_try_advisory_lock(:clave)"),
+                    {"clave": BLOQUEO_RECONCILIACION},
+                ):
+                    conexion.rollback()
+                    return {}
+                conexion.commit()
+            try:
+                if postgresql:
+                    conexion.execution_options(isolation_level="REPEATABLE READ")
+                reales, observados = self._leer_desviacion(conexion)
+                if postgresql:
+                    conexion.commit()
+                    conexion.execution_options(
+                        isolation_level=conexion.default_isolation_level
+                    )
+                self._corregir(conexion, reales, observados)
+                conexion.commit()
+            finally:
+                if postgresql:
+                    conexion.rollback()
+                    conexion.execute(
+                        text("SELECT pg_advisory_unlock(:clave)"),
+                        {"clave": BLOQUEO_RECONCILIACION},
+                    )
+                    conexion.commit()
+        return reales
+
+    @staticmethod
+    def _leer_desviacion(
+        conexion,
+    ) -> Tuple[Dict[str, float], Dict[Tuple[str, int], float]]:
+        """
+        Conteos reales y fragmentos de los contadores en la misma instantánea
+
+        Returns:
+            Conteos por clave y valor de cada (clave, fragmento) existente
+        """
+        consultas = {
+            "clientes": select(func.count()).select_from(Cliente),
+            "vehiculos": select(func.count()).select_from(Vehiculo),
+            "vehiculos_disponibles": select(func.count())
+            .select_from(Vehiculo)
+            .where(Vehiculo.disponible.is_(True)),
+            "contratos": select(func.count()).select_from(Contrato),
+            "contratos_activos": select(func.count())
+            .select_from(Contrato)
+            .where(Contrato.activo.is_(True)),
+            "ingresos": select(func.coalesce(func.sum(Pago.monto), 0)),
+        }
+        reales = {clave: float(conexion.scalar(c)) for clave, c in consultas.items()}
+        observados = {
+            (clave, fragmento): float(valor)
+            for clave, fragmento, valor in conexion.execute(
+                select(Contador.clave, Contador.fragmento, Contador.valor)
+            )
+        }
+        return reales, observados
+
+    @staticmethod
+    def _corregir(
+        conexion,
+        reales: Dict[str, float],
+        observados: Dict[Tuple[str, int], float],
+    ) -> None:
+        """Aplicar las diferencias en orden de clave, como las escrituras"""
+        tabla = Contador.__table__
+        ahora = datetime.now()
+        sumas = defaultdict(float)
+        for (clave, _), valor in observados.items():
+            sumas[clave] += valor
+        faltantes = []
+        for clave in sorted(set(reales) | set(VERSIONES)):
+            # Las versiones no se reconcilian, solo se completan sus fragmentos
+            diferencia = reales[clave] - sumas[clave] if clave in reales else 0
+            for fragmento in range(FRAGMENTOS):
+                if (clave, fragmento) not in observados:
+                    faltantes.append(
+                        {
+                            "clave": clave,
+                            "fragmento": fragmento,
+                            "valor": diferencia if fragmento == 0 else 0,
+                            "fecha_actualizacion": ahora,
+                        }
+                    )
+                elif fragmento == 0 and diferencia:
+                    conexion.execute(
+                        update(tabla)
+                        .where(tabla.c.clave == clave, tabla.c.fragmento == 0)
+                        .values(
+                            valor=tabla.c.valor + diferencia,
+                            fecha_actualizacion=ahora,
+                        )
+                    )
+        if faltantes:
+            conexion.execute(insert(tabla), faltantes)
@@ -8,7 +8,32 @@ from datetime import datetime
 
 from entities.contrato import Contrato
 from entities.vehiculo import Vehiculo
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from .contadorCRUD import registrar_ajuste
+from .paginacion import paginar, solo_campos
+
+# Relaciones que se pueden incluir en la respuesta de un contrato
+RELACIONES_EXPANDIBLES = ("cliente", "vehiculo", "empleado", "pagos")
+
+
+def opciones_expansion(expandir: Optional[List[str]]) -> List:
+    """
+    Opciones de carga para incluir relaciones sin consultas N+1
+
+    Las relaciones a uno se traen en la misma consulta con joinedload y los
+    pagos con una única consulta IN adicional (selectinload), así que el
+    número de consultas no depende del número de contratos.
+    """
+    return [
+        (
+            selectinload(Contrato.pagos)
+            if relacion == "pagos"
+            else joinedload(getattr(Contrato, relacion))
+        )
+        for relacion in expandir or []
+    ]
 
 
 class ContratoCRUD:
@@ -44,11 +69,7 @@ class ContratoCRUD:
         if fecha_fin and fecha_fin < fecha_inicio:
             raise ValueError("La fecha de fin no puede ser anterior a la de inicio")
 
-        vehiculo = self.db.query(Vehiculo).filter(Vehiculo.id == vehiculo_id).first()
-        if not vehiculo:
-            raise ValueError("El vehículo no existe")
-        if not vehiculo.disponible:
-            raise ValueError("El vehículo no está disponible para contrato")
+        self._reservar_vehiculo(vehiculo_id, id_usuario_creacion)
 
         contrato = Contrato(
             cliente_id=cliente_id,
@@ -60,22 +81,73 @@ class ContratoCRUD:
             activo=True,
         )
 
-        vehiculo.disponible = False
-        vehiculo.id_usuario_edicion = id_usuario_creacion
-
-        self.db.add(contrato)
-        self.db.commit()
-        self.db.refresh(contrato)
+        try:
+            self.db.add(contrato)
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise ValueError("Error al crear contrato: cliente o empleado no existe")
         return contrato
 
-    def obtener_contrato(self, contrato_id: UUID) -> Optional[Contrato]:
+    def _reservar_vehiculo(self, vehiculo_id: UUID, id_usuario_edicion: UUID) -> None:
+        """
+        Marcar el vehículo como no disponible con un único UPDATE condicional
+
+        El UPDATE ... WHERE disponible ... RETURNING reserva el vehículo de forma
+        atómica: si dos peticiones compiten por el mismo vehículo solo una
+        obtiene la fila, sin un SELECT previo. La reserva queda en la misma
+        transacción que el INSERT del contrato.
+
+        Raises:
+            ValueError: Si el vehículo no existe o no está disponible
+        """
+        reservado = self.db.execute(
+            update(Vehiculo)
+            .where(Vehiculo.id == vehiculo_id, Vehiculo.disponible == True)
+            .values(disponible=False, id_usuario_edicion=id_usuario_edicion)
+            .returning(Vehiculo.id)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+
+        if reservado is None:
+            self.db.rollback()
+            existe = (
+                self.db.query(Vehiculo.id).filter(Vehiculo.id == vehiculo_id).first()
+            )
+            if not existe:
+                raise ValueError("El vehículo no existe")
+            raise ValueError("El vehículo no está disponible para contrato")
+
+        # El UPDATE no pasa por el flush del ORM
+        registrar_ajuste(self.db, vehiculos_disponibles=-1)
+
+    def obtener_contrato(
+        self,
+        contrato_id: UUID,
+        campos: Optional[List[str]] = None,
+        expandir: Optional[List[str]] = None,
+    ) -> Optional[Contrato]:
         """
         Obtener un contrato por ID
+
+        Args:
+            campos: Cargar solo estas columnas (None para todas)
+            expandir: Relaciones a cargar (ver RELACIONES_EXPANDIBLES)
         """
-        return self.db.query(Contrato).filter(Contrato.id == contrato_id).first()
+        return self.db.get(
+            Contrato,
+            contrato_id,
+            options=solo_campos(Contrato, campos) + opciones_expansion(expandir),
+        )
 
     def obtener_contratos(
-        self, skip: int = 0, limit: int = 100, solo_activos: bool = False
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        solo_activos: bool = False,
+        after: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+        expandir: Optional[List[str]] = None,
     ) -> List[Contrato]:
         """
         Obtener lista de contratos con paginación
@@ -84,11 +156,39 @@ class ContratoCRUD:
             skip: Número de registros a omitir
             limit: Límite de registros a retornar
             solo_activos: Si True, solo devuelve contratos activos
+            after: Cursor de la página anterior (reemplaza a skip)
+            campos: Cargar solo estas columnas (None para todas)
+            expandir: Relaciones a cargar (ver RELACIONES_EXPANDIBLES)
         """
-        query = self.db.query(Contrato)
+        query = self.db.query(Contrato).options(*opciones_expansion(expandir))
         if solo_activos:
             query = query.filter(Contrato.activo == True)
-        return query.offset(skip).limit(limit).all()
+        return paginar(query, Contrato, skip, limit, after, campos)
+
+    @staticmethod
+    def consulta_exportacion(
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        activo: Optional[bool] = None,
+    ):
+        """
+        Consulta de columnas para exportar contratos sin cargar objetos ORM
+
+        Args:
+            desde: Contratos con fecha de inicio desde esta fecha
+            hasta: Contratos con fecha de inicio anterior a esta fecha
+            activo: Filtrar por estado del contrato
+        """
+        consulta = select(*Contrato.__table__.columns).order_by(
+            Contrato.fecha_creacion, Contrato.id
+        )
+        if desde:
+            consulta = consulta.where(Contrato.fecha_inicio >= desde)
+        if hasta:
+            consulta = consulta.where(Contrato.fecha_inicio < hasta)
+        if activo is not None:
+            consulta = consulta.where(Contrato.activo == activo)
+        return consulta
 
     def actualizar_contrato(
         self, contrato_id: UUID, id_usuario_edicion: UUID, **kwargs
@@ -130,7 +230,6 @@ class ContratoCRUD:
 
         contrato.id_usuario_edicion = id_usuario_edicion
         self.db.commit()
-        self.db.refresh(contrato)
         return contrato
 
     def eliminar_contrato(self, contrato_id: UUID) -> bool:
@@ -7,6 +7,7 @@ from uuid import UUID
 
 from entities.empleado import Empleado
 from sqlalchemy.orm import Session
+from .paginacion import paginar, solo_campos
 from sqlalchemy.exc import IntegrityError
 
 
@@ -54,18 +55,22 @@ class EmpleadoCRUD:
         try:
             self.db.add(empleado)
             self.db.commit()
-            self.db.refresh(empleado)
         except IntegrityError:
             self.db.rollback()
             raise ValueError("Error al crear empleado: email ya registrado")
 
         return empleado
 
-    def obtener_empleado(self, empleado_id: UUID) -> Optional[Empleado]:
+    def obtener_empleado(
+        self, empleado_id: UUID, campos: Optional[List[str]] = None
+    ) -> Optional[Empleado]:
         """
         Obtener un empleado por ID
+
+        Args:
+            campos: Cargar solo estas columnas (None para todas)
         """
-        return self.db.query(Empleado).filter(Empleado.id == empleado_id).first()
+        return self.db.get(Empleado, empleado_id, options=solo_campos(Empleado, campos))
 
     def obtener_empleado_por_email(self, email: str) -> Optional[Empleado]:
         """
@@ -78,7 +83,12 @@ class EmpleadoCRUD:
         )
 
     def obtener_empleados(
-        self, skip: int = 0, limit: int = 100, solo_activos: bool = False
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        solo_activos: bool = False,
+        after: Optional[str] = None,
+        campos: Optional[List[str]] = None,
     ) -> List[Empleado]:
         """
         Obtener lista de empleados con paginación
@@ -87,11 +97,13 @@ class EmpleadoCRUD:
             skip: Número de registros a omitir
             limit: Límite de registros a retornar
             solo_activos: Si True, solo devuelve empleados activos
+            after: Cursor de la página anterior (reemplaza a skip)
+            campos: Cargar solo estas columnas (None para todas)
         """
         query = self.db.query(Empleado)
         if solo_activos:
             query = query.filter(Empleado.activo == True)
-        return query.offset(skip).limit(limit).all()
+        return paginar(query, Empleado, skip, limit, after, campos)
 
     def actualizar_empleado(
         self, empleado_id: UUID, id_usuario_edicion: UUID, **kwargs
@@ -129,7 +141,6 @@ class EmpleadoCRUD:
 
         empleado.id_usuario_edicion = id_usuario_edicion
         self.db.commit()
-        self.db.refresh(empleado)
         return empleado
 
     def eliminar_empleado(self, empleado_id: UUID) -> bool:
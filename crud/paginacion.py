@@ -0,0 +1,99 @@
+"""
+Paginación por cursor (keyset) y proyección de columnas para los listados
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import load_only
+
+
+def codificar_cursor(entidad) -> str:
+    """
+    Generar el cursor opaco que apunta a una fila
+
+    El cursor es la clave de orden (fecha_creacion, id) codificada en base64.
+    """
+    datos = [entidad.fecha_creacion.isoformat(), str(entidad.id)]
+    return base64.urlsafe_b64encode(json.dumps(datos).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Obtener la clave de orden (fecha_creacion, id) de un cursor
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        fecha, entidad_id = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return datetime.fromisoformat(fecha), UUID(entidad_id)
+    except Exception:
+        raise ValueError("Cursor de paginación inválido")
+
+
+def solo_campos(modelo, campos: Optional[List[str]]) -> List:
+    """
+    Opciones de carga para traer de la base solo las columnas pedidas
+
+    Siempre se cargan id, fecha_creacion y fecha_actualizacion, que necesitan
+    el cursor y el ETag. Los campos de respuesta que no son columnas se
+    ignoran.
+
+    Args:
+        modelo: Entidad a consultar
+        campos: Nombres de campos pedidos o None para cargar todo
+    """
+    if not campos:
+        return []
+    columnas = modelo.__table__.columns
+    nombres = dict.fromkeys(["id", "fecha_creacion", "fecha_actualizacion", *campos])
+    return [load_only(*(getattr(modelo, n) for n in nombres if n in columnas))]
+
+
+def paginar(
+    query,
+    modelo,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    campos: Optional[List[str]] = None,
+) -> List:
+    """
+    Aplicar orden estable y paginación a una consulta
+
+    Ordena por (fecha_creacion, id). Si se recibe un cursor se continúa desde
+    esa fila con una comparación de tuplas que usa el índice, sin importar la
+    profundidad de la página; si no, se mantiene el offset clásico con skip.
+
+    Args:
+        query: Consulta a paginar
+        modelo: Entidad con columnas fecha_creacion e id
+        skip: Número de registros a omitir (solo sin cursor)
+        limit: Límite de registros a retornar
+        after: Cursor de la última fila de la página anterior
+        campos: Columnas a cargar (ver solo_campos)
+    """
+    query = query.options(*solo_campos(modelo, campos)).order_by(
+        modelo.fecha_creacion, modelo.id
+    )
+    if after:
+        fecha, entidad_id = decodificar_cursor(after)
+        query = query.filter(
+            tuple_(modelo.fecha_creacion, modelo.id) > tuple_(fecha, entidad_id)
+        )
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+def cursor_siguiente(items: List, limit: int) -> Optional[str]:
+    """Cursor para pedir la página siguiente, o None si es la última"""
+    if items and len(items) >= limit:
+        return codificar_cursor(items[-1])
+    return None
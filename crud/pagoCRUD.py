@@ -2,12 +2,21 @@
 Operaciones CRUD para Pago
 """
 
-from typing import List, Optional
+import math
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import datetime
 
+from entities.contrato import Contrato
 from entities.pago import Pago
+from entities.usuario import Usuario
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
+from .contadorCRUD import registrar_ajuste
+from .paginacion import paginar, solo_campos
+
+# Filas por sentencia en la carga masiva (limita los parámetros por consulta)
+TAMANO_LOTE = 5000
 
 
 class PagoCRUD:
@@ -46,17 +55,127 @@ class PagoCRUD:
         )
         self.db.add(pago)
         self.db.commit()
-        self.db.refresh(pago)
         return pago
 
-    def obtener_pago(self, pago_id: UUID) -> Optional[Pago]:
+    def crear_pagos_masivo(self, filas: List[Dict], id_usuario_creacion: UUID) -> Dict:
+        """
+        Crear muchos pagos en una sola transacción
+
+        Primero se validan el monto y los tipos de todas las filas; después se
+        comprueba la existencia de todos los contratos referenciados con una
+        consulta IN por lote y las filas válidas se insertan por lotes con
+        INSERT de varias filas. Las filas con errores se omiten y se informan.
+
+        El monto debe ser un número finito (no booleano). Las fechas con zona
+        horaria se pasan a la hora local sin zona, como las de datetime.now()
+        que guarda el resto de la aplicación.
+
+        Args:
+            filas: Diccionarios con contrato_id, monto y fecha_pago opcional
+            id_usuario_creacion: Usuario que realiza la carga
+
+        Returns:
+            Diccionario con el número de insertados y la lista de errores por fila
+
+        Raises:
+            ValueError: Si el usuario de creación no existe
+        """
+        if self.db.get(Usuario, id_usuario_creacion) is None:
+            raise ValueError("El usuario de creación no existe")
+
+        errores = []
+        candidatos = []
+        ahora = datetime.now()
+
+        for numero, fila in enumerate(filas, start=1):
+            try:
+                try:
+                    contrato_id = UUID(str(fila.get("contrato_id")))
+                except ValueError:
+                    raise ValueError("El contrato no es un UUID válido")
+                monto = fila.get("monto")
+                try:
+                    if isinstance(monto, bool):
+                        raise TypeError
+                    monto = float(monto)
+                except (TypeError, ValueError):
+                    raise ValueError("El monto del pago no es un número válido")
+                if not math.isfinite(monto):
+                    raise ValueError("El monto del pago debe ser un número finito")
+                if not monto > 0:
+                    raise ValueError("El monto del pago debe ser mayor que 0")
+                fecha_pago = fila.get("fecha_pago")
+                if fecha_pago and not isinstance(fecha_pago, datetime):
+                    try:
+                        fecha_pago = datetime.fromisoformat(str(fecha_pago))
+                    except ValueError:
+                        raise ValueError("La fecha de pago no es válida")
+                if fecha_pago and fecha_pago.tzinfo is not None:
+                    fecha_pago = fecha_pago.astimezone().replace(tzinfo=None)
+            except ValueError as e:
+                errores.append({"fila": numero, "error": str(e)})
+                continue
+
+            candidatos.append(
+                (
+                    numero,
+                    {
+                        "contrato_id": contrato_id,
+                        "monto": monto,
+                        "fecha_pago": fecha_pago or ahora,
+                        "id_usuario_creacion": id_usuario_creacion,
+                    },
+                )
+            )
+
+        contratos = list({datos["contrato_id"] for _, datos in candidatos})
+        contratos_existentes = set()
+        for inicio in range(0, len(contratos), TAMANO_LOTE):
+            contratos_existentes.update(
+                self.db.scalars(
+                    select(Contrato.id).where(
+                        Contrato.id.in_(contratos[inicio : inicio + TAMANO_LOTE])
+                    )
+                )
+            )
+
+        validos = []
+        for numero, datos in candidatos:
+            if datos["contrato_id"] in contratos_existentes:
+                validos.append(datos)
+            else:
+                errores.append({"fila": numero, "error": "El contrato no existe"})
+
+        try:
+            for inicio in range(0, len(validos), TAMANO_LOTE):
+                self.db.execute(insert(Pago), validos[inicio : inicio + TAMANO_LOTE])
+            registrar_ajuste(self.db, ingresos=sum(datos["monto"] for datos in validos))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        errores.sort(key=lambda error: error["fila"])
+        return {"insertados": len(validos), "errores": errores}
+
+    def obtener_pago(
+        self, pago_id: UUID, campos: Optional[List[str]] = None
+    ) -> Optional[Pago]:
         """
         Obtener un pago por ID
+
+        Args:
+            campos: Cargar solo estas columnas (None para todas)
         """
-        return self.db.query(Pago).filter(Pago.id == pago_id).first()
+        return self.db.get(Pago, pago_id, options=solo_campos(Pago, campos))
 
     def obtener_pagos(
-        self, skip: int = 0, limit: int = 100, contrato_id: Optional[UUID] = None
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        contrato_id: Optional[UUID] = None,
+        after: Optional[str] = None,
+        campos: Optional[List[str]] = None,
     ) -> List[Pago]:
         """
         Obtener lista de pagos con paginación
@@ -65,11 +184,40 @@ class PagoCRUD:
             skip: Número de registros a omitir
             limit: Límite de registros a retornar
             contrato_id: Filtrar pagos por contrato
+            after: Cursor de la página anterior (reemplaza a skip)
+            campos: Cargar solo estas columnas (None para todas)
         """
         query = self.db.query(Pago)
         if contrato_id:
             query = query.filter(Pago.contrato_id == contrato_id)
-        return query.offset(skip).limit(limit).all()
+        return paginar(query, Pago, skip, limit, after, campos)
+
+    @staticmethod
+    def consulta_exportacion(
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        activo: Optional[bool] = None,
+    ):
+        """
+        Consulta de columnas para exportar pagos sin cargar objetos ORM
+
+        Args:
+            desde: Pagos realizados desde esta fecha
+            hasta: Pagos realizados antes de esta fecha
+            activo: Filtrar por estado del contrato asociado
+        """
+        consulta = select(*Pago.__table__.columns).order_by(
+            Pago.fecha_creacion, Pago.id
+        )
+        if desde:
+            consulta = consulta.where(Pago.fecha_pago >= desde)
+        if hasta:
+            consulta = consulta.where(Pago.fecha_pago < hasta)
+        if activo is not None:
+            consulta = consulta.join(Contrato, Pago.contrato_id == Contrato.id).where(
+                Contrato.activo == activo
+            )
+        return consulta
 
     def actualizar_pago(
         self, pago_id: UUID, id_usuario_edicion: UUID, **kwargs
@@ -98,7 +246,6 @@ class PagoCRUD:
 
         pago.id_usuario_edicion = id_usuario_edicion
         self.db.commit()
-        self.db.refresh(pago)
         return pago
 
     def eliminar_pago(self, pago_id: UUID) -> bool:
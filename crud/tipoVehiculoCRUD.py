@@ -5,7 +5,11 @@ Operaciones CRUD para TipoVehiculo
 from typing import List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
+from .catalogoCache import tipos_vehiculo_cache
+from .contadorCRUD import VERSION_TIPOS_VEHICULO, registrar_ajuste
+from .paginacion import decodificar_cursor
 from entities.tipoVehiculo import TipoVehiculo
+from models import TipoVehiculoResponse
 
 
 class TipoVehiculoCRUD:
@@ -39,7 +43,9 @@ class TipoVehiculoCRUD:
         if len(nombre) > 100:
             raise ValueError("El nombre no puede exceder 100 caracteres")
 
-        if self.obtener_tipo_vehiculo_por_nombre(nombre):
+        if tipos_vehiculo_cache.por_nombre(
+            self.db, nombre.strip().title(), forzar=True
+        ):
             raise ValueError("Ya existe un tipo de vehículo con ese nombre")
 
         tipo = TipoVehiculo(
@@ -50,33 +56,45 @@ class TipoVehiculoCRUD:
         )
 
         self.db.add(tipo)
-        self.db.commit()
-        self.db.refresh(tipo)
+        self._guardar_cambios()
         return tipo
 
-    def obtener_tipo_vehiculo(self, tipo_id: UUID) -> Optional[TipoVehiculo]:
+    def _guardar_cambios(self) -> None:
+        """Confirmar una escritura del catálogo y avisar a la caché"""
+        registrar_ajuste(self.db, **{VERSION_TIPOS_VEHICULO: 1})
+        self.db.commit()
+        tipos_vehiculo_cache.invalidar()
+
+    def obtener_tipo_vehiculo(self, tipo_id: UUID) -> Optional[TipoVehiculoResponse]:
         """
-        Obtener un tipo de vehículo por ID
+        Obtener un tipo de vehículo por ID (desde la caché del catálogo)
         """
-        return self.db.query(TipoVehiculo).filter(TipoVehiculo.id == tipo_id).first()
+        return tipos_vehiculo_cache.por_id(self.db, tipo_id)
 
-    def obtener_tipo_vehiculo_por_nombre(self, nombre: str) -> Optional[TipoVehiculo]:
+    def obtener_tipo_vehiculo_por_nombre(
+        self, nombre: str
+    ) -> Optional[TipoVehiculoResponse]:
         """
-        Obtener un tipo de vehículo por nombre
+        Obtener un tipo de vehículo por nombre (desde la caché del catálogo)
         """
-        return (
-            self.db.query(TipoVehiculo)
-            .filter(TipoVehiculo.nombre == nombre.strip().title())
-            .first()
-        )
+        return tipos_vehiculo_cache.por_nombre(self.db, nombre.strip().title())
 
     def obtener_tipos_vehiculo(
-        self, skip: int = 0, limit: int = 100
-    ) -> List[TipoVehiculo]:
+        self, skip: int = 0, limit: int = 100, after: Optional[str] = None
+    ) -> List[TipoVehiculoResponse]:
         """
         Obtener lista de tipos de vehículo con paginación
+
+        Se pagina en memoria sobre la caché, con el mismo orden
+        (fecha_creacion, id) y los mismos cursores que el resto de listados.
         """
-        return self.db.query(TipoVehiculo).offset(skip).limit(limit).all()
+        tipos = tipos_vehiculo_cache.listar(self.db)
+        if after:
+            clave = decodificar_cursor(after)
+            tipos = [tipo for tipo in tipos if (tipo.fecha_creacion, tipo.id) > clave]
+        else:
+            tipos = tipos[skip:]
+        return tipos[:limit]
 
     def actualizar_tipo_vehiculo(
         self, tipo_id: UUID, id_usuario_edicion: UUID, **kwargs
@@ -84,7 +102,7 @@ class TipoVehiculoCRUD:
         """
         Actualizar un tipo de vehículo con validaciones
         """
-        tipo = self.obtener_tipo_vehiculo(tipo_id)
+        tipo = self.db.get(TipoVehiculo, tipo_id)
         if not tipo:
             return None
 
@@ -94,10 +112,10 @@ class TipoVehiculoCRUD:
                 raise ValueError("El nombre del tipo de vehículo es obligatorio")
             if len(nombre) > 100:
                 raise ValueError("El nombre no puede exceder 100 caracteres")
-            if (
-                self.obtener_tipo_vehiculo_por_nombre(nombre)
-                and self.obtener_tipo_vehiculo_por_nombre(nombre).id != tipo_id
-            ):
+            existente = tipos_vehiculo_cache.por_nombre(
+                self.db, nombre.strip().title(), forzar=True
+            )
+            if existente and existente.id != tipo_id:
                 raise ValueError("Ya existe un tipo de vehículo con ese nombre")
             kwargs["nombre"] = nombre.strip().title()
 
@@ -108,18 +126,17 @@ class TipoVehiculoCRUD:
             if hasattr(tipo, key):
                 setattr(tipo, key, value)
 
-        TipoVehiculo.id_usuario_edicion = id_usuario_edicion
-        self.db.commit()
-        self.db.refresh(tipo)
+        tipo.id_usuario_edicion = id_usuario_edicion
+        self._guardar_cambios()
         return tipo
 
     def eliminar_tipo_vehiculo(self, tipo_id: UUID) -> bool:
         """
         Eliminar un tipo de vehículo
         """
-        tipo = self.obtener_tipo_vehiculo(tipo_id)
+        tipo = self.db.get(TipoVehiculo, tipo_id)
         if tipo:
             self.db.delete(tipo)
-            self.db.commit()
+            self._guardar_cambios()
             return True
         return False
@@ -2,10 +2,14 @@
 Operaciones CRUD para Usuario
 """
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from uuid import UUID
+from auth.cache import usuarios_cache
 from entities.usuario import Usuario, RolEnum
-from typing import Optional
+from typing import List, Optional
+from .contadorCRUD import VERSION_USUARIOS, registrar_ajuste
+from .paginacion import paginar, solo_campos
 
 
 class UsuarioCRUD:
@@ -14,6 +18,10 @@ class UsuarioCRUD:
     def __init__(self, db: Session):
         self.db = db
 
+    def _registrar_cambio(self) -> None:
+        """Incrementar VERSION_USUARIOS en la transacción en curso (ver auth.cache)"""
+        registrar_ajuste(self.db, **{VERSION_USUARIOS: 1})
+
     def crear_usuario(
         self,
         username: str,
@@ -21,6 +29,7 @@ class UsuarioCRUD:
         id_usuario_creacion: UUID,
         rol: RolEnum = RolEnum.admin,
         estado: bool = True,
+        password_hash: Optional[str] = None,
     ) -> Usuario:
         """
         Crear un nuevo usuario con validaciones
@@ -31,6 +40,7 @@ class UsuarioCRUD:
             id_usuario_creacion: UUID del usuario que crea el registro (obligatorio)
             rol: Rol asignado al usuario (default RolEnum.admin)
             estado: Estado de activacion del usuario (default True)
+            password_hash: Hash ya calculado; si se indica no se vuelve a encriptar
 
         Returns:
             Usuario creado con la contraseña encriptada
@@ -44,20 +54,67 @@ class UsuarioCRUD:
             rol=rol,
             estado=estado,
         )
-        usuario.set_password(password)
+        if password_hash:
+            usuario.password_hash = password_hash
+        else:
+            usuario.set_password(password)
         self.db.add(usuario)
         self.db.commit()
-        self.db.refresh(usuario)
         return usuario
 
-    def obtener_usuario_por_id(self, usuario_id: str) -> Optional[Usuario]:
-        return self.db.query(Usuario).filter(Usuario.id == usuario_id).first()
+    def obtener_usuario_por_id(
+        self, usuario_id: str, campos: Optional[List[str]] = None
+    ) -> Optional[Usuario]:
+        return self.db.get(Usuario, usuario_id, options=solo_campos(Usuario, campos))
 
     def obtener_usuario_por_username(self, username: str) -> Optional[Usuario]:
         return self.db.query(Usuario).filter(Usuario.username == username).first()
 
-    def obtener_usuarios(self) -> list[Usuario]:
-        return self.db.query(Usuario).all()
+    def obtener_usuarios(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        prefijo: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Usuario]:
+        """
+        Obtener lista de usuarios con paginación
+
+        Args:
+            skip: Número de registros a omitir
+            limit: Límite de registros a retornar
+            after: Cursor de la página anterior (reemplaza a skip)
+            prefijo: Filtrar por inicio del nombre de usuario
+            campos: Cargar solo estas columnas (None para todas)
+        """
+        query = self.db.query(Usuario)
+        if prefijo:
+            query = query.filter(Usuario.username.startswith(prefijo, autoescape=True))
+        return paginar(query, Usuario, skip, limit, after, campos)
+
+    @staticmethod
+    def consulta_exportacion(prefijo: Optional[str] = None):
+        """
+        Consulta de columnas para exportar usuarios sin cargar objetos ORM
+
+        No incluye el hash de la contraseña.
+        """
+        consulta = select(
+            Usuario.id,
+            Usuario.username,
+            Usuario.rol,
+            Usuario.estado,
+            Usuario.id_usuario_creacion,
+            Usuario.id_usuario_edicion,
+            Usuario.fecha_creacion,
+            Usuario.fecha_actualizacion,
+        ).order_by(Usuario.fecha_creacion, Usuario.id)
+        if prefijo:
+            consulta = consulta.where(
+                Usuario.username.startswith(prefijo, autoescape=True)
+            )
+        return consulta
 
     def actualizar_usuario(
         self, usuario_id: str, id_usuario_edicion: UUID, **kwargs
@@ -75,8 +132,9 @@ class UsuarioCRUD:
                 setattr(usuario, key, value)
 
         usuario.id_usuario_edicion = id_usuario_edicion
+        self._registrar_cambio()
         self.db.commit()
-        self.db.refresh(usuario)
+        usuarios_cache.invalidar(usuario_id)
         return usuario
 
     def eliminar_usuario(self, usuario_id: str) -> bool:
@@ -85,7 +143,9 @@ class UsuarioCRUD:
         if not usuario:
             return False
         self.db.delete(usuario)
+        self._registrar_cambio()
         self.db.commit()
+        usuarios_cache.invalidar(usuario_id)
         return True
 
     def autenticar_usuario(self, username: str, password: str) -> Optional[Usuario]:
@@ -111,5 +171,19 @@ class UsuarioCRUD:
             return False
 
         usuario.set_password(password_nueva)
+        self._registrar_cambio()
+        self.db.commit()
+        usuarios_cache.invalidar(usuario_id)
+        return True
+
+    def guardar_password_hash(self, usuario_id: str, password_hash: str) -> bool:
+        """Guardar un hash de contraseña ya calculado"""
+        usuario = self.obtener_usuario_por_id(usuario_id)
+        if not usuario:
+            return False
+
+        usuario.password_hash = password_hash
+        self._registrar_cambio()
         self.db.commit()
+        usuarios_cache.invalidar(usuario_id)
         return True
@@ -2,12 +2,23 @@
 Operaciones CRUD para Vehiculo
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
+from .catalogoCache import tipos_vehiculo_cache
+from .contadorCRUD import registrar_ajuste
+from .paginacion import paginar, solo_campos
+from entities.contrato import Contrato
+from entities.tipoVehiculo import TipoVehiculo
 from entities.vehiculo import Vehiculo
 
+# Filas por sentencia en la carga masiva (limita los parámetros por consulta)
+TAMANO_LOTE = 5000
+
 
 class VehiculoCRUD:
     def __init__(self, db: Session):
@@ -29,7 +40,7 @@ class VehiculoCRUD:
             marca: Marca del vehículo (obligatoria, máx 100 caracteres)
             modelo: Modelo del vehículo (obligatorio, máx 100 caracteres)
             tipo_id: UUID del tipo de vehículo (obligatorio)
-            placa: Placa opcional (única)
+            placa: Placa (obligatoria y única; la columna no admite nulos)
             disponible: Estado de disponibilidad (default True)
 
         Returns:
@@ -38,35 +49,205 @@ class VehiculoCRUD:
         Raises:
             ValueError: Si los datos no son válidos
         """
-        if not marca or len(marca.strip()) == 0:
-            raise ValueError("La marca del vehículo es obligatoria")
-        if not modelo or len(modelo.strip()) == 0:
-            raise ValueError("El modelo del vehículo es obligatorio")
-        if len(marca) > 100 or len(modelo) > 100:
-            raise ValueError("La marca o el modelo no pueden exceder 100 caracteres")
+        marca, modelo, placa = self._normalizar_datos(marca, modelo, placa)
+
+        if not tipos_vehiculo_cache.por_id(self.db, tipo_id):
+            raise ValueError("El tipo de vehículo no existe")
 
-        if placa and self.obtener_vehiculo_por_placa(placa):
+        if self.obtener_vehiculo_por_placa(placa):
             raise ValueError("Ya existe un vehículo con esa placa")
 
         vehiculo = Vehiculo(
-            marca=marca.strip().title(),
-            modelo=modelo.strip().title(),
+            marca=marca,
+            modelo=modelo,
             id_usuario_creacion=id_usuario_creacion,
-            placa=placa.strip().upper() if placa else None,
+            placa=placa,
             disponible=disponible,
             tipo_id=tipo_id,
         )
 
         self.db.add(vehiculo)
         self.db.commit()
-        self.db.refresh(vehiculo)
         return vehiculo
 
-    def obtener_vehiculo(self, vehiculo_id: UUID) -> Optional[Vehiculo]:
+    @staticmethod
+    def _normalizar_datos(
+        marca: str, modelo: str, placa: Optional[str]
+    ) -> Tuple[str, str, str]:
+        """
+        Validar y normalizar marca, modelo y placa de un vehículo
+
+        La placa es obligatoria: vehiculos.placa es NOT NULL, así que sin ella
+        el INSERT fallaría en la base.
+
+        Raises:
+            ValueError: Si los datos no son válidos
+        """
+        if not marca or len(marca.strip()) == 0:
+            raise ValueError("La marca del vehículo es obligatoria")
+        if not modelo or len(modelo.strip()) == 0:
+            raise ValueError("El modelo del vehículo es obligatorio")
+        if len(marca) > 100 or len(modelo) > 100:
+            raise ValueError("La marca o el modelo no pueden exceder 100 caracteres")
+        if not placa or len(placa.strip()) == 0:
+            raise ValueError("La placa del vehículo es obligatoria")
+
+        return marca.strip().title(), modelo.strip().title(), placa.strip().upper()
+
+    def crear_vehiculos_masivo(
+        self, filas: List[Dict], id_usuario_creacion: UUID
+    ) -> Dict:
+        """
+        Crear muchos vehículos en una sola transacción
+
+        Cada fila se valida y normaliza igual que en crear_vehiculo (placa
+        obligatoria incluida). Las placas repetidas y los tipos inexistentes se
+        detectan con consultas IN por lote en lugar de una consulta por
+        vehículo, y las filas válidas se insertan con INSERT de varias filas.
+        El INSERT usa ON CONFLICT (placa) DO NOTHING: una placa que otra
+        petición insertó entre la verificación y la carga se informa como
+        repetida en lugar de abortar toda la carga. Las filas con errores se
+        omiten y se informan.
+
+        Args:
+            filas: Diccionarios con marca, modelo, placa, tipo_id y disponible
+            id_usuario_creacion: Usuario que realiza la carga
+
+        Returns:
+            Diccionario con el número de insertados y la lista de errores por fila
+        """
+        errores = []
+        candidatos = []
+        placas_vistas = set()
+
+        for numero, fila in enumerate(filas, start=1):
+            try:
+                marca, modelo, placa = self._normalizar_datos(
+                    fila.get("marca"), fila.get("modelo"), fila.get("placa")
+                )
+                if placa in placas_vistas:
+                    raise ValueError("Placa repetida dentro de la carga")
+                if not fila.get("tipo_id"):
+                    raise ValueError("El tipo de vehículo es obligatorio")
+                try:
+                    tipo_id = UUID(str(fila["tipo_id"]))
+                except ValueError:
+                    raise ValueError("El tipo de vehículo no es un UUID válido")
+                disponible = fila.get("disponible")
+                if disponible is None:
+                    disponible = True
+                if isinstance(disponible, str):
+                    disponible = disponible.strip().lower() not in (
+                        "false",
+                        "0",
+                        "no",
+                    )
+            except (ValueError, AttributeError, TypeError) as e:
+                errores.append({"fila": numero, "error": str(e)})
+                continue
+
+            placas_vistas.add(placa)
+            candidatos.append(
+                (
+                    numero,
+                    {
+                        "marca": marca,
+                        "modelo": modelo,
+                        "placa": placa,
+                        "tipo_id": tipo_id,
+                        "disponible": bool(disponible),
+                        "id_usuario_creacion": id_usuario_creacion,
+                    },
+                )
+            )
+
+        placas = [datos["placa"] for _, datos in candidatos]
+        placas_existentes = set()
+        for inicio in range(0, len(placas), TAMANO_LOTE):
+            placas_existentes.update(
+                self.db.scalars(
+                    select(Vehiculo.placa).where(
+                        Vehiculo.placa.in_(placas[inicio : inicio + TAMANO_LOTE])
+                    )
+                )
+            )
+
+        tipos = {datos["tipo_id"] for _, datos in candidatos}
+        tipos_existentes = (
+            set(
+                self.db.scalars(
+                    select(TipoVehiculo.id).where(TipoVehiculo.id.in_(tipos))
+                )
+            )
+            if tipos
+            else set()
+        )
+
+        validos = []
+        for numero, datos in candidatos:
+            if datos["placa"] in placas_existentes:
+                errores.append(
+                    {"fila": numero, "error": "Ya existe un vehículo con esa placa"}
+                )
+            elif datos["tipo_id"] not in tipos_existentes:
+                errores.append(
+                    {"fila": numero, "error": "El tipo de vehículo no existe"}
+                )
+            else:
+                validos.append((numero, datos))
+
+        try:
+            insertadas = self._insertar_sin_conflictos([datos for _, datos in validos])
+            insertados = [datos for _, datos in validos if datos["placa"] in insertadas]
+            registrar_ajuste(
+                self.db,
+                vehiculos=len(insertados),
+                vehiculos_disponibles=sum(datos["disponible"] for datos in insertados),
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        for numero, datos in validos:
+            if datos["placa"] not in insertadas:
+                errores.append(
+                    {"fila": numero, "error": "Ya existe un vehículo con esa placa"}
+                )
+        errores.sort(key=lambda error: error["fila"])
+        return {"insertados": len(insertados), "errores": errores}
+
+    def _insertar_sin_conflictos(self, filas: List[Dict]) -> Set[str]:
+        """
+        INSERT de varias filas que omite las placas ya existentes
+
+        Returns:
+            Placas efectivamente insertadas
+        """
+        dialecto = self.db.get_bind().dialect.name
+        insertar = postgresql.insert if dialecto == "postgresql" else sqlite.insert
+        insertadas = set()
+        for inicio in range(0, len(filas), TAMANO_LOTE):
+            insertadas.update(
+                self.db.scalars(
+                    insertar(Vehiculo)
+                    .on_conflict_do_nothing(index_elements=[Vehiculo.placa])
+                    .returning(Vehiculo.placa),
+                    filas[inicio : inicio + TAMANO_LOTE],
+                )
+            )
+        return insertadas
+
+    def obtener_vehiculo(
+        self, vehiculo_id: UUID, campos: Optional[List[str]] = None
+    ) -> Optional[Vehiculo]:
         """
         Obtener un vehículo por ID
+
+        Args:
+            campos: Cargar solo estas columnas (None para todas)
         """
-        return self.db.query(Vehiculo).filter(Vehiculo.id == vehiculo_id).first()
+        return self.db.get(Vehiculo, vehiculo_id, options=solo_campos(Vehiculo, campos))
 
     def obtener_vehiculo_por_placa(self, placa: str) -> Optional[Vehiculo]:
         """
@@ -78,11 +259,67 @@ class VehiculoCRUD:
             .first()
         )
 
-    def obtener_vehiculos(self, skip: int = 0, limit: int = 100) -> List[Vehiculo]:
+    def obtener_vehiculos(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Vehiculo]:
         """
         Obtener lista de vehículos con paginación
+
+        Args:
+            campos: Cargar solo estas columnas (None para todas)
         """
-        return self.db.query(Vehiculo).offset(skip).limit(limit).all()
+        return paginar(self.db.query(Vehiculo), Vehiculo, skip, limit, after, campos)
+
+    def obtener_vehiculos_disponibles(
+        self,
+        desde: datetime,
+        hasta: datetime,
+        tipo_id: Optional[UUID] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        campos: Optional[List[str]] = None,
+    ) -> List[Vehiculo]:
+        """
+        Obtener vehículos sin contratos activos que se solapen con un rango de fechas
+
+        Un contrato ocupa el vehículo en [fecha_inicio, fecha_fin); si no tiene
+        fecha_fin se considera abierto. La subconsulta NOT EXISTS se resuelve con
+        el índice parcial ix_contratos_activos_vehiculo_periodo.
+
+        Args:
+            desde: Inicio del rango buscado
+            hasta: Fin del rango buscado
+            tipo_id: Filtrar por tipo de vehículo
+            skip: Número de registros a omitir
+            limit: Límite de registros a retornar
+            after: Cursor de la página anterior (reemplaza a skip)
+            campos: Cargar solo estas columnas (None para todas)
+
+        Raises:
+            ValueError: Si el rango de fechas no es válido
+        """
+        if hasta <= desde:
+            raise ValueError("La fecha hasta debe ser posterior a la fecha desde")
+
+        ocupado = (
+            select(Contrato.id)
+            .where(
+                Contrato.vehiculo_id == Vehiculo.id,
+                Contrato.activo == True,
+                Contrato.fecha_inicio < hasta,
+                or_(Contrato.fecha_fin.is_(None), Contrato.fecha_fin > desde),
+            )
+            .exists()
+        )
+        query = self.db.query(Vehiculo).filter(~ocupado)
+        if tipo_id:
+            query = query.filter(Vehiculo.tipo_id == tipo_id)
+        return paginar(query, Vehiculo, skip, limit, after, campos)
 
     def actualizar_vehiculo(
         self, vehiculo_id: UUID, id_usuario_edicion: UUID, **kwargs
@@ -125,7 +362,6 @@ class VehiculoCRUD:
 
         vehiculo.id_usuario_edicion = id_usuario_edicion
         self.db.commit()
-        self.db.refresh(vehiculo)
         return vehiculo
 
     def eliminar_vehiculo(self, vehiculo_id: UUID) -> bool:
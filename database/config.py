@@ -1,35 +1,182 @@
 """
-Configuración de la base de datos PostgreSQL con Neon
+Configuración de la base de datos
+
+Por defecto PostgreSQL (Neon) con SSL obligatorio. Con DB_BACKEND=sqlite la
+aplicación, la CLI y los benchmarks funcionan sobre SQLite embebido: en
+memoria compartida por todas las conexiones del proceso si no se indica
+DATABASE_URL, o en archivo con DATABASE_URL=sqlite:///renta.db.
 """
 
+import asyncio
 import os
+import sqlite3
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from monitoreo.metricas import AsyncQueuePoolMedido, QueuePoolMedido
+
+from .lectura import fijado_a_primaria
 
 # Cargar variables de entorno
 load_dotenv()
 
-# Configuración de la base de datos Neon PostgreSQL
 # Obtener la URL completa de conexión desde las variables de entorno
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Motor de base de datos: postgresql (por defecto) o sqlite
+DB_BACKEND = os.getenv("DB_BACKEND") or (
+    make_url(DATABASE_URL).get_backend_name() if DATABASE_URL else "postgresql"
+)
+
+# Base SQLite en memoria compartida entre las conexiones del proceso
+SQLITE_MEMORIA = "file:renta?mode=memory&cache=shared"
+URL_SQLITE_MEMORIA = f"sqlite:///{SQLITE_MEMORIA}&uri=true"
+
+if DB_BACKEND not in ("postgresql", "sqlite"):
+    raise ValueError(f"DB_BACKEND no soportado: {DB_BACKEND}")
+
 if not DATABASE_URL:
-    raise ValueError("Se requiere DATABASE_URL en las variables de entorno")
+    if DB_BACKEND == "postgresql":
+        raise ValueError("Se requiere DATABASE_URL en las variables de entorno")
+    DATABASE_URL = URL_SQLITE_MEMORIA
+
+# Modo SSL de PostgreSQL (require para Neon; disable para un servidor local)
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
+
+
+def _url_asincrona(url: str) -> str:
+    """
+    Convertir la URL síncrona en una URL para el driver asíncrono
+
+    PostgreSQL usa asyncpg y SQLite aiosqlite. asyncpg no entiende los
+    parámetros sslmode/channel_binding que trae la URL de Neon, por eso se
+    eliminan y el SSL se pide mediante connect_args.
+    """
+    url_async = make_url(url)
+    if url_async.drivername.startswith("postgresql"):
+        url_async = url_async.set(drivername="postgresql+asyncpg")
+    elif url_async.drivername.startswith("sqlite"):
+        url_async = url_async.set(drivername="sqlite+aiosqlite")
+    url_async = url_async.difference_update_query(["sslmode", "channel_binding"])
+    return url_async.render_as_string(hide_password=False)
+
+
+def _connect_args(asincrono: bool) -> dict:
+    """Argumentos de conexión propios de cada driver"""
+    if DB_BACKEND == "sqlite":
+        # Las sesiones síncronas se usan desde el threadpool de FastAPI
+        return {"check_same_thread": False}
+    if asincrono:
+        return {"ssl": DB_SSLMODE}  # Equivalente a sslmode en asyncpg
+    return {"sslmode": DB_SSLMODE}
+
+
+# Pool de conexiones de cada motor
+OPCIONES_POOL = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "300")),
+}
+
+# Ningún motor hace pre-ping por defecto: en lugar de un SELECT 1 en cada
+# checkout, AsyncCRUD y las exportaciones reintentan una vez cuando la conexión
+# resulta estar caída antes de ejecutar nada. El motor síncrono (scripts de
+# benchmarks, get_db) no tiene ese reintento: sus sesiones son cortas y
+# pool_recycle descarta las conexiones viejas, pero si la base corta conexiones
+# ociosas antes de DB_POOL_RECYCLE conviene DB_POOL_PRE_PING=true.
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true")
+
+# En memoria compartida SQLite bloquea tablas enteras sin esperar (no aplica
+# busy_timeout), así que cada motor usa una única conexión y serializa
+if DATABASE_URL == URL_SQLITE_MEMORIA:
+    OPCIONES_POOL.update(pool_size=1, max_overflow=0)
+
+# Conexiones que se abren al arrancar para no pagar su apertura en las
+# primeras peticiones (como máximo pool_size)
+DB_POOL_PRECALENTAR = int(os.getenv("DB_POOL_PRECALENTAR", "0"))
+
+# URL para el motor asíncrono (se puede sobreescribir con ASYNC_DATABASE_URL)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _url_asincrona(DATABASE_URL)
+
+# Réplica de solo lectura opcional para los GET de la API
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
 
 # Crear el motor de SQLAlchemy
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # Cambiar a True para ver consultas SQL
-    pool_pre_ping=True,  # Verificar conexión antes de usar
-    pool_recycle=300,  # Reciclar conexiones cada 5 minutos
-    connect_args={"sslmode": "require"},  # Requerir SSL para Neon
+    poolclass=QueuePoolMedido,  # Publica uso y espera del pool en /metrics
+    pool_logging_name="principal",
+    pool_pre_ping=POOL_PRE_PING,
+    connect_args=_connect_args(asincrono=False),
+    **OPCIONES_POOL,
+)
+
+# Crear el motor asíncrono usado por los routers de la API
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    poolclass=AsyncQueuePoolMedido,
+    pool_logging_name="async",
+    pool_pre_ping=POOL_PRE_PING,
+    connect_args=_connect_args(asincrono=True),
+    **OPCIONES_POOL,
 )
 
-# Crear la sesión
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Crear el motor de la réplica (si no hay, las lecturas usan async_engine)
+read_async_engine = (
+    create_async_engine(
+        _url_asincrona(DATABASE_READ_URL),
+        echo=False,
+        poolclass=AsyncQueuePoolMedido,
+        pool_logging_name="lectura",
+        pool_pre_ping=POOL_PRE_PING,
+        connect_args=_connect_args(asincrono=True),
+        **OPCIONES_POOL,
+    )
+    if DATABASE_READ_URL
+    else async_engine
+)
+
+if DB_BACKEND == "sqlite":
+
+    def _activar_claves_foraneas(conexion_dbapi, registro):
+        """SQLite no valida las claves foráneas salvo que se pida"""
+        cursor = conexion_dbapi.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    for _motor in {engine, async_engine.sync_engine, read_async_engine.sync_engine}:
+        event.listen(_motor, "connect", _activar_claves_foraneas)
+
+    # La base en memoria existe mientras quede una conexión abierta; esta la
+    # mantiene viva aunque los pools cierren o reciclen las suyas
+    if DATABASE_URL == URL_SQLITE_MEMORIA:
+        _ancla_memoria = sqlite3.connect(SQLITE_MEMORIA, uri=True)
+
+# Crear la sesión. Sin expirar en commit: todas las columnas por defecto se
+# calculan en Python y viajan en el propio INSERT/UPDATE, así que el objeto ya
+# está completo tras el commit y no hace falta un refresh ni SELECTs diferidos.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
+# Crear la sesión asíncrona (mismo criterio; tampoco se recarga en el event loop)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Sesión asíncrona sobre la réplica
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=read_async_engine, autoflush=False, expire_on_commit=False
+)
 
 # Base para los modelos
 Base = declarative_base()
@@ -46,8 +193,68 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Generador de sesiones asíncronas de base de datos
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db(request: Request):
+    """
+    Generador de sesiones asíncronas para endpoints de solo lectura
+
+    Usa la réplica salvo que el cliente haya escrito hace poco (ver
+    database.lectura), en cuyo caso lee de la primaria.
+    """
+    fabrica = AsyncSessionLocal if fijado_a_primaria(request) else AsyncReadSessionLocal
+    async with fabrica() as db:
+        yield db
+
+
 def create_tables():
     """
     Crear todas las tablas definidas en los modelos
     """
     Base.metadata.create_all(bind=engine)
+
+
+def _motores():
+    """Motores con pool propio, por nombre"""
+    motores = [("principal", engine), ("async", async_engine.sync_engine)]
+    if read_async_engine is not async_engine:
+        motores.append(("lectura", read_async_engine.sync_engine))
+    return motores
+
+
+def estadisticas_pool() -> dict:
+    """Estado actual del pool de cada motor"""
+    return {
+        nombre: {
+            "tamano": motor.pool.size(),
+            "desborde_maximo": OPCIONES_POOL["max_overflow"],
+            "en_uso": motor.pool.checkedout(),
+            "libres": motor.pool.checkedin(),
+            "desborde": motor.pool.overflow(),
+        }
+        for nombre, motor in _motores()
+    }
+
+
+async def precalentar_pool(conexiones: int = DB_POOL_PRECALENTAR) -> int:
+    """
+    Abrir conexiones de los pools asíncronos a la vez y devolverlas al pool
+
+    Returns:
+        Conexiones abiertas en total
+    """
+    conexiones = min(conexiones, OPCIONES_POOL["pool_size"])
+    if conexiones <= 0:
+        return 0
+    motores = {async_engine, read_async_engine}
+    abiertas = await asyncio.gather(
+        *(motor.connect().start() for motor in motores for _ in range(conexiones))
+    )
+    await asyncio.gather(*(conexion.close() for conexion in abiertas))
+    return len(abiertas)
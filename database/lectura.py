@@ -0,0 +1,86 @@
+"""
+Fijación a la base primaria tras una escritura
+
+Las lecturas pueden ir a una réplica (DATABASE_READ_URL) que va unos
+instantes por detrás de la primaria. Para que un cliente vea siempre sus
+propias escrituras, toda respuesta correcta a un POST/PUT/PATCH/DELETE
+incluye una cookie con el instante hasta el que sus lecturas deben ir a la
+primaria (DB_VENTANA_PRIMARIA segundos, por defecto 5).
+
+La cookie solo sirve a clientes con almacén de cookies (navegadores, sesiones
+de httpx/requests). Para los demás (integraciones servidor a servidor, apps
+que no guardan cookies) la respuesta lleva el mismo instante en la cabecera
+X-DB-Primaria: si el cliente la reenvía en sus lecturas siguientes, estas
+también van a la primaria. Un cliente que no hace ninguna de las dos cosas
+puede leer de la réplica datos anteriores a su propia escritura.
+"""
+
+import math
+import os
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+COOKIE_PRIMARIA = "db_primaria"
+CABECERA_PRIMARIA = "X-DB-Primaria"
+
+VENTANA_PRIMARIA = float(os.getenv("DB_VENTANA_PRIMARIA", "5"))
+
+METODOS_LECTURA = {"GET", "HEAD", "OPTIONS"}
+
+
+def fijado_a_primaria(
+    conexion: HTTPConnection, ventana: float = VENTANA_PRIMARIA
+) -> bool:
+    """
+    El cliente escribió hace menos de ``ventana`` segundos
+
+    El instante lo envía el cliente, así que solo se acepta dentro de
+    (ahora, ahora + ventana]: un valor lejano en el futuro, infinito o NaN
+    fijaría sus lecturas a la primaria indefinidamente.
+    """
+    valor = conexion.headers.get(CABECERA_PRIMARIA) or conexion.cookies.get(
+        COOKIE_PRIMARIA
+    )
+    if not valor:
+        return False
+    try:
+        hasta = float(valor)
+    except ValueError:
+        return False
+    ahora = time.time()
+    return math.isfinite(hasta) and ahora < hasta <= ahora + ventana
+
+
+class MiddlewarePrimariaTrasEscritura:
+    """
+    Añade la cookie COOKIE_PRIMARIA y la cabecera CABECERA_PRIMARIA a las
+    respuestas 2xx/3xx de escrituras
+
+    La cookie caduca sola (Max-Age) y además guarda el instante límite, que es
+    lo que se comprueba al leer; la cabecera lleva ese mismo instante.
+    """
+
+    def __init__(self, app, ventana: float = VENTANA_PRIMARIA):
+        self.app = app
+        self.ventana = ventana
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in METODOS_LECTURA:
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start" and mensaje["status"] < 400:
+                hasta = time.time() + self.ventana
+                cabeceras = MutableHeaders(scope=mensaje)
+                cabeceras.append(
+                    "set-cookie",
+                    f"{COOKIE_PRIMARIA}={hasta:.3f}; Max-Age={int(self.ventana) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+                cabeceras.append(CABECERA_PRIMARIA, f"{hasta:.3f}")
+            await send(mensaje)
+
+        await self.app(scope, receive, enviar)
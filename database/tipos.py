@@ -0,0 +1,27 @@
+"""
+Tipos de columna portables entre motores
+"""
+
+import uuid
+
+from sqlalchemy import Uuid
+from sqlalchemy.types import TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """
+    UUID portable
+
+    Usa el tipo UUID nativo en PostgreSQL y CHAR(32) en SQLite y otros
+    motores sin UUID nativo. Acepta tanto uuid.UUID como su forma en texto en
+    los parámetros (los CRUD reciben ids como str) y devuelve siempre
+    uuid.UUID.
+    """
+
+    impl = Uuid
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(str(value))
@@ -0,0 +1,43 @@
+"""
+Entidad Contador
+================
+"""
+
+from sqlalchemy import Column, String, Float, DateTime, SmallInteger
+from datetime import datetime
+
+from database.config import Base
+
+
+class Contador(Base):
+    """
+    Modelo de la tabla contadores
+
+    Tabla clave-valor con los totales del dashboard y las versiones de los
+    catalogos en cache. Los mantienen de forma incremental las operaciones de
+    escritura del CRUD; los totales se reconcilian periodicamente contra las
+    tablas reales.
+
+    Cada contador se reparte en varias filas (fragmentos) y su valor es la
+    suma de todas: cada transaccion incrementa un fragmento al azar, asi que
+    las escrituras concurrentes rara vez esperan por el mismo bloqueo de fila.
+
+    Atributos:
+        clave (str): Nombre del contador (clientes, ingresos, version_...).
+        fragmento (int): Numero de fragmento del contador.
+        valor (float): Parte del valor del contador en este fragmento.
+        fecha_actualizacion (datetime): Ultima reconciliacion del contador.
+    """
+
+    __tablename__ = "contadores"
+
+    clave = Column(String(50), primary_key=True)
+    fragmento = Column(SmallInteger, primary_key=True, default=0)
+    valor = Column(Float, default=0, nullable=False)
+    fecha_actualizacion = Column(DateTime, default=datetime.now, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<Contador(clave='{self.clave}', fragmento={self.fragmento},"
+            f" valor={self.valor})>"
+        )
@@ -3,13 +3,22 @@ Entidad Contrato
 ================
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Boolean,
+    ForeignKey,
+    Index,
+    text,
+)
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from database.tipos import GUID
 
 from database.config import Base
 
@@ -46,27 +55,50 @@ class Contrato(Base):
     """
 
     __tablename__ = "contratos"
+    __table_args__ = (
+        # Orden estable para la paginación por cursor
+        Index("ix_contratos_fecha_creacion_id", "fecha_creacion", "id"),
+        # Claves foráneas: contratos de un vehículo, de un cliente y de un
+        # empleado, activos o no
+        Index("ix_contratos_vehiculo_id", "vehiculo_id"),
+        Index("ix_contratos_cliente_id", "cliente_id"),
+        Index("ix_contratos_empleado_id", "empleado_id"),
+        # Índices parciales sobre la fracción activa: listado paginado de
+        # contratos activos y búsqueda de disponibilidad (contratos activos de
+        # un vehículo que se solapan con un rango de fechas)
+        Index(
+            "ix_contratos_activos_fecha_creacion_id",
+            "fecha_creacion",
+            "id",
+            postgresql_where=text("activo"),
+            sqlite_where=text("activo = 1"),
+        ),
+        Index(
+            "ix_contratos_activos_vehiculo_periodo",
+            "vehiculo_id",
+            "fecha_inicio",
+            "fecha_fin",
+            postgresql_where=text("activo"),
+            sqlite_where=text("activo = 1"),
+        ),
+    )
 
     id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
         nullable=False,
     )
-    cliente_id = Column(UUID(as_uuid=True), ForeignKey("clientes.id"), nullable=False)
-    vehiculo_id = Column(UUID(as_uuid=True), ForeignKey("vehiculos.id"), nullable=False)
-    empleado_id = Column(UUID(as_uuid=True), ForeignKey("empleados.id"), nullable=False)
+    cliente_id = Column(GUID(), ForeignKey("clientes.id"), nullable=False)
+    vehiculo_id = Column(GUID(), ForeignKey("vehiculos.id"), nullable=False)
+    empleado_id = Column(GUID(), ForeignKey("empleados.id"), nullable=False)
     fecha_inicio = Column(DateTime, nullable=False)
     fecha_fin = Column(DateTime, nullable=True)
     activo = Column(Boolean, default=True, nullable=False)
 
-    id_usuario_creacion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=False
-    )
-    id_usuario_edicion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=True
-    )
+    id_usuario_creacion = Column(GUID(), ForeignKey("usuarios.id"), nullable=False)
+    id_usuario_edicion = Column(GUID(), ForeignKey("usuarios.id"), nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -3,13 +3,13 @@ Entidad Empleado
 ================
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field, validator, EmailStr
 from datetime import datetime
 from typing import Optional, List
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from database.tipos import GUID
 
 from database.config import Base
 
@@ -42,9 +42,13 @@ class Empleado(Base):
     """
 
     __tablename__ = "empleados"
+    __table_args__ = (
+        # Orden estable para la paginación por cursor
+        Index("ix_empleados_fecha_creacion_id", "fecha_creacion", "id"),
+    )
 
     id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -55,12 +59,8 @@ class Empleado(Base):
     rol = Column(String(50), nullable=False, default="Asesor")
     activo = Column(Boolean, default=True, nullable=False)
 
-    id_usuario_creacion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=False
-    )
-    id_usuario_edicion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=True
-    )
+    id_usuario_creacion = Column(GUID(), ForeignKey("usuarios.id"), nullable=False)
+    id_usuario_edicion = Column(GUID(), ForeignKey("usuarios.id"), nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -3,13 +3,13 @@ Entidad Pago
 ============
 """
 
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from database.tipos import GUID
 
 from database.config import Base
 
@@ -39,24 +39,30 @@ class Pago(Base):
     """
 
     __tablename__ = "pagos"
+    __table_args__ = (
+        # Orden estable para la paginación por cursor
+        Index("ix_pagos_fecha_creacion_id", "fecha_creacion", "id"),
+        # Pagos de un contrato en el mismo orden de la paginación
+        Index(
+            "ix_pagos_contrato_fecha_creacion_id", "contrato_id", "fecha_creacion", "id"
+        ),
+        # Filtros por rango de fecha de pago (exportación)
+        Index("ix_pagos_fecha_pago", "fecha_pago"),
+    )
 
     id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
         nullable=False,
     )
-    contrato_id = Column(UUID(as_uuid=True), ForeignKey("contratos.id"), nullable=False)
+    contrato_id = Column(GUID(), ForeignKey("contratos.id"), nullable=False)
     monto = Column(Float, nullable=False)
     fecha_pago = Column(DateTime, default=datetime.now, nullable=False)
 
-    id_usuario_creacion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=False
-    )
-    id_usuario_edicion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=True
-    )
+    id_usuario_creacion = Column(GUID(), ForeignKey("usuarios.id"), nullable=False)
+    id_usuario_edicion = Column(GUID(), ForeignKey("usuarios.id"), nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
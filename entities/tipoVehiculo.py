@@ -3,13 +3,22 @@ Entidad TipoVehiculo
 ====================
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Text,
+    Boolean,
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from typing import Optional, List
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from database.tipos import GUID
 
 from database.config import Base
 
@@ -40,9 +49,13 @@ class TipoVehiculo(Base):
     """
 
     __tablename__ = "tipos_vehiculo"
+    __table_args__ = (
+        # Orden estable para la paginación por cursor
+        Index("ix_tipos_vehiculo_fecha_creacion_id", "fecha_creacion", "id"),
+    )
 
     id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -52,12 +65,8 @@ class TipoVehiculo(Base):
     descripcion = Column(Text, nullable=True)
     activo = Column(Boolean, default=True, nullable=False)
 
-    id_usuario_creacion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=False
-    )
-    id_usuario_edicion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=True
-    )
+    id_usuario_creacion = Column(GUID(), ForeignKey("usuarios.id"), nullable=False)
+    id_usuario_edicion = Column(GUID(), ForeignKey("usuarios.id"), nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
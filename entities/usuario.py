@@ -3,14 +3,23 @@ Entidad Usuario
 ===============
 """
 
-from sqlalchemy import Column, Integer, String, Enum, Boolean, ForeignKey, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Enum,
+    Boolean,
+    ForeignKey,
+    DateTime,
+    Index,
+)
 from sqlalchemy.orm import relationship
 from database.config import Base
 from datetime import datetime
 from auth.security import hash_password, verify_password
 import enum
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from database.tipos import GUID
 
 
 class RolEnum(enum.Enum):
@@ -42,9 +51,19 @@ class Usuario(Base):
     """
 
     __tablename__ = "usuarios"
+    __table_args__ = (
+        # Orden estable para la paginación por cursor
+        Index("ix_usuarios_fecha_creacion_id", "fecha_creacion", "id"),
+        # Búsqueda por prefijo del username (LIKE 'abc%') en PostgreSQL
+        Index(
+            "ix_usuarios_username_prefijo",
+            "username",
+            postgresql_ops={"username": "varchar_pattern_ops"},
+        ),
+    )
 
     id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -55,12 +74,8 @@ class Usuario(Base):
     rol = Column(Enum(RolEnum), default=RolEnum.admin, nullable=False)
     estado = Column(Boolean, default=True)
 
-    id_usuario_creacion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=True
-    )
-    id_usuario_edicion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=True
-    )
+    id_usuario_creacion = Column(GUID(), ForeignKey("usuarios.id"), nullable=True)
+    id_usuario_edicion = Column(GUID(), ForeignKey("usuarios.id"), nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -3,13 +3,13 @@ Entidad Vehiculo
 ================
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from typing import Optional
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from database.tipos import GUID
 
 from database.config import Base
 
@@ -42,28 +42,28 @@ class Vehiculo(Base):
     """
 
     __tablename__ = "vehiculos"
+    __table_args__ = (
+        # Orden estable para la paginación por cursor
+        Index("ix_vehiculos_fecha_creacion_id", "fecha_creacion", "id"),
+        # Vehículos por tipo (y comprobación de la FK al borrar un tipo)
+        Index("ix_vehiculos_tipo_id", "tipo_id"),
+    )
 
     id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
         nullable=False,
     )
-    tipo_id = Column(
-        UUID(as_uuid=True), ForeignKey("tipos_vehiculo.id"), nullable=False
-    )
+    tipo_id = Column(GUID(), ForeignKey("tipos_vehiculo.id"), nullable=False)
     marca = Column(String(100), nullable=False)
     modelo = Column(String(100), nullable=False)
     placa = Column(String(20), unique=True, nullable=False, index=True)
     disponible = Column(Boolean, default=True, nullable=False)
 
-    id_usuario_creacion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=False
-    )
-    id_usuario_edicion = Column(
-        UUID(as_uuid=True), ForeignKey("usuarios.id"), nullable=True
-    )
+    id_usuario_creacion = Column(GUID(), ForeignKey("usuarios.id"), nullable=False)
+    id_usuario_edicion = Column(GUID(), ForeignKey("usuarios.id"), nullable=True)
     fecha_creacion = Column(DateTime, default=datetime.now, nullable=False)
     fecha_actualizacion = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -1,5 +1,9 @@
+import asyncio
+import os
+
 import uvicorn
 from Apis import (
+    admin,
     cliente,
     contrato,
     empleado,
@@ -9,10 +13,23 @@ from Apis import (
     vehiculo,
     dashboard,
 )
-from database.config import create_tables
-from fastapi import FastAPI
+from crud.asyncCRUD import ContadorCRUDAsync
+from database.config import (
+    AsyncSessionLocal,
+    async_engine,
+    create_tables,
+    precalentar_pool,
+    read_async_engine,
+)
+from database.lectura import CABECERA_PRIMARIA, MiddlewarePrimariaTrasEscritura
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from auth.routes import router as auth_router
+from auth.security import cerrar_pool_hash, iniciar_pool_hash
+from monitoreo import MiddlewareConsultas, MiddlewareMetricas, generar_metricas
+
+# Cada cuánto se recalculan los contadores del dashboard contra las tablas
+INTERVALO_RECONCILIACION = int(os.getenv("CONTADORES_RECONCILIACION_SEGUNDOS", "300"))
 
 app = FastAPI(
     title="Sistema de Renta de Vehiculos",
@@ -28,7 +45,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor",
+        "ETag",
+        "X-DB-Queries",
+        "Server-Timing",
+        CABECERA_PRIMARIA,
+    ],
 )
+app.add_middleware(MiddlewareConsultas)
+app.add_middleware(MiddlewareMetricas)
+app.add_middleware(MiddlewarePrimariaTrasEscritura)
 
 app.include_router(auth_router)
 app.include_router(cliente.router)
@@ -39,6 +66,18 @@ app.include_router(tipoVehiculo.router)
 app.include_router(usuario.router)
 app.include_router(vehiculo.router)
 app.include_router(dashboard.router)
+app.include_router(admin.router)
+
+
+async def reconciliar_contadores_periodicamente():
+    """Corregir periódicamente cualquier desviación de los contadores"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await ContadorCRUDAsync(db).reconciliar()
+        except Exception as e:
+            print(f"Error al reconciliar contadores: {str(e)}")
+        await asyncio.sleep(INTERVALO_RECONCILIACION)
 
 
 @app.on_event("startup")
@@ -47,10 +86,25 @@ async def startup_event():
     print("Iniciando Sistema de renta de vehiculos...")
     print("Configurando base de datos...")
     create_tables()
+    await precalentar_pool()
+    iniciar_pool_hash()
+    app.state.reconciliacion = asyncio.create_task(
+        reconciliar_contadores_periodicamente()
+    )
     print("Sistema listo para usar.")
     print("Documentación disponible en: http://localhost:8000/docs")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Evento de cierre de la aplicación"""
+    app.state.reconciliacion.cancel()
+    cerrar_pool_hash()
+    await async_engine.dispose()
+    if read_async_engine is not async_engine:
+        await read_async_engine.dispose()
+
+
 @app.get("/", tags=["raíz"])
 async def root():
     """Endpoint raíz que devuelve información básica de la API."""
@@ -72,6 +126,13 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metricas():
+    """Métricas en formato de exposición de Prometheus"""
+    contenido, tipo = generar_metricas()
+    return Response(content=contenido, headers={"Content-Type": tipo})
+
+
 def main():
     """Función principal para ejecutar el servidor"""
     print("Iniciando servidor FastAPI...")
@@ -0,0 +1,29 @@
+"""Add username prefix index on usuarios
+
+Revision ID: 5d8c0b7e4f12
+Revises: c3f18a6d2e97
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d8c0b7e4f12"
+down_revision = "c3f18a6d2e97"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # varchar_pattern_ops lets LIKE 'prefix%' use the index under any collation
+    op.create_index(
+        "ix_usuarios_username_prefijo",
+        "usuarios",
+        ["username"],
+        postgresql_ops={"username": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usuarios_username_prefijo", table_name="usuarios")
@@ -0,0 +1,28 @@
+"""Add availability index on contratos
+
+Revision ID: 7b2e9d41c5a8
+Revises: 04c005510a3f
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7b2e9d41c5a8"
+down_revision = "04c005510a3f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Index for the date-range overlap search on contratos
+    op.create_index(
+        "ix_contratos_vehiculo_periodo",
+        "contratos",
+        ["vehiculo_id", "fecha_inicio", "fecha_fin"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contratos_vehiculo_periodo", table_name="contratos")
@@ -0,0 +1,42 @@
+"""Add contadores table for precomputed dashboard totals
+
+Revision ID: 9a4c7e2b1f30
+Revises: 5d8c0b7e4f12
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a4c7e2b1f30"
+down_revision = "5d8c0b7e4f12"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contadores",
+        sa.Column("clave", sa.String(length=50), nullable=False),
+        sa.Column("valor", sa.Float(), nullable=False),
+        sa.Column("fecha_actualizacion", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("clave"),
+    )
+    # Seed from the current data; the app keeps them in sync from here on
+    op.execute("""
+        INSERT INTO contadores (clave, valor, fecha_actualizacion)
+        SELECT 'clientes', COUNT(*), now() FROM clientes
+        UNION ALL SELECT 'vehiculos', COUNT(*), now() FROM vehiculos
+        UNION ALL SELECT 'vehiculos_disponibles', COUNT(*), now()
+            FROM vehiculos WHERE disponible
+        UNION ALL SELECT 'contratos', COUNT(*), now() FROM contratos
+        UNION ALL SELECT 'contratos_activos', COUNT(*), now()
+            FROM contratos WHERE activo
+        UNION ALL SELECT 'ingresos', COALESCE(SUM(monto), 0), now() FROM pagos
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table("contadores")
@@ -0,0 +1,47 @@
+"""Split each contadores row into fragments summed on read
+
+Revision ID: b5f2c8d3a914
+Revises: e6a1d4c8b253
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b5f2c8d3a914"
+down_revision = "e6a1d4c8b253"
+branch_labels = None
+depends_on = None
+
+# Must match crud.contadorCRUD.FRAGMENTOS (reconciliation creates any missing
+# fragment if it is raised later)
+FRAGMENTOS = 16
+
+
+def upgrade() -> None:
+    op.add_column(
+        "contadores",
+        sa.Column("fragmento", sa.SmallInteger(), nullable=False, server_default="0"),
+    )
+    op.drop_constraint("contadores_pkey", "contadores", type_="primary")
+    op.create_primary_key("contadores_pkey", "contadores", ["clave", "fragmento"])
+    # The current value stays in fragment 0; the others start at zero
+    op.execute(f"""
+        INSERT INTO contadores (clave, fragmento, valor, fecha_actualizacion)
+        SELECT contadores.clave, serie.numero, 0, now()
+        FROM contadores, generate_series(1, {FRAGMENTOS - 1}) AS serie(numero)
+        """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE contadores SET valor = sumas.valor
+        FROM (SELECT clave, SUM(valor) AS valor FROM contadores GROUP BY clave) sumas
+        WHERE contadores.clave = sumas.clave AND contadores.fragmento = 0
+        """)
+    op.execute("DELETE FROM contadores WHERE fragmento <> 0")
+    op.drop_constraint("contadores_pkey", "contadores", type_="primary")
+    op.create_primary_key("contadores_pkey", "contadores", ["clave"])
+    op.drop_column("contadores", "fragmento")
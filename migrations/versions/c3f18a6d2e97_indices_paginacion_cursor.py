@@ -0,0 +1,38 @@
+"""Add (fecha_creacion, id) indexes for cursor pagination
+
+Revision ID: c3f18a6d2e97
+Revises: 7b2e9d41c5a8
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c3f18a6d2e97"
+down_revision = "7b2e9d41c5a8"
+branch_labels = None
+depends_on = None
+
+TABLAS = [
+    "clientes",
+    "contratos",
+    "empleados",
+    "pagos",
+    "tipos_vehiculo",
+    "usuarios",
+    "vehiculos",
+]
+
+
+def upgrade() -> None:
+    # Stable (fecha_creacion, id) ordering used by the keyset pagination
+    for tabla in TABLAS:
+        op.create_index(
+            f"ix_{tabla}_fecha_creacion_id", tabla, ["fecha_creacion", "id"]
+        )
+
+
+def downgrade() -> None:
+    for tabla in TABLAS:
+        op.drop_index(f"ix_{tabla}_fecha_creacion_id", table_name=tabla)
@@ -0,0 +1,110 @@
+"""Add foreign key and filter indexes (concurrently)
+
+Revision ID: e6a1d4c8b253
+Revises: 9a4c7e2b1f30
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e6a1d4c8b253"
+down_revision = "9a4c7e2b1f30"
+branch_labels = None
+depends_on = None
+
+# name, table, columns, partial index predicate
+INDICES = [
+    ("ix_contratos_vehiculo_id", "contratos", ["vehiculo_id"], None),
+    ("ix_contratos_cliente_id", "contratos", ["cliente_id"], None),
+    ("ix_contratos_empleado_id", "contratos", ["empleado_id"], None),
+    (
+        "ix_contratos_activos_fecha_creacion_id",
+        "contratos",
+        ["fecha_creacion", "id"],
+        "activo",
+    ),
+    (
+        "ix_contratos_activos_vehiculo_periodo",
+        "contratos",
+        ["vehiculo_id", "fecha_inicio", "fecha_fin"],
+        "activo",
+    ),
+    (
+        "ix_pagos_contrato_fecha_creacion_id",
+        "pagos",
+        ["contrato_id", "fecha_creacion", "id"],
+        None,
+    ),
+    ("ix_pagos_fecha_pago", "pagos", ["fecha_pago"], None),
+    ("ix_vehiculos_tipo_id", "vehiculos", ["tipo_id"], None),
+]
+
+# Full availability index from 7b2e9d41c5a8, superseded by the partial
+# ix_contratos_activos_vehiculo_periodo plus ix_contratos_vehiculo_id
+REEMPLAZADO = (
+    "ix_contratos_vehiculo_periodo",
+    "contratos",
+    ["vehiculo_id", "fecha_inicio", "fecha_fin"],
+)
+
+
+def _drop_invalid(nombre: str) -> None:
+    # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind that
+    # IF NOT EXISTS would silently keep; drop it so the retry rebuilds it
+    if op.get_context().as_sql:
+        return
+    invalido = op.get_bind().scalar(
+        sa.text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :nombre AND NOT i.indisvalid
+        """),
+        {"nombre": nombre},
+    )
+    if invalido:
+        op.drop_index(nombre, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block; each index is built
+    # in its own autocommit step without blocking writes on the table
+    with op.get_context().autocommit_block():
+        for nombre, tabla, columnas, predicado in INDICES:
+            _drop_invalid(nombre)
+            op.create_index(
+                nombre,
+                tabla,
+                columnas,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(predicado) if predicado else None,
+                if_not_exists=True,
+            )
+        # Dropped only once its replacements exist
+        nombre, tabla, _ = REEMPLAZADO
+        op.drop_index(
+            nombre, table_name=tabla, postgresql_concurrently=True, if_exists=True
+        )
+        for tabla in ("contratos", "pagos", "vehiculos"):
+            op.execute(f"ANALYZE {tabla}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        nombre, tabla, columnas = REEMPLAZADO
+        _drop_invalid(nombre)
+        op.create_index(
+            nombre,
+            tabla,
+            columnas,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for nombre, tabla, _, _ in reversed(INDICES):
+            op.drop_index(
+                nombre,
+                table_name=tabla,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 from uuid import UUID
 from datetime import datetime
 
@@ -218,12 +218,30 @@ class VehiculoResponse(VehiculoBase):
     model_config = {"from_attributes": True}
 
 
+class ContratoExpandido(ContratoResponse):
+    cliente: Optional[ClienteResponse] = None
+    vehiculo: Optional[VehiculoResponse] = None
+    empleado: Optional[EmpleadoResponse] = None
+    pagos: Optional[List[PagoResponse]] = None
+    total_pagado: Optional[float] = None
+
+
 class RespuestaAPI(BaseModel):
     mensaje: str
     exito: bool = True
     datos: Optional[Dict[str, Any]] = None
 
 
+class ErrorCarga(BaseModel):
+    fila: int
+    error: str
+
+
+class ResultadoCargaMasiva(BaseModel):
+    insertados: int
+    errores: List[ErrorCarga] = []
+
+
 class RespuestaError(BaseModel):
     mensaje: str
     exito: bool = False
@@ -0,0 +1,4 @@
+from .consultas import EstadisticasConsultas, contar_consultas
+from .lentas import consultas_lentas, limpiar_consultas_lentas, registrar_si_lenta
+from .middleware import MiddlewareConsultas, MiddlewareMetricas
+from .metricas import generar_metricas, registrar_cache
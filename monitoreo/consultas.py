@@ -0,0 +1,100 @@
+"""
+Conteo de consultas SQL por petición
+
+Los eventos before/after_cursor_execute de todos los motores anotan cada
+sentencia en los recolectores activos del contexto actual (una variable de
+contexto, así que cada petición y cada prueba ven solo sus propias consultas).
+El middleware abre un recolector por petición y las pruebas pueden abrir el
+suyo con ``contar_consultas`` para comprobar el presupuesto de un endpoint.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CLAVE_INICIO = "monitoreo_inicio_consulta"
+
+_recolectores: ContextVar[Tuple["EstadisticasConsultas", ...]] = ContextVar(
+    "recolectores_consultas", default=()
+)
+
+
+class EstadisticasConsultas:
+    """Consultas ejecutadas, tiempo acumulado en la base y sentencias repetidas"""
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_ms = 0.0
+        self.sentencias: Counter = Counter()
+        # (duración en ms, sentencia, parámetros, executemany) de la más lenta
+        self.mas_lenta: Optional[tuple] = None
+
+    def registrar(
+        self,
+        sentencia: str,
+        duracion_ms: float,
+        parametros=None,
+        executemany: bool = False,
+    ) -> None:
+        self.consultas += 1
+        self.tiempo_ms += duracion_ms
+        self.sentencias[sentencia] += 1
+        if self.mas_lenta is None or duracion_ms > self.mas_lenta[0]:
+            self.mas_lenta = (duracion_ms, sentencia, parametros, executemany)
+
+    def repetidas(self, umbral: int) -> List[Tuple[str, int]]:
+        """Sentencias idénticas ejecutadas al menos ``umbral`` veces (posible N+1)"""
+        return [
+            (sentencia, veces)
+            for sentencia, veces in self.sentencias.most_common()
+            if veces >= umbral
+        ]
+
+
+@contextmanager
+def contar_consultas(
+    maximo: Optional[int] = None,
+) -> Iterator[EstadisticasConsultas]:
+    """
+    Contar las consultas ejecutadas dentro del bloque
+
+    Args:
+        maximo: Si se indica, falla con AssertionError cuando el bloque
+            ejecuta más consultas
+
+    Ejemplo:
+        with contar_consultas(maximo=2) as stats:
+            client.get("/Contratos/?expand=pagos")
+    """
+    estadisticas = EstadisticasConsultas()
+    token = _recolectores.set(_recolectores.get() + (estadisticas,))
+    try:
+        yield estadisticas
+    finally:
+        _recolectores.reset(token)
+    if maximo is not None and estadisticas.consultas > maximo:
+        raise AssertionError(
+            f"Se ejecutaron {estadisticas.consultas} consultas (máximo {maximo})"
+        )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    if _recolectores.get():
+        conn.info.setdefault(CLAVE_INICIO, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    recolectores = _recolectores.get()
+    inicios = conn.info.get(CLAVE_INICIO)
+    if not recolectores or not inicios:
+        return
+    duracion_ms = (time.perf_counter() - inicios.pop()) * 1000
+    for estadisticas in recolectores:
+        estadisticas.registrar(statement, duracion_ms, parameters, executemany)
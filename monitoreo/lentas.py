@@ -0,0 +1,155 @@
+"""
+Registro de operaciones CRUD lentas con su plan de ejecución
+
+Cuando una operación supera CONSULTA_LENTA_MS se registra la sentencia más
+lenta que ejecutó, con sus parámetros, y se pide su plan a la base en una
+tarea aparte (EXPLAIN sin ANALYZE, así que no vuelve a ejecutarla). Los
+registros se guardan en un buffer circular en memoria de cada worker.
+
+Los parámetros registrados se censuran: todos si la sentencia toca una
+columna de credenciales (password_hash, tokens, secretos) y, en cualquier
+sentencia, los valores con forma de hash o token. El EXPLAIN sí usa los
+parámetros reales, que nunca salen del proceso.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from collections import deque
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .consultas import EstadisticasConsultas
+
+logger = logging.getLogger("monitoreo.lentas")
+
+UMBRAL_LENTA_MS = float(os.getenv("CONSULTA_LENTA_MS", "200"))
+
+# Longitud máxima de cada parámetro guardado (evita volcar textos enormes)
+LARGO_MAXIMO_PARAMETRO = 200
+
+CENSURADO = "<censurado>"
+
+# Columnas cuyas sentencias no registran ningún parámetro
+COLUMNAS_SENSIBLES = re.compile(r"password|contrasena|hash|token|secret", re.I)
+
+# Valores con forma de credencial: hashes bcrypt/argon2/pbkdf2, JWT y cadenas
+# largas hexadecimales o base64
+VALOR_SENSIBLE = re.compile(
+    r"^(\$(2[abxy]?|argon2\w*|pbkdf2[\w-]*)\$"
+    r"|eyJ[\w-]+\.[\w-]+\."
+    r"|[0-9a-fA-F]{32,}$"
+    r"|[\w+/=-]{40,}$)"
+)
+
+_registros: deque = deque(maxlen=int(os.getenv("CONSULTAS_LENTAS_MAX", "100")))
+
+# Referencias a las tareas de EXPLAIN en curso para que no se recolecten
+_tareas: set = set()
+
+
+def _parametro_legible(valor) -> str:
+    if isinstance(valor, (str, bytes)) and VALOR_SENSIBLE.match(
+        valor if isinstance(valor, str) else valor.decode("latin-1")
+    ):
+        return CENSURADO
+    return repr(valor)[:LARGO_MAXIMO_PARAMETRO]
+
+
+def _parametros_legibles(sentencia: str, parametros) -> Optional[list]:
+    """Parámetros como texto acotado y censurado, aptos para JSON"""
+    if parametros is None:
+        return None
+    todos = COLUMNAS_SENSIBLES.search(sentencia) is not None
+    if isinstance(parametros, dict):
+        return [
+            f"{clave}={CENSURADO if todos else _parametro_legible(valor)}"
+            for clave, valor in parametros.items()
+        ]
+    return [CENSURADO if todos else _parametro_legible(valor) for valor in parametros]
+
+
+def _prefijo_explain(dialecto: str) -> Optional[str]:
+    if dialecto == "postgresql":
+        return "EXPLAIN (ANALYZE off, FORMAT JSON) "
+    if dialecto == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    return None
+
+
+async def _capturar_plan(
+    motor: AsyncEngine, registro: dict, sentencia: str, parametros
+) -> None:
+    """Pedir el plan de la sentencia en una conexión propia y guardarlo"""
+    prefijo = _prefijo_explain(motor.dialect.name)
+    if prefijo is None:
+        return
+    try:
+        async with motor.connect() as conexion:
+            resultado = await conexion.exec_driver_sql(
+                prefijo + sentencia, parametros if parametros is not None else ()
+            )
+            filas = resultado.all()
+        if motor.dialect.name == "postgresql":
+            plan = filas[0][0]
+            registro["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+        else:
+            registro["plan"] = [list(fila) for fila in filas]
+    except Exception as e:
+        registro["plan_error"] = str(e)
+
+
+def registrar_si_lenta(
+    operacion: str,
+    duracion_ms: float,
+    estadisticas: EstadisticasConsultas,
+    motor: Optional[AsyncEngine] = None,
+) -> None:
+    """
+    Registrar la operación si superó el umbral y programar su EXPLAIN
+
+    Args:
+        operacion: Nombre de la operación (Clase.metodo)
+        duracion_ms: Duración total de la operación
+        estadisticas: Consultas ejecutadas durante la operación
+        motor: Motor asíncrono sobre el que se pide el plan
+    """
+    if duracion_ms < UMBRAL_LENTA_MS or estadisticas.mas_lenta is None:
+        return
+    duracion_sentencia, sentencia, parametros, executemany = estadisticas.mas_lenta
+    registro = {
+        "fecha": datetime.now().isoformat(),
+        "operacion": operacion,
+        "duracion_ms": round(duracion_ms, 2),
+        "consultas": estadisticas.consultas,
+        "sentencia": " ".join(sentencia.split()),
+        "duracion_sentencia_ms": round(duracion_sentencia, 2),
+        "parametros": (
+            None if executemany else _parametros_legibles(sentencia, parametros)
+        ),
+        "plan": None,
+    }
+    _registros.append(registro)
+    logger.warning(json.dumps(registro, ensure_ascii=False))
+
+    # Las sentencias masivas no tienen un único juego de parámetros que explicar
+    if motor is not None and not executemany:
+        tarea = asyncio.get_running_loop().create_task(
+            _capturar_plan(motor, registro, sentencia, parametros)
+        )
+        _tareas.add(tarea)
+        tarea.add_done_callback(_tareas.discard)
+
+
+def consultas_lentas() -> List[dict]:
+    """Registros del buffer, del más reciente al más antiguo"""
+    return list(reversed(_registros))
+
+
+def limpiar_consultas_lentas() -> None:
+    """Vaciar el buffer"""
+    _registros.clear()
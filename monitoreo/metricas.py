@@ -0,0 +1,122 @@
+"""
+Métricas de Prometheus de la API
+
+Todas las métricas se declaran aquí y se actualizan en el punto donde ocurre
+el evento (middleware, pool de conexiones, cachés, hash de contraseñas). Con
+la variable PROMETHEUS_MULTIPROC_DIR definida, prometheus_client guarda los
+valores en ficheros mmap por proceso y ``/metrics`` los agrega entre todos
+los workers; el directorio debe vaciarse antes de arrancar el servidor.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+PETICIONES = Counter(
+    "http_peticiones_total",
+    "Peticiones HTTP atendidas",
+    ["router", "metodo", "ruta", "estado"],
+)
+LATENCIA = Histogram(
+    "http_latencia_segundos",
+    "Latencia de las peticiones HTTP",
+    ["router", "metodo", "ruta"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+EN_CURSO = Gauge(
+    "http_peticiones_en_curso",
+    "Peticiones HTTP en curso",
+    multiprocess_mode="livesum",
+)
+
+POOL_EN_USO = Gauge(
+    "db_pool_conexiones_en_uso",
+    "Conexiones prestadas por el pool",
+    ["motor"],
+    multiprocess_mode="livesum",
+)
+POOL_DESBORDE = Gauge(
+    "db_pool_desborde",
+    "Conexiones abiertas por encima de pool_size (negativo si aún no se llenó)",
+    ["motor"],
+    multiprocess_mode="livesum",
+)
+POOL_ESPERA = Histogram(
+    "db_pool_espera_segundos",
+    "Tiempo de espera para obtener una conexión del pool",
+    ["motor"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+CACHE_CONSULTAS = Counter(
+    "cache_consultas_total",
+    "Lecturas de las cachés en memoria por resultado (hit/miss)",
+    ["cache", "resultado"],
+)
+
+HASH_PASSWORD = Histogram(
+    "hash_password_segundos",
+    "Tiempo de bcrypt en el pool de procesos, incluida la espera en cola",
+    ["operacion"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+def registrar_cache(cache: str, acierto: bool) -> None:
+    """Contar una lectura de caché como hit o miss"""
+    CACHE_CONSULTAS.labels(cache, "hit" if acierto else "miss").inc()
+
+
+class _PoolMedido:
+    """
+    Pool que publica conexiones en uso, desborde y tiempo de espera
+
+    El nombre del motor se toma de ``pool_logging_name``.
+    """
+
+    def _actualizar(self) -> None:
+        motor = self.logging_name or "principal"
+        POOL_EN_USO.labels(motor).set(self.checkedout())
+        POOL_DESBORDE.labels(motor).set(self.overflow())
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        conexion = super()._do_get()
+        POOL_ESPERA.labels(self.logging_name or "principal").observe(
+            time.perf_counter() - inicio
+        )
+        self._actualizar()
+        return conexion
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._actualizar()
+
+
+class QueuePoolMedido(_PoolMedido, QueuePool):
+    pass
+
+
+class AsyncQueuePoolMedido(_PoolMedido, AsyncAdaptedQueuePool):
+    pass
+
+
+def generar_metricas() -> tuple:
+    """Texto de exposición y content type, agregando workers si procede"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return generate_latest(registro), CONTENT_TYPE_LATEST
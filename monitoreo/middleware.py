@@ -0,0 +1,141 @@
+"""
+Middleware ASGI que publica el conteo de consultas de cada petición
+"""
+
+import json
+import logging
+import os
+import time
+
+from starlette.datastructures import MutableHeaders
+
+from .consultas import EstadisticasConsultas, _recolectores
+from .metricas import EN_CURSO, LATENCIA, PETICIONES
+
+logger = logging.getLogger("monitoreo.consultas")
+
+# Veces que puede repetirse la misma sentencia en una petición antes de avisar
+UMBRAL_REPETICIONES = int(os.getenv("CONSULTAS_REPETIDAS_UMBRAL", "5"))
+
+
+def _nombre_ruta(scope) -> str:
+    """Plantilla de la ruta resuelta por el router, o la ruta literal"""
+    ruta = scope.get("route")
+    return getattr(ruta, "path", None) or scope.get("path", "")
+
+
+def _router_y_ruta(scope) -> tuple:
+    """
+    Router (primera etiqueta de la ruta) y plantilla para etiquetar métricas
+
+    Las peticiones que no resuelven ninguna ruta se agrupan en una sola serie
+    para no crear una por cada URL desconocida.
+    """
+    ruta = scope.get("route")
+    if ruta is None:
+        return "", "sin_ruta"
+    etiquetas = getattr(ruta, "tags", None)
+    return (str(etiquetas[0]) if etiquetas else ""), ruta.path
+
+
+class MiddlewareConsultas:
+    """
+    Cuenta las consultas SQL y el tiempo de base de datos de cada petición
+
+    Añade las cabeceras ``X-DB-Queries`` y ``Server-Timing`` a la respuesta,
+    escribe una línea JSON por petición en el logger ``monitoreo.consultas`` y
+    avisa cuando una misma sentencia se repite ``umbral`` veces o más (el
+    patrón típico de un N+1). Es ASGI puro para no almacenar el cuerpo de las
+    respuestas en streaming.
+    """
+
+    def __init__(self, app, umbral: int = UMBRAL_REPETICIONES):
+        self.app = app
+        self.umbral = umbral
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estadisticas = EstadisticasConsultas()
+        token = _recolectores.set(_recolectores.get() + (estadisticas,))
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                cabeceras = MutableHeaders(scope=mensaje)
+                cabeceras["X-DB-Queries"] = str(estadisticas.consultas)
+                cabeceras.append(
+                    "Server-Timing",
+                    f'db;dur={estadisticas.tiempo_ms:.1f};desc="{estadisticas.consultas} consultas"',
+                )
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _recolectores.reset(token)
+            self._registrar(scope, estadisticas)
+
+    def _registrar(self, scope, estadisticas: EstadisticasConsultas) -> None:
+        ruta = _nombre_ruta(scope)
+        logger.info(
+            json.dumps(
+                {
+                    "metodo": scope["method"],
+                    "ruta": ruta,
+                    "consultas": estadisticas.consultas,
+                    "tiempo_db_ms": round(estadisticas.tiempo_ms, 2),
+                }
+            )
+        )
+        for sentencia, veces in estadisticas.repetidas(self.umbral):
+            logger.warning(
+                json.dumps(
+                    {
+                        "evento": "posible_n_mas_1",
+                        "metodo": scope["method"],
+                        "ruta": ruta,
+                        "repeticiones": veces,
+                        "sentencia": " ".join(sentencia.split()),
+                    },
+                    ensure_ascii=False,
+                )
+            )
+
+
+class MiddlewareMetricas:
+    """
+    Peticiones, latencia y peticiones en curso por router y plantilla de ruta
+
+    ASGI puro: la latencia se mide hasta el último fragmento del cuerpo, de
+    modo que las exportaciones en streaming cuentan su duración completa.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estado = 500
+        inicio = time.perf_counter()
+
+        async def enviar(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        EN_CURSO.inc()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            EN_CURSO.dec()
+            router, ruta = _router_y_ruta(scope)
+            LATENCIA.labels(router, scope["method"], ruta).observe(
+                time.perf_counter() - inicio
+            )
+            PETICIONES.labels(router, scope["method"], ruta, str(estado)).inc()
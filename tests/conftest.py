@@ -0,0 +1,130 @@
+"""
+Fixtures de las pruebas
+
+Las pruebas corren contra SQLite embebido en memoria (DB_BACKEND=sqlite sin
+DATABASE_URL), así que no necesitan un servidor de base de datos. La
+aplicación se levanta una vez por sesión con su startup/shutdown.
+"""
+
+import itertools
+import os
+import uuid
+from datetime import datetime, timedelta
+
+# Antes de importar la aplicación: base en memoria y sin réplica de lectura
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["DATABASE_URL"] = ""
+os.environ["DATABASE_READ_URL"] = ""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from auth.security import hash_password
+from database.config import SessionLocal
+from entities.cliente import Cliente
+from entities.contrato import Contrato
+from entities.empleado import Empleado
+from entities.pago import Pago
+from entities.tipoVehiculo import TipoVehiculo
+from entities.usuario import RolEnum, Usuario
+from entities.vehiculo import Vehiculo
+
+CONTRASENA = "secreto123"
+
+_secuencia = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from main import app
+
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+@pytest.fixture(scope="session")
+def admin(client) -> Usuario:
+    """Usuario administrador creado directamente en la base"""
+    db = SessionLocal()
+    try:
+        usuario = Usuario(
+            username="admin_pruebas",
+            password_hash=hash_password(CONTRASENA),
+            rol=RolEnum.admin,
+            estado=True,
+        )
+        db.add(usuario)
+        db.commit()
+        db.refresh(usuario)
+        db.expunge(usuario)
+        return usuario
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def crear_datos(admin):
+    """
+    Fábrica de datos relacionados
+
+    ``crear_datos(n)`` inserta n clientes, empleados, vehículos y contratos
+    (uno activo por vehículo) con dos pagos cada uno, y devuelve los ids del
+    último registro de cada tabla para armar rutas de detalle.
+    """
+
+    def crear(cantidad: int) -> dict:
+        db = SessionLocal()
+        try:
+            lote = next(_secuencia)
+            creador = {"id_usuario_creacion": admin.id}
+            tipo = TipoVehiculo(nombre=f"TIPO {lote}", **creador)
+            db.add(tipo)
+            ultimos = {"tipo": tipo}
+            for i in range(cantidad):
+                sufijo = f"{lote}_{i}"
+                cliente = Cliente(
+                    nombre=f"Cliente {sufijo}",
+                    email=f"cliente{sufijo}@pruebas.example.com",
+                    **creador,
+                )
+                empleado = Empleado(
+                    nombre=f"Empleado {sufijo}",
+                    email=f"empleado{sufijo}@pruebas.example.com",
+                    **creador,
+                )
+                vehiculo = Vehiculo(
+                    marca="MAZDA",
+                    modelo="3",
+                    placa=f"P{uuid.uuid4().hex[:8].upper()}",
+                    tipo_vehiculo=tipo,
+                    disponible=False,
+                    **creador,
+                )
+                contrato = Contrato(
+                    cliente=cliente,
+                    vehiculo=vehiculo,
+                    empleado=empleado,
+                    fecha_inicio=datetime.now() - timedelta(days=i),
+                    activo=True,
+                    **creador,
+                )
+                pagos = [
+                    Pago(contrato=contrato, monto=100.0, **creador) for _ in range(2)
+                ]
+                db.add_all([cliente, empleado, vehiculo, contrato, *pagos])
+                ultimos.update(
+                    cliente=cliente,
+                    empleado=empleado,
+                    vehiculo=vehiculo,
+                    contrato=contrato,
+                    pago=pagos[-1],
+                )
+            db.flush()
+            ids = {clave: registro.id for clave, registro in ultimos.items()}
+            ids.update(usuario=admin.id, email=ultimos["cliente"].email)
+            db.commit()
+            return ids
+        finally:
+            db.close()
+
+    return crear
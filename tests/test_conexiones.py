@@ -0,0 +1,37 @@
+"""
+Reintento ante conexiones caídas (los pools no hacen pre-ping por defecto)
+"""
+
+import asyncio
+
+import pytest
+
+from database.config import POOL_PRE_PING, async_engine, engine, read_async_engine
+
+
+def _cerrar_conexion_del_pool() -> None:
+    """Cerrar por debajo la conexión que el pool prestará a continuación"""
+
+    async def cerrar():
+        async with async_engine.connect() as conexion:
+            crudo = (await conexion.get_raw_connection()).driver_connection
+        # Ya devuelta al pool, como una conexión que el servidor cortó
+        await crudo.close()
+
+    asyncio.run(cerrar())
+
+
+@pytest.mark.parametrize(
+    "ruta", ["/Clientes/", "/Pagos/export", "/Contratos/export?formato=csv"]
+)
+def test_conexion_caida_se_reintenta(client, crear_datos, ruta):
+    crear_datos(2)
+    _cerrar_conexion_del_pool()
+    respuesta = client.get(ruta)
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.content
+
+
+def test_todos_los_motores_siguen_db_pool_pre_ping():
+    for motor in (engine, async_engine.sync_engine, read_async_engine.sync_engine):
+        assert motor.pool._pre_ping is POOL_PRE_PING
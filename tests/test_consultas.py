@@ -0,0 +1,157 @@
+"""
+Presupuesto de consultas SQL por endpoint
+
+Cada GET de listado o detalle debe ejecutar un número fijo de consultas,
+sin importar cuántas filas haya (un número que crece con los datos delata un
+N+1), y cada alta o modificación, un número fijo por petición. Se mide con la
+cabecera X-DB-Queries del middleware de monitoreo.
+"""
+
+import uuid
+
+import pytest
+
+from crud.catalogoCache import tipos_vehiculo_cache
+from database.config import SessionLocal
+from entities.vehiculo import Vehiculo
+from models import ContratoExpandido
+
+HASTA = "2100-01-08T00:00:00"
+
+# Ruta (con marcadores para los ids de crear_datos) y consultas esperadas
+PRESUPUESTO = [
+    ("/Clientes/", 1),
+    ("/Clientes/{cliente}", 1),
+    ("/Clientes/email/{email}", 1),
+    ("/Empleados/", 1),
+    ("/Empleados/{empleado}", 1),
+    ("/Vehiculos/", 1),
+    ("/Vehiculos/{vehiculo}", 1),
+    (f"/Vehiculos/disponibles?desde=2100-01-01T00:00:00&hasta={HASTA}", 1),
+    ("/Contratos/", 1),
+    ("/Contratos/?solo_activos=true", 1),
+    ("/Contratos/{contrato}", 1),
+    ("/Contratos/?expand=cliente,vehiculo,pagos", 2),
+    ("/Contratos/{contrato}?expand=cliente,vehiculo,pagos", 2),
+    ("/Pagos/", 1),
+    ("/Pagos/?contrato_id={contrato}", 1),
+    ("/Pagos/{pago}", 1),
+    ("/Usuarios/", 1),
+    ("/Usuarios/{usuario}", 1),
+    ("/Tipos-de-Vehiculos/", 2),
+    ("/Tipos-de-Vehiculos/{tipo}", 2),
+    ("/dashboard/counts", 1),
+]
+
+
+# Escrituras: método, ruta y consultas esperadas. Incluyen las lecturas de
+# validación, el INSERT o UPDATE y, en las que mueven contadores, el UPDATE de
+# contadores previo al commit; el catálogo de tipos se recarga en cada una
+PRESUPUESTO_ESCRITURAS = [
+    ("post", "/Clientes/", 3),
+    ("put", "/Clientes/{cliente}", 2),
+    ("post", "/Empleados/", 2),
+    ("put", "/Empleados/{empleado}", 2),
+    ("post", "/Vehiculos/", 5),
+    ("put", "/Vehiculos/{vehiculo}", 3),
+    ("post", "/Contratos/", 3),
+    ("put", "/Contratos/{contrato}", 5),
+    ("post", "/Pagos/", 2),
+    ("put", "/Pagos/{pago}", 3),
+    ("post", "/Usuarios/", 2),
+    ("put", "/Usuarios/{usuario}", 4),
+    ("post", "/Tipos-de-Vehiculos/", 4),
+    ("put", "/Tipos-de-Vehiculos/{tipo}", 5),
+]
+
+
+def consultas(client, ruta: str) -> int:
+    # El catálogo de tipos se sirve de memoria: forzar la recarga para que
+    # cada petición mida lo mismo
+    tipos_vehiculo_cache.invalidar()
+    respuesta = client.get(ruta)
+    assert respuesta.status_code == 200, respuesta.text
+    return int(respuesta.headers["X-DB-Queries"])
+
+
+@pytest.mark.parametrize("ruta, esperadas", PRESUPUESTO)
+def test_consultas_no_dependen_de_las_filas(client, crear_datos, ruta, esperadas):
+    pocas = consultas(client, ruta.format(**crear_datos(2)))
+    muchas = consultas(client, ruta.format(**crear_datos(20)))
+    assert pocas == muchas == esperadas
+
+
+def test_expand_anida_las_relaciones(client, crear_datos):
+    ids = crear_datos(3)
+    respuesta = client.get(
+        f"/Contratos/{ids['contrato']}?expand=cliente,vehiculo,pagos"
+    )
+    contrato = ContratoExpandido.model_validate(respuesta.json())
+    assert str(contrato.cliente.id) == str(ids["cliente"])
+    assert str(contrato.vehiculo.id) == str(ids["vehiculo"])
+    assert len(contrato.pagos) == 2
+    assert contrato.total_pagado == 200.0
+    assert contrato.empleado is None
+
+
+def _vehiculo_libre(ids: dict) -> str:
+    db = SessionLocal()
+    try:
+        vehiculo = Vehiculo(
+            marca="Kia",
+            modelo="Rio",
+            placa=f"L{uuid.uuid4().hex[:8].upper()}",
+            tipo_id=ids["tipo"],
+            id_usuario_creacion=ids["usuario"],
+        )
+        db.add(vehiculo)
+        db.commit()
+        return str(vehiculo.id)
+    finally:
+        db.close()
+
+
+def _cuerpo(metodo: str, ruta: str, ids: dict) -> dict:
+    """Cuerpo válido de la escritura, con valores únicos donde hace falta"""
+    unico = uuid.uuid4().hex[:8]
+    if metodo == "put":
+        cambios = {
+            "Clientes": {"telefono": "3001234567"},
+            "Empleados": {"rol": "Gerente"},
+            "Vehiculos": {"disponible": True},
+            "Contratos": {"activo": False},
+            "Pagos": {"monto": 250.0},
+            "Usuarios": {"rol": "admin"},
+            "Tipos-de-Vehiculos": {"descripcion": "Editado"},
+        }[ruta.split("/")[1]]
+        return {**cambios, "id_usuario_edicion": str(ids["usuario"])}
+    cuerpos = {
+        "/Clientes/": {"nombre": "Nuevo", "email": f"c{unico}@pruebas.example.com"},
+        "/Empleados/": {"nombre": "Nuevo", "email": f"e{unico}@pruebas.example.com"},
+        "/Vehiculos/": {
+            "marca": "Kia",
+            "modelo": "Rio",
+            "placa": f"N{unico.upper()}",
+            "tipo_id": str(ids["tipo"]),
+        },
+        "/Contratos/": {
+            "cliente_id": str(ids["cliente"]),
+            "vehiculo_id": _vehiculo_libre(ids),
+            "empleado_id": str(ids["empleado"]),
+            "fecha_inicio": "2100-01-01T00:00:00",
+        },
+        "/Pagos/": {"contrato_id": str(ids["contrato"]), "monto": 120.0},
+        "/Usuarios/": {"username": f"u{unico}", "password": "secreto123"},
+        "/Tipos-de-Vehiculos/": {"nombre": f"TIPO {unico}"},
+    }
+    return {**cuerpos[ruta], "id_usuario_creacion": str(ids["usuario"])}
+
+
+@pytest.mark.parametrize("metodo, ruta, esperadas", PRESUPUESTO_ESCRITURAS)
+def test_consultas_por_escritura(client, crear_datos, metodo, ruta, esperadas):
+    ids = crear_datos(2)
+    cuerpo = _cuerpo(metodo, ruta, ids)
+    tipos_vehiculo_cache.invalidar()
+    respuesta = getattr(client, metodo)(ruta.format(**ids), json=cuerpo)
+    assert respuesta.status_code in (200, 201), respuesta.text
+    assert int(respuesta.headers["X-DB-Queries"]) == esperadas
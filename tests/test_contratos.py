@@ -0,0 +1,103 @@
+"""
+Reserva de vehículos al crear contratos
+"""
+
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+import database.config
+from database.config import Base
+from entities.cliente import Cliente
+from entities.contrato import Contrato
+from entities.empleado import Empleado
+from entities.tipoVehiculo import TipoVehiculo
+from entities.usuario import RolEnum, Usuario
+from entities.vehiculo import Vehiculo
+
+PETICIONES = 50
+
+
+@pytest.fixture
+def base_concurrente(tmp_path, monkeypatch):
+    """
+    Escrituras sobre una base SQLite en archivo con varias conexiones
+
+    La base en memoria de las pruebas usa una sola conexión y serializa las
+    transacciones completas, así que ahí dos reservas nunca se solapan.
+    Devuelve el motor síncrono y el cuerpo de un contrato sobre un vehículo
+    disponible.
+    """
+    url = f"sqlite:///{tmp_path / 'concurrente.db'}"
+    motor = create_engine(url)
+    Base.metadata.create_all(motor)
+    with Session(motor) as db:
+        usuario = Usuario(
+            username="reservas", password_hash="-", rol=RolEnum.admin, estado=True
+        )
+        db.add(usuario)
+        db.flush()
+        creador = {"id_usuario_creacion": usuario.id}
+        tipo = TipoVehiculo(nombre="RESERVAS", **creador)
+        cliente = Cliente(nombre="C", email="c@pruebas.example.com", **creador)
+        empleado = Empleado(nombre="E", email="e@pruebas.example.com", **creador)
+        vehiculo = Vehiculo(
+            marca="KIA",
+            modelo="RIO",
+            placa="RES001",
+            tipo_vehiculo=tipo,
+            disponible=True,
+            **creador,
+        )
+        db.add_all([tipo, cliente, empleado, vehiculo])
+        db.commit()
+        cuerpo = {
+            "cliente_id": str(cliente.id),
+            "vehiculo_id": str(vehiculo.id),
+            "empleado_id": str(empleado.id),
+            "id_usuario_creacion": str(usuario.id),
+            "fecha_inicio": datetime.now().isoformat(),
+        }
+
+    motor_async = create_async_engine(
+        url.replace("sqlite", "sqlite+aiosqlite"), connect_args={"timeout": 30}
+    )
+    monkeypatch.setattr(
+        database.config,
+        "AsyncSessionLocal",
+        async_sessionmaker(bind=motor_async, autoflush=False, expire_on_commit=False),
+    )
+    yield motor, cuerpo
+    asyncio.run(motor_async.dispose())
+    motor.dispose()
+
+
+def test_reservas_simultaneas_de_un_vehiculo(client, base_concurrente):
+    motor, cuerpo = base_concurrente
+
+    # El TestClient atiende cada hilo en el mismo event loop de la aplicación,
+    # así que las peticiones se intercalan como las de clientes reales
+    with ThreadPoolExecutor(max_workers=PETICIONES) as hilos:
+        respuestas = list(
+            hilos.map(
+                lambda _: client.post("/Contratos/", json=cuerpo), range(PETICIONES)
+            )
+        )
+
+    codigos = sorted(r.status_code for r in respuestas)
+    assert codigos == [201] + [400] * (PETICIONES - 1)
+    vehiculo_id = uuid.UUID(cuerpo["vehiculo_id"])
+    with Session(motor) as db:
+        activos = db.scalar(
+            select(func.count())
+            .select_from(Contrato)
+            .where(Contrato.vehiculo_id == vehiculo_id, Contrato.activo.is_(True))
+        )
+        assert activos == 1
+        assert db.get(Vehiculo, vehiculo_id).disponible is False
@@ -0,0 +1,36 @@
+"""
+Censura de parámetros en el registro de consultas lentas
+"""
+
+from auth.security import hash_password
+from monitoreo.consultas import EstadisticasConsultas
+from monitoreo.lentas import (
+    CENSURADO,
+    consultas_lentas,
+    limpiar_consultas_lentas,
+    registrar_si_lenta,
+)
+
+
+def _registrar(sentencia: str, parametros) -> list:
+    limpiar_consultas_lentas()
+    estadisticas = EstadisticasConsultas()
+    estadisticas.registrar(sentencia, 1000.0, parametros)
+    registrar_si_lenta("Prueba.operacion", 1000.0, estadisticas)
+    return consultas_lentas()[0]["parametros"]
+
+
+def test_sentencia_con_credenciales_no_registra_parametros():
+    parametros = _registrar(
+        "UPDATE usuarios SET password_hash=? WHERE usuarios.id = ?",
+        (hash_password("secreto123"), "a1b2"),
+    )
+    assert parametros == [CENSURADO, CENSURADO]
+
+
+def test_valores_con_forma_de_hash_se_censuran():
+    parametros = _registrar(
+        "SELECT * FROM clientes WHERE nombre = %(nombre)s AND nota = %(nota)s",
+        {"nombre": "Ana", "nota": hash_password("otra")},
+    )
+    assert parametros == ["nombre='Ana'", f"nota={CENSURADO}"]
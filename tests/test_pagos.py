@@ -0,0 +1,86 @@
+"""
+Carga masiva de pagos
+"""
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from crud.pagoCRUD import PagoCRUD
+from database.config import SessionLocal
+
+
+def test_carga_masiva_errores_por_fila(client, crear_datos):
+    ids = crear_datos(1)
+    contrato = str(ids["contrato"])
+    con_zona = datetime(2100, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=-5)))
+    filas = [
+        {"contrato_id": contrato, "monto": 150.5},
+        {"contrato_id": contrato, "monto": True},
+        {"contrato_id": contrato, "monto": float("nan")},
+        {"contrato_id": contrato, "monto": "inf"},
+        {"contrato_id": contrato, "monto": 0},
+        {"contrato_id": contrato, "monto": "diez"},
+        {"contrato_id": "no-es-uuid", "monto": 10},
+        {"contrato_id": str(uuid.uuid4()), "monto": 10},
+        {"contrato_id": contrato, "monto": 10, "fecha_pago": "ayer"},
+        {"contrato_id": contrato, "monto": 20, "fecha_pago": con_zona.isoformat()},
+    ]
+
+    # json.dumps escribe NaN, que json.loads acepta
+    respuesta = client.post(
+        "/Pagos/bulk",
+        params={"id_usuario_creacion": str(ids["usuario"])},
+        content=json.dumps(filas),
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert respuesta.status_code == 200, respuesta.text
+    resultado = respuesta.json()
+    assert resultado["insertados"] == 2
+    assert {error["fila"]: error["error"] for error in resultado["errores"]} == {
+        2: "El monto del pago no es un número válido",
+        3: "El monto del pago debe ser un número finito",
+        4: "El monto del pago debe ser un número finito",
+        5: "El monto del pago debe ser mayor que 0",
+        6: "El monto del pago no es un número válido",
+        7: "El contrato no es un UUID válido",
+        8: "El contrato no existe",
+        9: "La fecha de pago no es válida",
+    }
+
+    db = SessionLocal()
+    try:
+        pagos = PagoCRUD(db).obtener_pagos(contrato_id=ids["contrato"])
+        fechas = {pago.monto: pago.fecha_pago for pago in pagos}
+    finally:
+        db.close()
+    assert fechas[20.0] == con_zona.astimezone().replace(tzinfo=None)
+
+
+def test_carga_masiva_csv(client, crear_datos):
+    ids = crear_datos(1)
+    csv = f"contrato_id,monto,fecha_pago\n{ids['contrato']},75,\n"
+
+    respuesta = client.post(
+        "/Pagos/bulk",
+        params={"id_usuario_creacion": str(ids["usuario"])},
+        content=csv,
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.json() == {"insertados": 1, "errores": []}
+
+
+def test_carga_masiva_usuario_inexistente(client, crear_datos):
+    ids = crear_datos(1)
+
+    respuesta = client.post(
+        "/Pagos/bulk",
+        params={"id_usuario_creacion": str(uuid.uuid4())},
+        json=[{"contrato_id": str(ids["contrato"]), "monto": 10}],
+    )
+
+    assert respuesta.status_code == 400
+    assert respuesta.json()["detail"] == "El usuario de creación no existe"
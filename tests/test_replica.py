@@ -0,0 +1,132 @@
+"""
+Lecturas en la réplica y fijación a la primaria tras una escritura
+
+La réplica es una segunda base SQLite en archivo con un cliente que la
+primaria no tiene: un 200 o un 404 al pedirlo indica a qué base fue la
+lectura.
+"""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import database.config
+from database.config import Base, SessionLocal
+from database.lectura import CABECERA_PRIMARIA, COOKIE_PRIMARIA
+from entities.cliente import Cliente
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch, admin):
+    """Id de un cliente que solo existe en la réplica"""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    motor = create_engine(url)
+    Base.metadata.create_all(motor)
+    SesionReplica = sessionmaker(bind=motor)
+    with SesionReplica() as db:
+        cliente = Cliente(
+            nombre="Solo en la réplica",
+            email="replica@pruebas.example.com",
+            id_usuario_creacion=admin.id,
+        )
+        db.add(cliente)
+        db.commit()
+        solo_en_replica = cliente.id
+    motor.dispose()
+
+    # Lo mismo que hace config con DATABASE_READ_URL: las lecturas usan una
+    # sesión sobre el motor de la réplica
+    motor_lectura = create_async_engine(url.replace("sqlite", "sqlite+aiosqlite"))
+    monkeypatch.setattr(
+        database.config,
+        "AsyncReadSessionLocal",
+        async_sessionmaker(bind=motor_lectura, autoflush=False, expire_on_commit=False),
+    )
+    yield solo_en_replica
+    asyncio.run(motor_lectura.dispose())
+
+
+def _cliente_en_primaria(admin) -> uuid.UUID:
+    db = SessionLocal()
+    try:
+        cliente = Cliente(
+            nombre="Solo en la primaria",
+            email=f"primaria{uuid.uuid4().hex[:8]}@pruebas.example.com",
+            id_usuario_creacion=admin.id,
+        )
+        db.add(cliente)
+        db.commit()
+        return cliente.id
+    finally:
+        db.close()
+
+
+def test_las_lecturas_van_a_la_replica(client, replica, admin):
+    client.cookies.clear()
+    assert client.get(f"/Clientes/{replica}").status_code == 200
+    assert client.get(f"/Clientes/{_cliente_en_primaria(admin)}").status_code == 404
+
+
+def test_tras_escribir_la_cookie_fija_las_lecturas_a_la_primaria(
+    client, replica, admin
+):
+    client.cookies.clear()
+    respuesta = client.post(
+        "/Clientes/",
+        json={
+            "nombre": "Nuevo",
+            "email": f"nuevo{uuid.uuid4().hex[:8]}@pruebas.example.com",
+            "id_usuario_creacion": str(admin.id),
+        },
+    )
+    assert respuesta.status_code == 201, respuesta.text
+    assert COOKIE_PRIMARIA in client.cookies
+    nuevo = respuesta.json()["id"]
+
+    # La siguiente lectura ve la escritura: va a la primaria, no a la réplica
+    assert client.get(f"/Clientes/{nuevo}").status_code == 200
+    assert client.get(f"/Clientes/{replica}").status_code == 404
+
+    client.cookies.clear()
+    assert client.get(f"/Clientes/{nuevo}").status_code == 404
+
+
+def test_la_cabecera_fija_a_la_primaria_sin_cookies(client, replica, admin):
+    client.cookies.clear()
+    respuesta = client.post(
+        "/Clientes/",
+        json={
+            "nombre": "Sin cookies",
+            "email": f"sincookies{uuid.uuid4().hex[:8]}@pruebas.example.com",
+            "id_usuario_creacion": str(admin.id),
+        },
+    )
+    assert respuesta.status_code == 201, respuesta.text
+    hasta = respuesta.headers[CABECERA_PRIMARIA]
+    nuevo = respuesta.json()["id"]
+    client.cookies.clear()
+
+    assert client.get(f"/Clientes/{nuevo}").status_code == 404
+    cabeceras = {CABECERA_PRIMARIA: hasta}
+    assert client.get(f"/Clientes/{nuevo}", headers=cabeceras).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "hasta",
+    ["inf", "1e12", "nan", "-inf", "no-es-un-numero", lambda: time.time() + 3600],
+)
+def test_instantes_fuera_de_la_ventana_no_fijan_a_la_primaria(client, replica, hasta):
+    client.cookies.clear()
+    valor = str(hasta() if callable(hasta) else hasta)
+
+    for cabeceras in (
+        {CABECERA_PRIMARIA: valor},
+        {"Cookie": f"{COOKIE_PRIMARIA}={valor}"},
+    ):
+        respuesta = client.get(f"/Clientes/{replica}", headers=cabeceras)
+        assert respuesta.status_code == 200
@@ -0,0 +1,83 @@
+"""
+Serialización rápida frente a response_model
+
+Con SERIALIZACION_RAPIDA cada listado y detalle debe devolver exactamente los
+mismos bytes que el camino normal de FastAPI.
+"""
+
+import uuid
+
+import pytest
+
+import Apis.utils
+from Apis.utils import serializar_rapido
+from crud.catalogoCache import tipos_vehiculo_cache
+from crud.pagoCRUD import PagoCRUD
+from database.config import SessionLocal
+from entities.vehiculo import Vehiculo
+from models import PagoResponse
+from monitoreo.consultas import contar_consultas
+
+RUTAS = [
+    "/Clientes/",
+    "/Clientes/{cliente}",
+    "/Empleados/",
+    "/Empleados/{empleado}",
+    "/Vehiculos/",
+    "/Vehiculos/{vehiculo}",
+    "/Vehiculos/disponibles?desde=2100-01-01T00:00:00&hasta=2100-01-08T00:00:00",
+    "/Contratos/",
+    "/Contratos/{contrato}",
+    "/Pagos/",
+    "/Pagos/{pago}",
+    "/Usuarios/",
+    "/Usuarios/{usuario}",
+    "/Tipos-de-Vehiculos/",
+    "/Tipos-de-Vehiculos/{tipo}",
+]
+
+
+@pytest.mark.parametrize("ruta", RUTAS)
+def test_mismos_bytes_que_response_model(client, crear_datos, monkeypatch, ruta):
+    ids = crear_datos(3)
+    # Los vehículos de crear_datos están alquilados: uno libre para que
+    # /Vehiculos/disponibles no salga vacío
+    db = SessionLocal()
+    try:
+        db.add(
+            Vehiculo(
+                marca="Kia",
+                modelo="Rio",
+                placa=f"S{uuid.uuid4().hex[:8].upper()}",
+                tipo_id=ids["tipo"],
+                id_usuario_creacion=ids["usuario"],
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+    ruta = ruta.format(**ids)
+    tipos_vehiculo_cache.invalidar()
+    cuerpos = []
+    for rapida in (False, True):
+        monkeypatch.setattr(Apis.utils, "SERIALIZACION_RAPIDA", rapida)
+        respuesta = client.get(ruta)
+        assert respuesta.status_code == 200, respuesta.text
+        cuerpos.append(respuesta.content)
+    assert cuerpos[0] not in (b"[]", b"{}")
+    assert cuerpos[0] == cuerpos[1]
+
+
+def test_atributos_expirados_usan_el_camino_normal(crear_datos):
+    ids = crear_datos(1)
+    db = SessionLocal()
+    try:
+        pago = PagoCRUD(db).obtener_pago(ids["pago"])
+        assert serializar_rapido(pago, PagoResponse) is not None
+        db.expire(pago, ["monto"])
+
+        with contar_consultas() as estadisticas:
+            assert serializar_rapido([pago], PagoResponse) is None
+        assert estadisticas.consultas == 0
+    finally:
+        db.close()
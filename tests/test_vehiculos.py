@@ -0,0 +1,217 @@
+"""
+Búsqueda de vehículos disponibles por rango de fechas y carga masiva
+"""
+
+import uuid
+from datetime import datetime
+
+from crud.vehiculoCRUD import VehiculoCRUD
+from database.config import SessionLocal
+from entities.contrato import Contrato
+from entities.tipoVehiculo import TipoVehiculo
+from entities.vehiculo import Vehiculo
+
+DESDE = datetime(2100, 3, 10)
+HASTA = datetime(2100, 3, 17)
+
+
+def _disponibles(client, tipo_id, desde=DESDE, hasta=HASTA) -> set:
+    respuesta = client.get(
+        "/Vehiculos/disponibles",
+        params={
+            "desde": desde.isoformat(),
+            "hasta": hasta.isoformat(),
+            "tipo_id": str(tipo_id),
+        },
+    )
+    assert respuesta.status_code == 200, respuesta.text
+    return {vehiculo["placa"] for vehiculo in respuesta.json()}
+
+
+def test_solapamiento_en_los_bordes(client, crear_datos):
+    ids = crear_datos(1)
+    creador = {"id_usuario_creacion": ids["usuario"]}
+
+    # Placa -> contrato del vehículo (inicio, fin, activo); None sin contratos
+    casos = {
+        "LIBRE": None,
+        "TERMINA_EN_DESDE": (datetime(2100, 3, 1), DESDE, True),
+        "EMPIEZA_EN_HASTA": (HASTA, datetime(2100, 3, 20), True),
+        "ABIERTO": (datetime(2100, 3, 1), None, True),
+        "ABIERTO_DESPUES": (HASTA, None, True),
+        "DENTRO": (datetime(2100, 3, 12), datetime(2100, 3, 13), True),
+        "CUBRE": (datetime(2100, 3, 1), datetime(2100, 4, 1), True),
+        "INACTIVO": (datetime(2100, 3, 1), datetime(2100, 4, 1), False),
+    }
+    db = SessionLocal()
+    try:
+        tipo = TipoVehiculo(nombre=f"BORDES {uuid.uuid4().hex[:6]}", **creador)
+        db.add(tipo)
+        for placa, contrato in casos.items():
+            vehiculo = Vehiculo(
+                marca="KIA",
+                modelo="RIO",
+                placa=f"{placa[:4]}{uuid.uuid4().hex[:6]}".upper(),
+                tipo_vehiculo=tipo,
+                disponible=contrato is None,
+                **creador,
+            )
+            casos[placa] = (vehiculo, contrato)
+            db.add(vehiculo)
+            if contrato:
+                inicio, fin, activo = contrato
+                db.add(
+                    Contrato(
+                        cliente_id=ids["cliente"],
+                        empleado_id=ids["empleado"],
+                        vehiculo=vehiculo,
+                        fecha_inicio=inicio,
+                        fecha_fin=fin,
+                        activo=activo,
+                        **creador,
+                    )
+                )
+        db.commit()
+        tipo_id = tipo.id
+        placas = {nombre: vehiculo.placa for nombre, (vehiculo, _) in casos.items()}
+    finally:
+        db.close()
+
+    disponibles = _disponibles(client, tipo_id)
+    libres = {nombre for nombre, placa in placas.items() if placa in disponibles}
+    # [fecha_inicio, fecha_fin) es semiabierto: tocar el borde no solapa
+    assert libres == {
+        "LIBRE",
+        "TERMINA_EN_DESDE",
+        "EMPIEZA_EN_HASTA",
+        "ABIERTO_DESPUES",
+        "INACTIVO",
+    }
+
+
+def test_rango_invalido(client):
+    respuesta = client.get(
+        "/Vehiculos/disponibles",
+        params={"desde": HASTA.isoformat(), "hasta": DESDE.isoformat()},
+    )
+    assert respuesta.status_code == 400
+
+
+def _placa() -> str:
+    return f"B{uuid.uuid4().hex[:8].upper()}"
+
+
+def test_carga_masiva_json(client, crear_datos):
+    ids = crear_datos(1)
+    existente = client.get(f"/Vehiculos/{ids['vehiculo']}").json()["placa"]
+    repetida = _placa()
+    base = {"marca": "kia", "modelo": "rio", "tipo_id": str(ids["tipo"])}
+    filas = [
+        {**base, "placa": _placa().lower()},
+        {**base, "placa": None},
+        {**base, "placa": repetida},
+        {**base, "placa": repetida},
+        {**base, "placa": existente},
+        {**base, "placa": _placa(), "tipo_id": str(uuid.uuid4())},
+        {**base, "placa": _placa(), "tipo_id": "no-es-uuid"},
+        {**base, "placa": _placa(), "disponible": False},
+    ]
+
+    respuesta = client.post(
+        "/Vehiculos/bulk",
+        params={"id_usuario_creacion": str(ids["usuario"])},
+        json=filas,
+    )
+
+    assert respuesta.status_code == 200, respuesta.text
+    resultado = respuesta.json()
+    assert resultado["insertados"] == 3
+    assert {error["fila"]: error["error"] for error in resultado["errores"]} == {
+        2: "La placa del vehículo es obligatoria",
+        4: "Placa repetida dentro de la carga",
+        5: "Ya existe un vehículo con esa placa",
+        6: "El tipo de vehículo no existe",
+        7: "El tipo de vehículo no es un UUID válido",
+    }
+    db = SessionLocal()
+    try:
+        creado = VehiculoCRUD(db).obtener_vehiculo_por_placa(filas[0]["placa"].upper())
+        assert (creado.marca, creado.disponible) == ("Kia", True)
+    finally:
+        db.close()
+
+
+def test_carga_masiva_csv(client, crear_datos):
+    ids = crear_datos(1)
+    placas = [_placa(), _placa()]
+    csv = "marca,modelo,placa,tipo_id,disponible\n" + "".join(
+        f"Kia,Rio,{placa},{ids['tipo']},true\n" for placa in placas
+    )
+
+    respuesta = client.post(
+        "/Vehiculos/bulk",
+        params={"id_usuario_creacion": str(ids["usuario"])},
+        content=csv,
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert respuesta.status_code == 200, respuesta.text
+    assert respuesta.json() == {"insertados": 2, "errores": []}
+
+
+def test_carga_masiva_placa_insertada_durante_la_carga(crear_datos, monkeypatch):
+    ids = crear_datos(1)
+    placas = [_placa(), _placa()]
+    insertar = VehiculoCRUD._insertar_sin_conflictos
+
+    def con_carrera(self, filas):
+        # Otra petición inserta la segunda placa después de la verificación IN
+        self.db.add(
+            Vehiculo(
+                marca="Kia",
+                modelo="Rio",
+                placa=placas[1],
+                tipo_id=ids["tipo"],
+                id_usuario_creacion=ids["usuario"],
+            )
+        )
+        self.db.flush()
+        return insertar(self, filas)
+
+    monkeypatch.setattr(VehiculoCRUD, "_insertar_sin_conflictos", con_carrera)
+    db = SessionLocal()
+    try:
+        resultado = VehiculoCRUD(db).crear_vehiculos_masivo(
+            [
+                {
+                    "marca": "Kia",
+                    "modelo": "Rio",
+                    "placa": placa,
+                    "tipo_id": ids["tipo"],
+                }
+                for placa in placas
+            ],
+            ids["usuario"],
+        )
+    finally:
+        db.close()
+
+    assert resultado == {
+        "insertados": 1,
+        "errores": [{"fila": 2, "error": "Ya existe un vehículo con esa placa"}],
+    }
+
+
+def test_crear_sin_placa(client, crear_datos):
+    ids = crear_datos(1)
+    respuesta = client.post(
+        "/Vehiculos/",
+        json={
+            "marca": "Kia",
+            "modelo": "Rio",
+            "tipo_id": str(ids["tipo"]),
+            "id_usuario_creacion": str(ids["usuario"]),
+        },
+    )
+    assert respuesta.status_code == 400
+    assert respuesta.json()["detail"] == "La placa del vehículo es obligatoria"